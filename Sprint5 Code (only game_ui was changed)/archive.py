@@ -0,0 +1,271 @@
+# archive.py
+
+import mmap
+import os
+import struct
+import sys
+from recording import (
+    encode_binary, decode_binary, decode_binary_moves, GAME_MODES, PLAYER_TYPES, WINNERS
+)
+
+# Archive layout (little-endian):
+#   header:  magic 'SOSA', version u8
+#   chunks:  tag u8, length u32, payload
+#            tag 'G' holds one game as a binary recording (see recording.py),
+#            tag 'I' holds the index and is always the last chunk
+#   trailer: index chunk offset u64, columns offset u64, game count u32, magic 'SOSI'
+# The index stores one column per metadata field so filters read only the
+# columns they need. Columns start on an 8-byte boundary and can be viewed
+# straight from the memory map. If the trailer is missing (the writer was
+# killed), the game chunks are scanned to rebuild the index.
+ARCHIVE_MAGIC = b'SOSA'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct('<4sB')
+CHUNK = struct.Struct('<cI')
+TRAILER = struct.Struct('<QQI4s')
+TRAILER_MAGIC = b'SOSI'
+GAME_TAG = b'G'
+INDEX_TAG = b'I'
+
+# (name, array typecode, struct format), widest first to keep columns aligned
+COLUMNS = (
+    ('offset', 'Q', '<Q'),
+    ('length', 'I', '<I'),
+    ('move_count', 'I', '<I'),
+    ('board_size', 'H', '<H'),
+    ('game_mode', 'B', '<B'),
+    ('winner', 'B', '<B'),
+    ('blue_type', 'B', '<B'),
+    ('red_type', 'B', '<B'),
+)
+COLUMN_SIZES = {name: struct.calcsize(fmt) for name, _, fmt in COLUMNS}
+
+
+def game_metadata(recording_data):
+    """Return the index row for a recording dict."""
+    player_types = recording_data.get('player_types', {'Blue': 'Human', 'Red': 'Human'})
+    return {
+        'move_count': len(recording_data['moves']),
+        'board_size': recording_data['board_size'],
+        'game_mode': GAME_MODES.index(recording_data['game_mode']),
+        'winner': WINNERS.index(recording_data.get('winner')),
+        'blue_type': PLAYER_TYPES.index(player_types['Blue']),
+        'red_type': PLAYER_TYPES.index(player_types['Red']),
+    }
+
+
+def encoded_metadata(data):
+    """Return the index row for a game chunk payload."""
+    settings, moves = decode_binary_moves(data)
+    settings['moves'] = moves
+    return game_metadata(settings)
+
+
+class ArchiveWriter:
+    """Appends games to an archive file, creating it if needed.
+
+    Reopening an existing archive continues after its last game. The index is
+    written by checkpoint() and close().
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.rows = []
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            end = load_index(file_path, self.rows)
+            self.file = open(file_path, 'r+b')
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.file = open(file_path, 'wb')
+            self.file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+        self.index_written = False
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, recording_data):
+        """Append a recording dict and return its index in the archive."""
+        if self.index_written:
+            self.drop_index()
+        payload = encode_binary(recording_data)
+        row = game_metadata(recording_data)
+        row['offset'] = self.file.tell() + CHUNK.size
+        row['length'] = len(payload)
+        self.file.write(CHUNK.pack(GAME_TAG, len(payload)))
+        self.file.write(payload)
+        self.rows.append(row)
+        return len(self.rows) - 1
+
+    def drop_index(self):
+        """Remove the index written by the last checkpoint."""
+        self.file.seek(self.index_offset)
+        self.file.truncate()
+        self.index_written = False
+
+    def checkpoint(self):
+        """Write the index and trailer so the archive is readable as it stands."""
+        if self.index_written:
+            return
+        self.index_offset = self.file.tell()
+        columns_offset = self.index_offset + CHUNK.size
+        padding = -columns_offset % 8
+        columns_offset += padding
+        body = bytearray(padding)
+        for name, _, fmt in COLUMNS:
+            body += struct.pack('<%d%s' % (len(self.rows), fmt[1]), *(row[name] for row in self.rows))
+        self.file.write(CHUNK.pack(INDEX_TAG, len(body)))
+        self.file.write(body)
+        self.file.write(TRAILER.pack(self.index_offset, columns_offset, len(self.rows), TRAILER_MAGIC))
+        self.file.flush()
+        self.index_written = True
+
+    def close(self):
+        """Write the index and close the file."""
+        if not self.file.closed:
+            self.checkpoint()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_index(file_path, rows):
+    """Fill rows from an archive's index; return the offset where games end.
+
+    Falls back to scanning the game chunks when the trailer is missing.
+    """
+    with ArchiveReader(file_path) as reader:
+        for i in range(len(reader)):
+            rows.append(reader.metadata(i, raw=True))
+        return reader.games_end
+
+
+class ArchiveReader:
+    """Memory-mapped, random-access reader for archive files."""
+
+    def __init__(self, file_path):
+        if sys.byteorder != 'little':
+            raise RuntimeError("Archives can only be read on little-endian machines.")
+        self.file = open(file_path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        magic, version = ARCHIVE_HEADER.unpack_from(self.map)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError("Not an SOS archive.")
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version: {version}")
+        self.columns = {}
+        if not self.read_trailer():
+            self.scan_games()
+
+    def read_trailer(self):
+        """Map the index columns; return False if there is no valid trailer."""
+        if len(self.map) < ARCHIVE_HEADER.size + TRAILER.size:
+            return False
+        index_offset, columns_offset, count, magic = TRAILER.unpack_from(self.map, len(self.map) - TRAILER.size)
+        if magic != TRAILER_MAGIC:
+            return False
+        self.count = count
+        self.games_end = index_offset
+        position = columns_offset
+        for name, typecode, _ in COLUMNS:
+            size = COLUMN_SIZES[name] * count
+            self.columns[name] = self.view[position:position + size].cast(typecode)
+            position += size
+        return True
+
+    def scan_games(self):
+        """Rebuild the index by walking the game chunks of an unfinished archive."""
+        rows = []
+        position = ARCHIVE_HEADER.size
+        while position + CHUNK.size <= len(self.map):
+            tag, length = CHUNK.unpack_from(self.map, position)
+            start = position + CHUNK.size
+            if tag != GAME_TAG or start + length > len(self.map):
+                break
+            try:
+                row = encoded_metadata(self.map[start:start + length])
+            except ValueError:
+                break
+            row['offset'] = start
+            row['length'] = length
+            rows.append(row)
+            position = start + length
+        self.count = len(rows)
+        self.games_end = position
+        for name, typecode, _ in COLUMNS:
+            self.columns[name] = [row[name] for row in rows]
+
+    def __len__(self):
+        return self.count
+
+    def raw_game(self, index):
+        """Return the binary recording bytes of a game."""
+        offset = self.columns['offset'][index]
+        return self.map[offset:offset + self.columns['length'][index]]
+
+    def game(self, index):
+        """Return a game as a recording dict."""
+        return decode_binary(self.raw_game(index))
+
+    def game_moves(self, index):
+        """Return (settings, moves) with moves as tuples."""
+        return decode_binary_moves(self.raw_game(index))
+
+    def metadata(self, index, raw=False):
+        """Return the index row of a game, decoded unless raw is set."""
+        row = {name: self.columns[name][index] for name, _, _ in COLUMNS}
+        if raw:
+            return row
+        return {
+            'board_size': row['board_size'],
+            'game_mode': GAME_MODES[row['game_mode']],
+            'winner': WINNERS[row['winner']],
+            'move_count': row['move_count'],
+            'player_types': {'Blue': PLAYER_TYPES[row['blue_type']], 'Red': PLAYER_TYPES[row['red_type']]},
+        }
+
+    def filter(self, board_size=None, game_mode=None, winner=None, min_moves=None, max_moves=None,
+               blue_type=None, red_type=None):
+        """Return the indices of games matching every given condition.
+
+        Only the index columns are read; no game data is decoded.
+        """
+        indices = range(self.count)
+        conditions = (
+            ('board_size', board_size),
+            ('game_mode', None if game_mode is None else GAME_MODES.index(game_mode)),
+            ('winner', None if winner is None else WINNERS.index(winner)),
+            ('blue_type', None if blue_type is None else PLAYER_TYPES.index(blue_type)),
+            ('red_type', None if red_type is None else PLAYER_TYPES.index(red_type)),
+        )
+        for name, value in conditions:
+            if value is not None:
+                column = self.columns[name]
+                indices = [i for i in indices if column[i] == value]
+        moves = self.columns['move_count']
+        if min_moves is not None:
+            indices = [i for i in indices if moves[i] >= min_moves]
+        if max_moves is not None:
+            indices = [i for i in indices if moves[i] <= max_moves]
+        return list(indices)
+
+    def close(self):
+        """Release the memory map and file."""
+        for name, column in self.columns.items():
+            if isinstance(column, memoryview):
+                column.release()
+        self.columns = {}
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
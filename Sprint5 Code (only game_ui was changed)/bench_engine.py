@@ -0,0 +1,290 @@
+# bench_engine.py
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from game import create_game
+from recording import GAME_MODES
+
+BENCHMARKS = (
+    'make_move',
+    'check_for_sos',
+    'check_for_sos_s',
+    'get_valid_moves',
+    'find_potential_sos_moves',
+    'check_game_over',
+    'get_computer_move',
+)
+DEFAULT_SIZES = (3, 5, 8, 10, 20, 50, 100, 200)
+DEFAULT_FILL = 0.5
+
+
+def fill_board(game, fill, rng):
+    """Place random letters on a fraction of the cells, without scoring or ending the game.
+
+    Letters are written straight into the board so that simple games stay in
+    progress however many SOS sequences the position contains.
+    """
+    cells = [(row, col) for row in range(game.board_size) for col in range(game.board_size)]
+    rng.shuffle(cells)
+    for index, (row, col) in enumerate(cells[:round(fill * len(cells))]):
+        game.board[row][col] = {'letter': rng.choice('SO'), 'player': ('Blue', 'Red')[index % 2]}
+    game.pop_dirty_cells()
+
+
+def make_position(game_mode, board_size, fill, seed):
+    """Return a game with a reproducible, partly filled board."""
+    game = create_game(game_mode, board_size, seed)
+    fill_board(game, fill, random.Random(seed))
+    return game
+
+
+def cells_with(game, letter):
+    """Return the cells holding a letter, placing it in the centre if there are none."""
+    n = game.board_size
+    found = [(r, c) for r in range(n) for c in range(n) if game.board[r][c] and game.board[r][c]['letter'] == letter]
+    if not found:
+        game.board[n // 2][n // 2] = {'letter': letter, 'player': 'Blue'}
+        found = [(n // 2, n // 2)]
+    return found
+
+
+def repeated(items, count):
+    """Return a list of count items, cycling through items."""
+    return (items * (count // len(items) + 1))[:count]
+
+
+# Each case builder takes a position and returns run(loops), which makes loops
+# calls and returns the seconds spent in them; setup work is left out.
+
+def case_make_move(game):
+    snapshot = game.snapshot()
+    moves = [(row, col, game.rng.choice('SO')) for row, col in game.get_valid_moves()]
+    if not moves:
+        raise ValueError("make_move needs a board with empty cells.")
+
+    def run(loops):
+        elapsed = 0.0
+        done = 0
+        while done < loops:
+            game.restore(snapshot)  # Every batch starts from the same position
+            batch = moves[:loops - done]
+            start = time.perf_counter()
+            for row, col, letter in batch:
+                game.make_move(row, col, letter)
+            elapsed += time.perf_counter() - start
+            done += len(batch)
+        game.restore(snapshot)
+        game.pop_dirty_cells()
+        return elapsed
+    return run
+
+
+def case_check_for_sos(game):
+    cells = cells_with(game, 'O')
+
+    def run(loops):
+        targets = repeated(cells, loops)
+        check = game.check_for_sos
+        start = time.perf_counter()
+        for row, col in targets:
+            check(row, col)
+        return time.perf_counter() - start
+    return run
+
+
+def case_check_for_sos_s(game):
+    cells = cells_with(game, 'S')
+
+    def run(loops):
+        targets = repeated(cells, loops)
+        check = game.check_for_sos_s
+        start = time.perf_counter()
+        for row, col in targets:
+            check(row, col)
+        return time.perf_counter() - start
+    return run
+
+
+def case_method(name):
+    """Return a case builder for a method that takes no arguments and leaves the game unchanged."""
+    def build(game):
+        method = getattr(game, name)
+
+        def run(loops):
+            start = time.perf_counter()
+            for _ in range(loops):
+                method()
+            return time.perf_counter() - start
+        return run
+    return build
+
+
+def case_check_game_over(game):
+    # Only the last cell is left empty, so every call scans the whole board:
+    # the cost paid after each move near the end of a game
+    n = game.board_size
+    for row in range(n):
+        for col in range(n):
+            if game.board[row][col] is None:
+                game.board[row][col] = {'letter': 'S', 'player': 'Blue'}
+    game.board[n - 1][n - 1] = None
+    game.pop_dirty_cells()
+    return case_method('check_game_over')(game)
+
+
+CASES = {
+    'make_move': case_make_move,
+    'check_for_sos': case_check_for_sos,
+    'check_for_sos_s': case_check_for_sos_s,
+    'get_valid_moves': case_method('get_valid_moves'),
+    'find_potential_sos_moves': case_method('find_potential_sos_moves'),
+    'check_game_over': case_check_game_over,
+    'get_computer_move': case_method('get_computer_move'),
+}
+
+
+def calibrate(run, min_time):
+    """Return the number of loops that takes at least min_time seconds (like timeit's autorange)."""
+    loops = 1
+    while True:
+        if run(loops) >= min_time:
+            return loops
+        loops *= 10 if loops < 1000 else 2
+
+
+def summarise(times):
+    """Return statistics of per-call times in seconds."""
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'max': max(times),
+    }
+
+
+def benchmark_key(name, game_mode, board_size):
+    """Return the identifier of one benchmark, e.g. 'make_move/general/10'."""
+    return f'{name}/{game_mode}/{board_size}'
+
+
+def run_benchmark(name, game_mode, board_size, fill=DEFAULT_FILL, warmup=1, repeat=5, min_time=0.02, seed=0):
+    """Time one function on one position; return a result dict with per-call seconds."""
+    if name not in CASES:
+        raise ValueError(f"Unknown benchmark: {name}")
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1.")
+    run = CASES[name](make_position(game_mode, board_size, fill, seed))
+    # Like timeit, keep garbage collection out of the measurements; the cell
+    # dicts made by each call would otherwise trigger it at random points
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        loops = calibrate(run, min_time)
+        for _ in range(warmup):
+            run(loops)
+        times = [run(loops) / loops for _ in range(repeat)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        'key': benchmark_key(name, game_mode, board_size),
+        'name': name,
+        'mode': game_mode,
+        'size': board_size,
+        'fill': fill,
+        'loops': loops,
+        'repeat': repeat,
+        'times': times,
+        **summarise(times),
+    }
+
+
+def machine_info():
+    """Describe the interpreter and machine that results were measured on."""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def run_suite(names=BENCHMARKS, modes=GAME_MODES, sizes=DEFAULT_SIZES, progress=None, **options):
+    """Run every (benchmark, mode, size) combination; return the results as a JSON-ready dict.
+
+    options are passed to run_benchmark(). progress, if given, is called with
+    each result as it is produced.
+    """
+    results = []
+    for name in names:
+        for game_mode in modes:
+            for board_size in sizes:
+                result = run_benchmark(name, game_mode, board_size, **options)
+                if progress:
+                    progress(result)
+                results.append(result)
+    return {
+        'machine': machine_info(),
+        'options': options,
+        'results': results,
+    }
+
+
+def format_result(result):
+    """Return one line of the human-readable report, times in microseconds."""
+    us = 1e6
+    return (f"{result['key']:<36} median {result['median'] * us:12.2f} us  "
+            f"min {result['min'] * us:12.2f} us  stdev {result['stdev'] / result['median']:6.1%}  "
+            f"({result['repeat']} x {result['loops']} loops)")
+
+
+def parse_list(text, convert=str):
+    """Parse a comma-separated command-line list."""
+    return tuple(convert(part) for part in text.split(',') if part)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Time the game engine's functions.")
+    parser.add_argument('--benchmarks', type=parse_list, default=BENCHMARKS, help="comma-separated function names")
+    parser.add_argument('--modes', type=parse_list, default=GAME_MODES, help="comma-separated game modes")
+    parser.add_argument('--sizes', type=lambda text: parse_list(text, int), default=DEFAULT_SIZES,
+                        help="comma-separated board sizes")
+    parser.add_argument('--fill', type=float, default=DEFAULT_FILL, help="fraction of cells filled")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed repetitions")
+    parser.add_argument('--repeat', type=int, default=5, help="timed repetitions")
+    parser.add_argument('--min-time', type=float, default=0.02, help="seconds per repetition at least")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    for name in args.benchmarks:
+        if name not in CASES:
+            parser.error(f"unknown benchmark: {name}")
+    for game_mode in args.modes:
+        if game_mode not in GAME_MODES:
+            parser.error(f"unknown game mode: {game_mode}")
+
+    report = sys.stderr if args.output == '-' else sys.stdout
+    suite = run_suite(
+        args.benchmarks, args.modes, args.sizes,
+        progress=lambda result: print(format_result(result), file=report, flush=True),
+        fill=args.fill, warmup=args.warmup, repeat=args.repeat, min_time=args.min_time, seed=args.seed,
+    )
+    if args.output == '-':
+        print(json.dumps(suite, indent=2))
+    elif args.output:
+        with open(args.output, 'w') as f:
+            json.dump(suite, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
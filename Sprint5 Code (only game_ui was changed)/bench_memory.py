@@ -0,0 +1,200 @@
+# bench_memory.py
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from bench_engine import machine_info, parse_list
+from game import SimpleGame, create_game
+from recording import GAME_MODES, encode_binary
+from replay import ReplayEngine
+
+DEFAULT_SIZES = (3, 10, 50, 100, 200)
+DEFAULT_FILLS = (0.0, 0.25, 0.5, 1.0)
+
+# What is measured for each (mode, size, fill) position, in bytes:
+#   game         a live game: board rows, cell dicts and SOS sequences
+#   dirty_cells  the extra held by a game whose dirty cells are never drained,
+#                like the engine worker's (the UI drains its mirror every frame)
+#   search       the peak of the temporary lists made by get_computer_move
+#   keyframe     one game.snapshot(), as kept by ReplayEngine for seeking
+#   moves        the recording as a dict with a list of move dicts, as saved to JSON
+#   binary       the recording encoded in the binary format
+#   replay       a ReplayEngine run to the end: its game, move list and keyframes
+COMPONENTS = ('game', 'dirty_cells', 'search', 'keyframe', 'moves', 'binary', 'replay')
+
+
+def measure(build):
+    """Return (result of build(), bytes still allocated by it)."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    gc.collect()
+    return value, tracemalloc.get_traced_memory()[0] - before
+
+
+def measure_peak(run):
+    """Return the most bytes allocated at once while run() was running."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    run()
+    return tracemalloc.get_traced_memory()[1] - before
+
+
+def scores(game, row, col, letter):
+    """Return True if placing letter at (row, col) would form an SOS."""
+    game.board[row][col] = {'letter': letter, 'player': game.current_player}
+    found = game.check_for_sos_s(row, col) if letter == 'S' else game.check_for_sos(row, col)
+    game.board[row][col] = None
+    return bool(found)
+
+
+def play_random(game, fill, rng):
+    """Play random moves until fill of the cells are taken; return them as recording move dicts.
+
+    Simple games end at the first SOS, so there only non-scoring moves are
+    played and cells where both letters would score are left empty; such
+    boards can stop short of the requested fill.
+    """
+    cells = [(row, col) for row in range(game.board_size) for col in range(game.board_size)]
+    rng.shuffle(cells)
+    target = round(fill * len(cells))
+    moves = []
+    for row, col in cells:
+        if len(moves) == target:
+            break
+        letters = ['S', 'O']
+        rng.shuffle(letters)
+        if isinstance(game, SimpleGame):
+            letters = [letter for letter in letters if not scores(game, row, col, letter)]
+            if not letters:
+                continue
+        moves.append({'row': row, 'col': col, 'letter': letters[0], 'player': game.current_player})
+        game.make_move(row, col, letters[0])
+    game.check_game_over()
+    return moves
+
+
+def measure_position(game_mode, board_size, fill, seed=0):
+    """Measure every component for one position; return a result dict."""
+    if not 0 <= fill <= 1:
+        raise ValueError("fill must be between 0 and 1.")
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        def build_game():
+            game = create_game(game_mode, board_size, seed)
+            return game, play_random(game, fill, random.Random(seed))
+
+        (game, moves), with_dirty = measure(build_game)
+
+        def drain():
+            game.pop_dirty_cells()
+        _, released = measure(drain)  # Negative: the dirty set is freed
+        sizes = {'game': with_dirty + released, 'dirty_cells': -released}
+        sizes['search'] = measure_peak(game.get_computer_move)
+        _, sizes['keyframe'] = measure(game.snapshot)
+
+        def build_recording():
+            return {
+                'board_size': board_size,
+                'game_mode': game_mode,
+                'player_types': {'Blue': 'Computer', 'Red': 'Computer'},
+                'moves': [dict(move) for move in moves],
+            }
+        recording_data, sizes['moves'] = measure(build_recording)
+        _, sizes['binary'] = measure(lambda: encode_binary(recording_data))
+
+        def build_replay():
+            engine = ReplayEngine(recording_data)
+            engine.run_to_end()
+            return engine
+        _, sizes['replay'] = measure(build_replay)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    filled = sum(cell is not None for row in game.board for cell in row)
+    return {
+        'key': f'{game_mode}/{board_size}/{fill}',
+        'mode': game_mode,
+        'size': board_size,
+        'fill': fill,
+        'filled_cells': filled,
+        'sequences': len(game.blue_sequences) + len(game.red_sequences),
+        **sizes,
+    }
+
+
+def run_suite(modes=GAME_MODES, sizes=DEFAULT_SIZES, fills=DEFAULT_FILLS, seed=0, progress=None):
+    """Measure every (mode, size, fill) position; return the results as a JSON-ready dict."""
+    results = []
+    for game_mode in modes:
+        for board_size in sizes:
+            for fill in fills:
+                result = measure_position(game_mode, board_size, fill, seed)
+                if progress:
+                    progress(result)
+                results.append(result)
+    return {'machine': machine_info(), 'options': {'seed': seed}, 'results': results}
+
+
+def games_per_budget(result, budget_bytes):
+    """Return how many games like result's fit in budget_bytes alongside one search."""
+    per_game = result['game'] + result['dirty_cells']
+    return max(0, (budget_bytes - result['search']) // per_game)
+
+
+def format_header(budget_bytes=None):
+    """Return the column titles of the human-readable report."""
+    line = f"{'mode/size/fill':<20} {'cells':>6}" + ''.join(f" {component:>11}" for component in COMPONENTS)
+    return line + (f" {'games':>8}" if budget_bytes else '')
+
+
+def format_result(result, budget_bytes=None):
+    """Return one line of the human-readable report, sizes in KiB."""
+    line = f"{result['key']:<20} {result['filled_cells']:>6}"
+    line += ''.join(f" {result[component] / 1024:11.1f}" for component in COMPONENTS)
+    return line + (f" {games_per_budget(result, budget_bytes):>8}" if budget_bytes else '')
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Measure the memory held per game with tracemalloc.")
+    parser.add_argument('--modes', type=parse_list, default=GAME_MODES, help="comma-separated game modes")
+    parser.add_argument('--sizes', type=lambda text: parse_list(text, int), default=DEFAULT_SIZES,
+                        help="comma-separated board sizes")
+    parser.add_argument('--fills', type=lambda text: parse_list(text, float), default=DEFAULT_FILLS,
+                        help="comma-separated fractions of cells filled")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--budget', type=float, default=None,
+                        help="MiB per process; also report how many live games fit")
+    parser.add_argument('--output', default=None, help="write the results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    for game_mode in args.modes:
+        if game_mode not in GAME_MODES:
+            parser.error(f"unknown game mode: {game_mode}")
+    for fill in args.fills:
+        if not 0 <= fill <= 1:
+            parser.error(f"fill must be between 0 and 1: {fill}")
+
+    budget_bytes = int(args.budget * 1024 * 1024) if args.budget else None
+    report = sys.stderr if args.output == '-' else sys.stdout
+    print("Sizes in KiB", file=report)
+    print(format_header(budget_bytes), file=report)
+    suite = run_suite(args.modes, args.sizes, args.fills, args.seed,
+                      progress=lambda result: print(format_result(result, budget_bytes), file=report, flush=True))
+    if args.output == '-':
+        print(json.dumps(suite, indent=2))
+    elif args.output:
+        with open(args.output, 'w') as f:
+            json.dump(suite, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# engine_worker.py
+
+import multiprocessing
+import queue
+import time
+from game import create_game
+
+WAIT_CHECK = 0.1  # Seconds between checks that the worker is alive while waiting
+
+# Requests sent to the worker:
+#   ('new', game id, game mode, board size, seed)  start a new game
+#   ('move', row, col, letter)                      play a human move
+#   ('computer', players, delay)                    play computer moves while one of players is to move,
+#                                                   waiting delay seconds before each
+#   ('stop',)                                       exit the worker
+# Events sent back, each tagged with the id of the game they belong to:
+#   ('move', game id, delta)         a move was played; delta is made by move_delta()
+#   ('invalid', game id, row, col)   a human move was rejected
+#   ('no_move', game id)             no computer move was played
+#   ('error', game id, message)      a request could not be handled, e.g. a move before any game
+
+
+def move_delta(game, row, col, letter, player, blue_before, red_before, move_time=0.0):
+    """Return what changed in a game after a move, for sending to the UI."""
+    return {
+        'row': row,
+        'col': col,
+        'letter': letter,
+        'player': player,
+        'blue_sequences': game.blue_sequences[blue_before:],
+        'red_sequences': game.red_sequences[red_before:],
+        'current_player': game.current_player,
+        'game_over': game.game_over,
+        'winner': game.winner,
+        'move_time': move_time,  # Seconds spent in make_move and check_game_over
+    }
+
+
+def play_move(game, row, col, letter):
+    """Make a move and check for the end of the game; return its delta, or None if invalid."""
+    player = game.current_player
+    blue_before = len(game.blue_sequences)
+    red_before = len(game.red_sequences)
+    start = time.perf_counter()
+    if not game.make_move(row, col, letter):
+        return None
+    game.check_game_over()
+    move_time = time.perf_counter() - start
+    return move_delta(game, row, col, letter.upper(), player, blue_before, red_before, move_time)
+
+
+def apply_move_delta(game, delta):
+    """Bring a mirror of the worker's game up to date with a move delta."""
+    row, col = delta['row'], delta['col']
+    game.board[row][col] = {'letter': delta['letter'], 'player': delta['player']}
+    game.dirty_cells.add((row, col))
+    game.blue_sequences.extend(delta['blue_sequences'])
+    game.red_sequences.extend(delta['red_sequences'])
+    game.current_player = delta['current_player']
+    game.game_over = delta['game_over']
+    game.winner = delta['winner']
+
+
+def run_worker(requests, events):
+    """Worker process: own the game and answer requests until told to stop."""
+    game = None
+    game_id = 0  # EngineClient's id before its first game
+    while True:
+        message = requests.get()
+        kind = message[0]
+        if kind == 'stop':
+            return
+        if kind == 'new':
+            _, game_id, game_mode, board_size, seed = message
+            game = create_game(game_mode, board_size, seed)
+        elif kind not in ('move', 'computer'):
+            events.put(('error', game_id, f"Unknown engine request: {kind}"))
+        elif game is None:
+            events.put(('error', game_id, "No game has been started."))
+        elif kind == 'move':
+            _, row, col, letter = message
+            delta = play_move(game, row, col, letter)
+            if delta is None:
+                events.put(('invalid', game_id, row, col))
+            else:
+                events.put(('move', game_id, delta))
+        else:
+            _, players, delay = message
+            played = 0
+            # One request covers a whole run of computer moves, so computer-vs-computer
+            # games are not slowed down by a round trip per move
+            while not game.game_over and game.current_player in players:
+                if delay:
+                    time.sleep(delay)  # Small delay to mimic thinking
+                move = game.get_computer_move()
+                if move is None:
+                    break
+                events.put(('move', game_id, play_move(game, *move)))
+                played += 1
+                if not requests.empty():
+                    break  # Only a new game or stop can arrive during a run
+            if not played:
+                events.put(('no_move', game_id))
+
+
+class EngineClient:
+    """Runs the game engine in a worker process and collects its events.
+
+    If the worker dies, poll() and wait() return one ('error', message) event
+    instead of waiting for replies that will never come.
+    """
+
+    def __init__(self):
+        # Spawn rather than fork, so the worker never inherits the Tk connection
+        context = multiprocessing.get_context('spawn')
+        self.requests = context.Queue()
+        self.events = context.Queue()
+        self.process = context.Process(target=run_worker, args=(self.requests, self.events), daemon=True)
+        self.process.start()
+        self.game_id = 0
+        self.stopped = False  # The worker's death has been reported
+
+    def new_game(self, game_mode, board_size, seed=None):
+        """Start a new game; events of earlier games are dropped from now on."""
+        self.game_id += 1
+        self.requests.put(('new', self.game_id, game_mode, board_size, seed))
+
+    def send_move(self, row, col, letter):
+        """Ask the worker to play a human move."""
+        self.requests.put(('move', row, col, letter))
+
+    def request_computer_moves(self, players, delay=0):
+        """Ask the worker to play computer moves for as long as one of players is to move."""
+        self.requests.put(('computer', tuple(players), delay))
+
+    def poll(self):
+        """Return the events of the current game received so far, without blocking.
+
+        Events are returned without their game id, e.g. ('move', delta).
+        """
+        # Checked before draining: a worker that has exited has already sent all its events
+        alive = self.process.is_alive()
+        received = []
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[1] == self.game_id:
+                received.append((event[0],) + event[2:])
+        if not alive and not self.stopped:
+            self.stopped = True
+            received.append(('error', f"The engine worker stopped unexpectedly (exit code {self.process.exitcode})."))
+        return received
+
+    def wait(self, timeout=None):
+        """Block until at least one event of the current game arrives, then return all received."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Wake up now and then to notice a worker that has died
+            remaining = WAIT_CHECK if deadline is None else min(WAIT_CHECK, max(0.0, deadline - time.monotonic()))
+            try:
+                event = self.events.get(timeout=remaining)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    return self.poll()
+                if deadline is not None and time.monotonic() >= deadline:
+                    return []
+                continue
+            if event[1] == self.game_id:
+                return [(event[0],) + event[2:]] + self.poll()
+
+    def is_alive(self):
+        """Return True while the worker process is running."""
+        return self.process.is_alive()
+
+    def close(self):
+        """Stop the worker process."""
+        self.requests.put(('stop',))
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
@@ -0,0 +1,227 @@
+# export_training.py
+
+import argparse
+import glob
+import json
+import os
+import sys
+import numpy as np
+from import_recordings import iter_recordings
+from recording import GAME_MODES
+from sos_env import SOSEnv, NUM_PLANES
+
+# Each shard is four .npy files with one row per position:
+#   <prefix>-NNNNN-planes.npy   uint8 (rows, 5, n, n)  observation planes of SOSEnv
+#   <prefix>-NNNNN-player.npy   int8  (rows,)          side to move, 0 = Blue, 1 = Red
+#   <prefix>-NNNNN-move.npy     int32 (rows,)          SOSEnv action index of the move played
+#   <prefix>-NNNNN-outcome.npy  int8  (rows,)          1 win, 0 draw, -1 loss for the side to move
+# <prefix>-meta.json records the board size and the row count of every shard.
+COLUMNS = ('planes', 'player', 'move', 'outcome')
+SHARD_BYTES = 256 * 1024 * 1024
+TRIM_ROWS = 1024  # Rows copied at a time when the last shard is trimmed
+
+
+def shard_path(directory, prefix, shard, column):
+    """Return the path of one column file of a shard."""
+    return os.path.join(directory, f'{prefix}-{shard:05d}-{column}.npy')
+
+
+def rows_per_shard(board_size, shard_bytes=SHARD_BYTES):
+    """Return how many positions of a board size fit in shard_bytes, counting every column."""
+    row_bytes = NUM_PLANES * board_size * board_size + 1 + 4 + 1
+    return max(1, shard_bytes // row_bytes)
+
+
+class ShardWriter:
+    """Writes positions into preallocated memory-mapped .npy shards.
+
+    shard_size is the number of positions per shard; by default it is as many
+    as fit in shard_bytes, so large boards get fewer positions per shard.
+    """
+
+    def __init__(self, directory, board_size, prefix='train', shard_size=None, shard_bytes=SHARD_BYTES):
+        self.directory = directory
+        self.board_size = board_size
+        self.prefix = prefix
+        self.shard_size = shard_size or rows_per_shard(board_size, shard_bytes)
+        self.shard = -1
+        self.row = self.shard_size  # Forces a new shard on the first write
+        self.shard_rows = []
+        self.arrays = None
+        os.makedirs(directory, exist_ok=True)
+
+    def open_shard(self):
+        """Finish the current shard and preallocate the next one."""
+        self.flush()
+        self.shard += 1
+        self.row = 0
+        n = self.board_size
+        shapes = {
+            'planes': ((self.shard_size, NUM_PLANES, n, n), np.uint8),
+            'player': ((self.shard_size,), np.int8),
+            'move': ((self.shard_size,), np.int32),
+            'outcome': ((self.shard_size,), np.int8),
+        }
+        self.arrays = {
+            column: np.lib.format.open_memmap(
+                shard_path(self.directory, self.prefix, self.shard, column),
+                mode='w+', dtype=dtype, shape=shape
+            )
+            for column, (shape, dtype) in shapes.items()
+        }
+
+    def write(self, planes, player, move, outcome, count):
+        """Append the first count rows of per-game buffers, spilling into new shards."""
+        done = 0
+        while done < count:
+            if self.row == self.shard_size:
+                self.open_shard()
+            take = min(count - done, self.shard_size - self.row)
+            rows = slice(self.row, self.row + take)
+            source = slice(done, done + take)
+            self.arrays['planes'][rows] = planes[source]
+            self.arrays['player'][rows] = player[source]
+            self.arrays['move'][rows] = move[source]
+            self.arrays['outcome'][rows] = outcome[source]
+            self.row += take
+            done += take
+
+    def flush(self):
+        """Flush the open shard to disk and note its row count."""
+        if self.arrays is None:
+            return
+        for array in self.arrays.values():
+            array.flush()
+        self.shard_rows.append(self.row)
+        self.arrays = None
+
+    def close(self):
+        """Finish the last shard, trimming it to the rows actually written."""
+        if self.arrays is not None and self.row < self.shard_size:
+            for column in COLUMNS:
+                self.trim(column)
+            self.arrays = None
+            self.shard_rows.append(self.row)
+        self.flush()
+        with open(os.path.join(self.directory, f'{self.prefix}-meta.json'), 'w') as f:
+            json.dump({'board_size': self.board_size, 'shards': self.shard_rows}, f)
+
+    def trim(self, column):
+        """Replace a column file of the open shard with one holding only the rows written.
+
+        Rows are copied a block at a time, so the shard is never held in memory.
+        """
+        path = shard_path(self.directory, self.prefix, self.shard, column)
+        source = self.arrays.pop(column)
+        target = np.lib.format.open_memmap(
+            path + '.tmp', mode='w+', dtype=source.dtype, shape=(self.row,) + source.shape[1:]
+        )
+        for start in range(0, self.row, TRIM_ROWS):
+            target[start:start + TRIM_ROWS] = source[start:min(start + TRIM_ROWS, self.row)]
+        target.flush()
+        del source, target  # Drop the memory maps before the file is replaced
+        os.replace(path + '.tmp', path)
+
+
+def export(paths, directory, board_size, game_mode=None, prefix='train', shard_size=None, log=None,
+           shard_bytes=SHARD_BYTES):
+    """Stream recordings through SOSEnv into shards; return (games, positions, skipped)."""
+    envs = {mode: SOSEnv(board_size, mode) for mode in GAME_MODES}
+    # Per-game buffers, allocated once and reused for every game
+    max_moves = board_size * board_size
+    planes = np.zeros((max_moves, NUM_PLANES, board_size, board_size), dtype=np.uint8)
+    player = np.zeros(max_moves, dtype=np.int8)
+    move = np.zeros(max_moves, dtype=np.int32)
+    outcome = np.zeros(max_moves, dtype=np.int8)
+
+    writer = ShardWriter(directory, board_size, prefix, shard_size, shard_bytes)
+    games = positions = skipped = 0
+
+    def skip(path, error):
+        nonlocal skipped
+        if log:
+            log(f"{path}: skipped: {error}")
+        skipped += 1
+
+    try:
+        for path, recording_data in iter_recordings(paths, on_error=skip):
+            if recording_data.get('board_size') != board_size:
+                continue
+            if game_mode is not None and recording_data.get('game_mode') != game_mode:
+                continue
+            if recording_data.get('game_mode') not in envs:
+                skip(path, f"unknown game mode {recording_data.get('game_mode')!r}")
+                continue
+            env = envs[recording_data['game_mode']]
+            obs, _ = env.reset()
+            count = 0
+            try:
+                for m in recording_data['moves']:
+                    action = env.encode_action(m['row'], m['col'], m['letter'])
+                    planes[count] = obs
+                    player[count] = env.game.current_player == 'Red'
+                    move[count] = action
+                    obs, _, _, _, _ = env.step(action)
+                    count += 1
+            except (KeyError, TypeError, ValueError) as e:
+                skip(path, e)
+                continue
+            if not env.game.game_over:
+                skip(path, "the game is not finished")
+                continue
+            winner = env.game.winner
+            for i in range(count):
+                side = 'Red' if player[i] else 'Blue'
+                outcome[i] = 0 if winner == 'Draw' else (1 if winner == side else -1)
+            writer.write(planes, player, move, outcome, count)
+            games += 1
+            positions += count
+    finally:
+        writer.close()
+    return games, positions, skipped
+
+
+def open_shards(directory, prefix='train'):
+    """Return a list of {column: read-only memmap} dicts, one per shard."""
+    with open(os.path.join(directory, f'{prefix}-meta.json')) as f:
+        meta = json.load(f)
+    return [
+        {column: np.load(shard_path(directory, prefix, shard, column), mmap_mode='r') for column in COLUMNS}
+        for shard in range(len(meta['shards']))
+    ]
+
+
+def iter_batches(directory, batch_size, prefix='train'):
+    """Yield dicts of array views of up to batch_size rows, without copying."""
+    for shard in open_shards(directory, prefix):
+        rows = len(shard['move'])
+        for start in range(0, rows, batch_size):
+            yield {column: array[start:start + batch_size] for column, array in shard.items()}
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Export recorded positions as .npy training shards.")
+    parser.add_argument('output', help="directory for the shards")
+    parser.add_argument('paths', nargs='+', help="recording files, archives or directories")
+    parser.add_argument('--size', type=int, required=True, help="board size to export")
+    parser.add_argument('--mode', choices=GAME_MODES, default=None, help="only export one game mode")
+    parser.add_argument('--prefix', default='train')
+    parser.add_argument('--shard-size', type=int, default=None,
+                        help="positions per shard (default: as many as fit in --shard-mb)")
+    parser.add_argument('--shard-mb', type=float, default=SHARD_BYTES / 1024 / 1024, help="MiB per shard")
+    args = parser.parse_args(argv)
+
+    stale = glob.glob(os.path.join(args.output, f'{args.prefix}-*.npy'))
+    for path in stale:
+        os.remove(path)
+    games, positions, skipped = export(
+        args.paths, args.output, args.size, args.mode, args.prefix, args.shard_size,
+        log=lambda message: print(message, file=sys.stderr), shard_bytes=int(args.shard_mb * 1024 * 1024)
+    )
+    print(f"Exported {positions} positions from {games} games ({skipped} skipped).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
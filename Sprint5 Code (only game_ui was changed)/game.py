@@ -1,23 +1,28 @@
 # game.py
 
 import random
+from rng import make_rng
 
 class BaseGame:
     """Abstract base class for SOS game."""
 
-    def __init__(self, board_size):
+    def __init__(self, board_size, seed=None, rng=None):
         if board_size <= 2:
             raise ValueError("Board size must be greater than 2.")
         self.board_size = board_size
+        # Each game owns its random stream so seeded games are reproducible
+        self.rng = rng if rng is not None else random.Random(seed)
         self.board = [[None for _ in range(board_size)] for _ in range(board_size)]
         self.current_player = 'Blue'
         self.game_over = False
         self.winner = None
         self.blue_sequences = []
         self.red_sequences = []
+        self.dirty_cells = set()  # Cells changed since the UI last rendered
 
     def start_new_game(self):
         """Reset the game state to start a new game."""
+        self.mark_changed_cells([[None] * self.board_size for _ in range(self.board_size)])
         self.board = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
         self.current_player = 'Blue'
         self.game_over = False
@@ -25,6 +30,40 @@ class BaseGame:
         self.blue_sequences = []
         self.red_sequences = []
 
+    def snapshot(self):
+        """Return a copy of the game state that can be passed to restore()."""
+        # Cell dicts are never modified after placement, so rows are copied shallowly
+        return (
+            [row[:] for row in self.board],
+            self.current_player,
+            self.game_over,
+            self.winner,
+            tuple(self.blue_sequences),
+            tuple(self.red_sequences),
+        )
+
+    def restore(self, snapshot):
+        """Restore a state returned by snapshot()."""
+        board, self.current_player, self.game_over, self.winner, blue, red = snapshot
+        self.mark_changed_cells(board)
+        self.board = [row[:] for row in board]
+        self.blue_sequences = list(blue)
+        self.red_sequences = list(red)
+
+    def mark_changed_cells(self, new_board):
+        """Add the cells that differ between the board and new_board to dirty_cells."""
+        for row in range(self.board_size):
+            old_row, new_row = self.board[row], new_board[row]
+            if old_row != new_row:
+                self.dirty_cells.update(
+                    (row, col) for col in range(self.board_size) if old_row[col] is not new_row[col]
+                )
+
+    def pop_dirty_cells(self):
+        """Return the cells changed since the last call and start a new set."""
+        cells, self.dirty_cells = self.dirty_cells, set()
+        return cells
+
     def is_move_valid(self, row, col):
         """Check if a move is valid."""
         if 0 <= row < self.board_size and 0 <= col < self.board_size:
@@ -167,6 +206,7 @@ class SimpleGame(BaseGame):
             return False
 
         self.board[row][col] = {'letter': letter, 'player': self.current_player}
+        self.dirty_cells.add((row, col))
 
         sequences = []
 
@@ -207,15 +247,15 @@ class SimpleGame(BaseGame):
         potential_moves = self.find_potential_sos_moves()
         if potential_moves:
             # Choose one of the moves that create an SOS
-            move = random.choice(potential_moves)
+            move = self.rng.choice(potential_moves)
             return move  # (row, col, letter)
         else:
             # Choose a random valid move
             valid_moves = self.get_valid_moves()
             if not valid_moves:
                 return None  # No moves left
-            row, col = random.choice(valid_moves)
-            letter = random.choice(['S', 'O'])
+            row, col = self.rng.choice(valid_moves)
+            letter = self.rng.choice(['S', 'O'])
             return (row, col, letter)
 
 
@@ -231,6 +271,7 @@ class GeneralGame(BaseGame):
             return False
 
         self.board[row][col] = {'letter': letter.upper(), 'player': self.current_player}
+        self.dirty_cells.add((row, col))
 
         sequences = []
 
@@ -278,13 +319,25 @@ class GeneralGame(BaseGame):
         potential_moves = self.find_potential_sos_moves()
         if potential_moves:
             # Choose one of the moves that create an SOS
-            move = random.choice(potential_moves)
+            move = self.rng.choice(potential_moves)
             return move  # (row, col, letter)
         else:
             # Choose a random valid move
             valid_moves = self.get_valid_moves()
             if not valid_moves:
                 return None  # No moves left
-            row, col = random.choice(valid_moves)
-            letter = random.choice(['S', 'O'])
-            return (row, col, letter)
\ No newline at end of file
+            row, col = self.rng.choice(valid_moves)
+            letter = self.rng.choice(['S', 'O'])
+            return (row, col, letter)
+
+
+def create_game(game_mode, board_size, seed=None, rng_kind='mt'):
+    """Create a SimpleGame or GeneralGame for a game mode name.
+
+    rng_kind picks the game's generator, as for make_rng().
+    """
+    if game_mode == 'simple':
+        return SimpleGame(board_size, rng=make_rng(seed, rng_kind))
+    if game_mode == 'general':
+        return GeneralGame(board_size, rng=make_rng(seed, rng_kind))
+    raise ValueError(f"Unknown game mode: {game_mode}")
\ No newline at end of file
@@ -0,0 +1,265 @@
+# game_stats.py
+
+import argparse
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from archive import ArchiveReader
+from import_recordings import iter_recordings
+from replay import ReplayEngine
+
+
+class RunningStats:
+    """Count, mean and variance in constant memory (Welford), mergeable."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Combine with another RunningStats (Chan et al.)."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch style).
+
+    Values are counted in logarithmic buckets, so memory depends on the range
+    of values seen rather than on how many there were.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        """Add a non-negative value."""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy.")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q):
+        """Return an estimate of the q-quantile (0 <= q <= 1), or None if empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class GroupStats:
+    """Running statistics for one (board size, game mode) group."""
+
+    def __init__(self):
+        self.games = 0
+        self.blue_wins = 0
+        self.red_wins = 0
+        self.draws = 0
+        self.length = RunningStats()
+        self.length_sketch = QuantileSketch()
+        self.sos = RunningStats()
+        self.sos_sketch = QuantileSketch()
+
+    def add(self, moves, sos_count, winner):
+        self.games += 1
+        self.blue_wins += winner == 'Blue'
+        self.red_wins += winner == 'Red'
+        self.draws += winner == 'Draw'
+        self.length.add(moves)
+        self.length_sketch.add(moves)
+        self.sos.add(sos_count)
+        self.sos_sketch.add(sos_count)
+
+    def merge(self, other):
+        self.games += other.games
+        self.blue_wins += other.blue_wins
+        self.red_wins += other.red_wins
+        self.draws += other.draws
+        self.length.merge(other.length)
+        self.length_sketch.merge(other.length_sketch)
+        self.sos.merge(other.sos)
+        self.sos_sketch.merge(other.sos_sketch)
+
+    def summary(self):
+        """Return the group's statistics as a plain dict."""
+        games = self.games or 1
+        return {
+            'games': self.games,
+            'blue_win_rate': self.blue_wins / games,
+            'red_win_rate': self.red_wins / games,
+            'draw_rate': self.draws / games,
+            # Blue always moves first
+            'first_player_advantage': (self.blue_wins - self.red_wins) / games,
+            'mean_length': self.length.mean,
+            'length_quantiles': {q: self.length_sketch.quantile(q) for q in (0.5, 0.9, 0.99)},
+            'mean_sos': self.sos.mean,
+            'sos_quantiles': {q: self.sos_sketch.quantile(q) for q in (0.5, 0.9, 0.99)},
+        }
+
+
+def events_from_recording(game_id, recording_data):
+    """Yield the live-event stream for a recorded game by replaying it.
+
+    Events are ('start', id, board_size, game_mode), ('move', id, sos_formed)
+    and ('end', id, winner); a live game driver emits the same tuples.
+    """
+    engine = ReplayEngine(recording_data, keyframe_interval=None)
+    game = engine.game
+    yield ('start', game_id, engine.board_size, engine.game_mode)
+    while not engine.at_end:
+        before = len(game.blue_sequences) + len(game.red_sequences)
+        engine.step()
+        yield ('move', game_id, len(game.blue_sequences) + len(game.red_sequences) - before)
+    if game.game_over:
+        yield ('end', game_id, game.winner)
+
+
+class StatsAggregator:
+    """Consumes finished games or live events and keeps statistics per group."""
+
+    def __init__(self):
+        self.groups = {}
+        self.open_games = {}  # game id -> [group key, moves, sos count]
+        self.invalid = 0  # Recordings skipped because they could not be read or replayed
+
+    def add_game(self, board_size, game_mode, moves, sos_count, winner):
+        """Add a finished game."""
+        self.groups.setdefault((board_size, game_mode), GroupStats()).add(moves, sos_count, winner)
+
+    def consume(self, events):
+        """Consume an iterable of live-game events."""
+        for event in events:
+            kind, game_id = event[0], event[1]
+            if kind == 'start':
+                self.open_games[game_id] = [(event[2], event[3]), 0, 0]
+            elif kind == 'move':
+                state = self.open_games[game_id]
+                state[1] += 1
+                state[2] += event[2]
+            elif kind == 'end':
+                (board_size, game_mode), moves, sos_count = self.open_games.pop(game_id)
+                self.add_game(board_size, game_mode, moves, sos_count, event[2])
+            else:
+                raise ValueError(f"Unknown event type: {kind}")
+
+    def consume_recordings(self, recordings):
+        """Consume an iterable of recording dicts."""
+        for recording_data in recordings:
+            game_id = object()  # Cannot clash with the ids of live games
+            try:
+                self.consume(events_from_recording(game_id, recording_data))
+            except (KeyError, TypeError, ValueError):
+                # Includes ReplayError; a game only counts once 'end' is seen
+                self.invalid += 1
+            finally:
+                # Unfinished and invalid recordings never send 'end'
+                self.open_games.pop(game_id, None)
+
+    def merge(self, other):
+        """Add another aggregator's finished-game statistics to this one."""
+        for key, group in other.groups.items():
+            self.groups.setdefault(key, GroupStats()).merge(group)
+        self.invalid += other.invalid
+
+    def summary(self):
+        """Return {'<size>/<mode>': group summary}."""
+        return {f'{size}/{mode}': group.summary() for (size, mode), group in sorted(self.groups.items())}
+
+
+def aggregate_archive_range(task):
+    """Worker: aggregate games start..stop-1 of an archive."""
+    path, start, stop = task
+    aggregator = StatsAggregator()
+    with ArchiveReader(path) as reader:
+        for index in range(start, stop):
+            try:
+                recording_data = reader.game(index)
+            except ValueError:
+                aggregator.invalid += 1
+                continue
+            aggregator.consume_recordings([recording_data])
+    return aggregator
+
+
+def aggregate_archive(path, workers=None, chunk_games=2000):
+    """Aggregate an archive in parallel and merge the workers' results."""
+    with ArchiveReader(path) as reader:
+        count = len(reader)
+    tasks = [(path, start, min(start + chunk_games, count)) for start in range(0, count, chunk_games)]
+    total = StatsAggregator()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for aggregator in pool.map(aggregate_archive_range, tasks):
+            total.merge(aggregator)
+    return total
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Print game statistics per board size and mode.")
+    parser.add_argument('paths', nargs='+', help="recording files, archives or directories")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for archives")
+    args = parser.parse_args(argv)
+
+    total = StatsAggregator()
+
+    def unreadable(path, error):
+        total.invalid += 1
+        print(f"{path}: skipped: {error}", file=sys.stderr)
+
+    files = []
+    for path in args.paths:
+        if path.lower().endswith('.sosa'):
+            try:
+                total.merge(aggregate_archive(path, workers=args.workers))
+            except (OSError, ValueError) as e:
+                unreadable(path, e)
+        else:
+            files.append(path)
+    if files:
+        total.consume_recordings(recording_data for _, recording_data in iter_recordings(files, on_error=unreadable))
+    print(json.dumps(total.summary(), indent=2))
+    if total.invalid:
+        print(f"Skipped {total.invalid} invalid recordings.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,34 +1,67 @@
 # game_ui.py
 
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 from game import SimpleGame, GeneralGame
-import threading
 import time
-import json
+import os
 from tkinter import filedialog
+from recording import save_recording, load_recording, new_stream_recorder
+from engine_worker import EngineClient, apply_move_delta
+from latency import LatencyTracker
+from renderers import status_text
+from replay import ReplayEngine, ReplayError
+from tk_renderer import TkRenderer
+
+RECORDINGS_DIR = 'recordings'  # Moves are streamed here while a game is recorded
+ENGINE_POLL_MS = 10  # How often the engine's events are collected on the Tk thread
+COMPUTER_DELAY = 0.5  # Seconds the computer waits before moving against a human, to mimic thinking
+MAX_FPS = 30  # Repaints per second at most; moves arriving in between are drawn together
+REPLAY_INTERVAL_MS = 1000  # Time between replayed moves at 1x speed
+# Replay speed multipliers; Instant jumps straight to the end
+REPLAY_SPEEDS = {'1x': 1, '2x': 2, '4x': 4, '16x': 16, '64x': 64, '256x': 256, 'Instant': None}
 
 class GameUI:
     """Class to handle the GUI of the SOS game."""
 
-    def __init__(self):
-        """Initialize the GUI."""
+    def __init__(self, measure_latency=False, latency_log=None):
+        """Initialize the GUI; optionally measure click-to-paint latency, logging it to latency_log."""
         self.root = tk.Tk()
         self.root.title("SOS Game")
 
         self.game = None
         self.selected_letter = None  # To store the selected letter
         self.letter_buttons = {}  # To store letter buttons for enabling/disabling
-        self.cell_ids = {}  # Mapping from (row, col) to rectangle and text IDs
+        self.renderer = None  # Draws the board; created with the first game and reused afterwards
 
         self.player_types = {'Blue': 'Human', 'Red': 'Human'}  # Default player types
         self.is_recording = False  # To track if recording is enabled
-        self.recorded_moves = []   # To store recorded moves
+        self.replay = None         # ReplayEngine of the recording being replayed
+        self.replay_playing = False  # The replay advances by itself (not paused)
+        self.replay_after_id = None  # Pending replay timer while playing
+        self.recorder = None       # Streams recorded moves to disk
         self.is_replaying = False  # To track if replaying is in progress
+        self.engine = None  # Worker process that owns the live game; self.game mirrors it
+        self.engine_busy = False  # A move has been sent to the engine and not answered yet
+        self.render_after_id = None  # Pending repaint, if one is scheduled
+        self.last_render = 0.0  # perf_counter() time of the last repaint
+        # Latency instrumentation, off unless asked for
+        self.latency = LatencyTracker(latency_log) if measure_latency or latency_log else None
+        self.latency_label = None
 
         self.create_widgets()
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
         self.root.mainloop()
 
+    def on_close(self):
+        """Stop the engine worker and close the window."""
+        if self.engine is not None:
+            self.engine.close()
+        if self.latency is not None:
+            self.latency.close()
+        self.root.destroy()
+
     def create_widgets(self):
         """Create and place GUI widgets."""
         # Frame for game options
@@ -103,15 +136,36 @@ class GameUI:
         self.game_frame = tk.Frame(self.root)
         self.game_frame.pack()
 
+        # Replay controls, shown while a recording is replayed
+        self.replay_frame = tk.Frame(self.root)
+        tk.Button(
+            self.replay_frame, text="<", font=button_font, width=2,
+            command=lambda: self.seek_replay(self.replay.position - 1)
+        ).pack(side=tk.LEFT, padx=2)
+        self.play_button = tk.Button(
+            self.replay_frame, text="Play", font=button_font, width=6, command=self.toggle_replay
+        )
+        self.play_button.pack(side=tk.LEFT, padx=2)
+        tk.Button(
+            self.replay_frame, text=">", font=button_font, width=2,
+            command=lambda: self.seek_replay(self.replay.position + 1)
+        ).pack(side=tk.LEFT, padx=2)
+        self.replay_speed_var = tk.StringVar(value='1x')
+        tk.OptionMenu(
+            self.replay_frame, self.replay_speed_var, *REPLAY_SPEEDS, command=lambda _: self.on_speed_change()
+        ).pack(side=tk.LEFT, padx=5)
+        # Dragging the slider seeks through the recording using the replay keyframes
+        self.replay_scale = tk.Scale(
+            self.replay_frame, from_=0, to=0, orient=tk.HORIZONTAL, length=400, label="Move",
+            command=lambda value: self.seek_replay(int(float(value)))
+        )
+        self.replay_scale.pack(side=tk.LEFT, padx=5)
+
         # Placeholder for the turn label
         self.turn_label = None
 
     def start_game(self):
         """Start a new game with the selected options."""
-        if self.is_replaying:
-            messagebox.showwarning("Replay in Progress", "Cannot start a new game during replay.")
-            return
-
         try:
             board_size = int(self.board_size_entry.get())
             if board_size <= 2:
@@ -120,6 +174,9 @@ class GameUI:
             messagebox.showerror("Invalid Input", "Please enter a valid board size (n > 2).")
             return
 
+        if self.is_replaying:
+            self.stop_replay()  # A new game ends the replay
+
         game_mode = self.game_mode_var.get()
         if game_mode == 'simple':
             self.game = SimpleGame(board_size)
@@ -127,14 +184,28 @@ class GameUI:
             self.game = GeneralGame(board_size)
         self.game.start_new_game()
         self.selected_letter = None  # Reset the selected letter
+        # The engine worker plays the game; self.game is updated from its move deltas
+        if self.engine is None:
+            self.engine = EngineClient()
+            self.root.after(ENGINE_POLL_MS, self.poll_engine)
+        elif not self.engine.is_alive():
+            self.engine.close()
+            self.engine = EngineClient()  # The old worker died; start a fresh one
+        self.engine.new_game(game_mode, board_size)
+        self.engine_busy = False
 
         # Set player types
         self.player_types['Blue'] = self.blue_player_var.get()
         self.player_types['Red'] = self.red_player_var.get()
 
         # Set recording state
+        if self.recorder is not None:
+            self.recorder.close()  # Abandoned game stays on disk as a partial recording
+            self.recorder = None
         self.is_recording = self.record_var.get()
-        self.recorded_moves = []
+        if self.is_recording:
+            os.makedirs(RECORDINGS_DIR, exist_ok=True)
+            self.recorder = new_stream_recorder(RECORDINGS_DIR, board_size, game_mode, dict(self.player_types))
 
         self.create_game_area()
         self.update_turn_label()
@@ -142,9 +213,13 @@ class GameUI:
 
     def create_game_area(self):
         """Create the game board and letter selection buttons."""
-        # Clear previous game area if any
-        for widget in self.game_frame.winfo_children():
-            widget.destroy()
+        if self.renderer is not None:
+            # Reuse the widgets and canvas items of the previous game
+            for btn in self.letter_buttons.values():
+                btn.config(relief=tk.RAISED)
+            self.renderer.start(self.game.board_size)
+            self.renderer.show_status("")
+            return
 
         # Create a frame for the letter selection buttons
         self.letter_frame = tk.Frame(self.game_frame)
@@ -169,19 +244,27 @@ class GameUI:
         )
         self.letter_buttons['O'].pack(pady=5)
 
-        # Create the board canvas
-        self.board_canvas = tk.Canvas(self.game_frame)
-        self.board_canvas.pack(side=tk.LEFT)
-
-        self.create_board()
+        # Zoom buttons
+        tk.Button(
+            self.letter_frame, text='+', font=('Arial', 14), width=4, command=lambda: self.renderer.change_zoom(1)
+        ).pack(pady=5)
+        tk.Button(
+            self.letter_frame, text='-', font=('Arial', 14), width=4, command=lambda: self.renderer.change_zoom(-1)
+        ).pack(pady=5)
 
         # Create the turn label after the game starts
-        if self.turn_label is None:
-            self.turn_label = tk.Label(self.root, text="", font=('Arial', 14))
-            self.turn_label.pack(pady=5)
-        else:
-            # Reset the turn label
-            self.turn_label.config(text="")
+        self.turn_label = tk.Label(self.root, text="", font=('Arial', 14))
+        self.turn_label.pack(pady=5)
+        if self.latency is not None:
+            # Overlay with the latency quantiles of the current board size
+            self.latency_label = tk.Label(self.root, text="", font=('Arial', 10), fg='gray')
+            self.latency_label.pack()
+
+        # The renderer owns the board canvas; only the visible cells have canvas items
+        self.renderer = TkRenderer(self.game_frame, self.turn_label)
+        # One handler for the whole board; the cell is worked out from the click position
+        self.renderer.canvas.bind('<Button-1>', self.on_canvas_click)
+        self.renderer.start(self.game.board_size)
 
     def select_letter(self, letter):
         """Handle letter selection."""
@@ -195,47 +278,27 @@ class GameUI:
             else:
                 btn.config(relief=tk.RAISED)
 
-    def create_board(self):
-        """Create the game board cells."""
-        self.cell_ids = {}
-        self.button_positions = {}
-
-        board_size = self.game.board_size
-        cell_size = 60  # Size of each cell
-        for row in range(board_size):
-            for col in range(board_size):
-                x1 = col * cell_size
-                y1 = row * cell_size
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-                # Draw rectangle
-                rect_id = self.board_canvas.create_rectangle(
-                    x1, y1, x2, y2, fill='white', outline='black'
-                )
-                # Draw text (initially empty)
-                text_id = self.board_canvas.create_text(
-                    x1 + cell_size / 2, y1 + cell_size / 2, text='', font=('Arial', 24)
-                )
-                # Store IDs
-                self.cell_ids[(row, col)] = (rect_id, text_id)
-                self.button_positions[(row, col)] = (x1 + cell_size / 2, y1 + cell_size / 2)
-                if not self.is_replaying:
-                    # Bind click event to rectangle
-                    self.board_canvas.tag_bind(rect_id, '<Button-1>', lambda event, r=row, c=col: self.on_cell_click(r, c))
-                    self.board_canvas.tag_bind(text_id, '<Button-1>', lambda event, r=row, c=col: self.on_cell_click(r, c))
-        # Adjust canvas size based on board size
-        canvas_width = board_size * cell_size
-        canvas_height = board_size * cell_size
-        self.board_canvas.config(width=canvas_width, height=canvas_height)
+    def on_canvas_click(self, event):
+        """Map a click on the board canvas to the cell under it."""
+        if self.is_replaying:
+            return
+        cell = self.renderer.cell_at(event.x, event.y)
+        if cell is None:
+            return  # Click outside the board
+        row, col = cell
+        if self.game.board[row][col] is not None:
+            return  # Occupied cells ignore clicks
+        self.on_cell_click(row, col)
 
     def on_cell_click(self, row, col):
         """Handle cell click events."""
+        clicked = time.perf_counter()
         if self.game.game_over:
             messagebox.showinfo("Game Over", "The game is over. Please start a new game.")
             return
 
-        if self.player_types[self.game.current_player] == 'Computer':
-            # Ignore clicks when it's computer's turn
+        if self.player_types[self.game.current_player] == 'Computer' or self.engine_busy:
+            # Ignore clicks when it's computer's turn or a move is being played
             return
 
         if not self.game.is_move_valid(row, col):
@@ -247,80 +310,24 @@ class GameUI:
             return
 
         letter = self.selected_letter
-        move_made = self.game.make_move(row, col, letter)
-        if move_made:
-            # Record the move if recording is enabled
-            if self.is_recording:
-                self.record_move(row, col, letter, self.game.current_player)
-            self.update_board()
-            self.selected_letter = None  # Reset selected letter after move
-            # Reset the letter button states
-            for btn in self.letter_buttons.values():
-                btn.config(relief=tk.RAISED)
-            if self.game.check_game_over():
-                self.update_turn_label(game_over=True)
-                self.after_game_over()
-            else:
-                self.update_turn_label()
-                self.process_computer_turn()
-        else:
-            messagebox.showwarning("Invalid Move", "Cannot make this move.")
+        if self.latency is not None:
+            self.latency.click(self.game.board_size, clicked)
+            self.latency.mark('sent')
+        self.engine_busy = True
+        self.engine.send_move(row, col, letter)
+        self.selected_letter = None  # Reset selected letter after move
+        # Reset the letter button states
+        for btn in self.letter_buttons.values():
+            btn.config(relief=tk.RAISED)
 
     def update_board(self):
-        """Update the board cells to reflect the current game state."""
-        for row in range(self.game.board_size):
-            for col in range(self.game.board_size):
-                cell = self.game.board[row][col]
-                rect_id, text_id = self.cell_ids[(row, col)]
-                if cell is not None:
-                    letter = cell['letter']
-                    player = cell['player']
-                    color = player.lower()
-                    # Update text
-                    self.board_canvas.itemconfig(text_id, text=letter, fill=color)
-                    # Disable further clicks on this cell by unbinding events
-                    self.board_canvas.tag_unbind(rect_id, '<Button-1>')
-                    self.board_canvas.tag_unbind(text_id, '<Button-1>')
-                else:
-                    self.board_canvas.itemconfig(text_id, text='')
-
-        self.draw_sos_sequences()
+        """Draw the board cells and SOS lines that changed since the last update."""
+        # The engine tracks changed cells, so a move costs the same on any board size
+        self.renderer.render(self.game)
 
     def update_turn_label(self, game_over=False):
         """Update the turn label to indicate whose turn it is."""
-        if game_over:
-            if self.game.winner == 'Draw':
-                self.turn_label.config(text="Game Over: Draw", fg='black')
-            else:
-                self.turn_label.config(text=f"Game Over: {self.game.winner} Player Wins!", fg=self.game.winner.lower())
-        else:
-            player = self.game.current_player
-            self.turn_label.config(text=f"Turn: {player} Player", fg=player.lower())
-
-    def draw_sos_sequences(self):
-        """Draw lines over the SOS sequences."""
-        # Clear previous lines
-        self.board_canvas.delete('sos_line')
-
-        sequences = []
-        # Collect sequences with their associated colors
-        for seq in self.game.blue_sequences:
-            sequences.append((seq, 'blue'))
-        for seq in self.game.red_sequences:
-            sequences.append((seq, 'red'))
-
-        for seq, color in sequences:
-            start, end = seq
-            start_pos = self.button_positions[start]
-            end_pos = self.button_positions[end]
-
-            # Draw the line on the canvas
-            self.board_canvas.create_line(
-                start_pos[0], start_pos[1], end_pos[0], end_pos[1],
-                fill=color,
-                width=3,
-                tags='sos_line'
-            )
+        self.renderer.show_status(*status_text(self.game, game_over))
 
     def process_computer_turn(self):
         """Process the computer's turn if applicable."""
@@ -333,120 +340,154 @@ class GameUI:
             for btn in self.letter_buttons.values():
                 btn.config(state=tk.DISABLED)
 
-            # Use threading to prevent freezing the GUI
-            threading.Thread(target=self.computer_move).start()
+            # The worker process searches, so the GUI never waits for it. It keeps
+            # playing while computers are to move; without a human to watch, at full speed.
+            self.engine_busy = True
+            computers = tuple(player for player, kind in self.player_types.items() if kind == 'Computer')
+            delay = COMPUTER_DELAY if len(computers) < 2 else 0
+            self.engine.request_computer_moves(computers, delay)
         else:
             # Enable letter buttons for human player
             for btn in self.letter_buttons.values():
                 btn.config(state=tk.NORMAL)
 
-    def computer_move(self):
-        """Make a computer move."""
-        time.sleep(0.5)  # Small delay to mimic thinking
-        move = self.game.get_computer_move()
-        if move is None:
-            # No valid moves left
-            return
-        row, col, letter = move
-        move_made = self.game.make_move(row, col, letter)
-        if move_made:
-            # Record the move if recording is enabled
-            if self.is_recording:
-                self.record_move(row, col, letter, self.game.current_player)
-            # Update the UI from the main thread
-            self.root.after(0, self.after_computer_move)
-        else:
-            # Should not happen, but handle it
-            messagebox.showwarning("Invalid Move", "Computer attempted an invalid move.")
-
-    def after_computer_move(self):
-        """Update UI after the computer has made a move."""
-        self.update_board()
+    def poll_engine(self):
+        """Handle the engine's events on the Tk thread, then poll again."""
+        for event in self.engine.poll():
+            if self.is_replaying:
+                continue  # Replays do not use the engine
+            kind = event[0]
+            if kind == 'move':
+                self.after_engine_move(event[1])
+            else:
+                self.engine_busy = False
+                if kind in ('invalid', 'error') and self.latency is not None:
+                    self.latency.drop()
+                if kind == 'invalid':
+                    messagebox.showwarning("Invalid Move", "Cannot make this move.")
+                elif kind == 'error':
+                    messagebox.showerror("Engine Error", f"{event[1]}\nPlease start a new game.")
+        self.root.after(ENGINE_POLL_MS, self.poll_engine)
+
+    def after_engine_move(self, delta):
+        """Update UI after the engine has played a move."""
+        if self.latency is not None and self.latency.has('sent') and not self.latency.has('received'):
+            self.latency.mark('received')
+            self.latency.mark('engine', delta['move_time'])
+        apply_move_delta(self.game, delta)
+        # Record the move if recording is enabled
+        if self.is_recording:
+            self.record_move(delta['row'], delta['col'], delta['letter'], self.game.current_player)
         if self.game.check_game_over():
+            self.engine_busy = False
+            self.flush_render()
             self.update_turn_label(game_over=True)
             self.after_game_over()
-        else:
-            self.update_turn_label()
-            self.process_computer_turn()
+            return
+        self.request_render()
+        computer_next = self.player_types[self.game.current_player] == 'Computer'
+        if computer_next and self.player_types[delta['player']] == 'Computer':
+            return  # The worker is still playing the computers' moves
+        self.engine_busy = False
+        self.process_computer_turn()
+
+    def request_render(self):
+        """Schedule a repaint, at most one per frame interval."""
+        if self.render_after_id is not None:
+            return  # The pending frame will draw this change as well
+        wait = self.last_render + 1 / MAX_FPS - time.perf_counter()
+        self.render_after_id = self.root.after(max(0, int(wait * 1000)), self.render_frame)
+
+    def render_frame(self):
+        """Repaint everything that changed since the last frame."""
+        self.render_after_id = None
+        self.last_render = time.perf_counter()
+        self.update_board()
+        self.update_turn_label(game_over=self.game.game_over)
+        if self.latency is not None and self.latency.has('received') and not self.latency.has('render_start'):
+            self.latency.mark('render_start', self.last_render)
+            self.latency.mark('render_end')
+            # Idle callbacks run in order, so this one runs after Tk's own redraw
+            self.root.after_idle(self.after_paint)
+
+    def after_paint(self):
+        """Finish measuring a click once Tk has repainted."""
+        if self.latency.finish() is not None and self.latency_label is not None:
+            self.latency_label.config(text=self.latency.overlay_text(self.game.board_size))
+
+    def flush_render(self):
+        """Repaint now instead of waiting for the pending frame."""
+        if self.render_after_id is not None:
+            self.root.after_cancel(self.render_after_id)
+        self.render_frame()
 
     def record_move(self, row, col, letter, player):
         """Record the move details."""
-        self.recorded_moves.append({
-            'row': row,
-            'col': col,
-            'letter': letter,
-            'player': player
-        })
+        self.recorder.record_move(row, col, letter, player)
 
     def after_game_over(self):
         """Handle actions after the game is over."""
-        if self.is_recording:
+        if self.is_recording and self.recorder is not None:
+            self.recorder.finish(self.game.winner)
             self.save_recording()
-        if not self.is_replaying:
-            if self.game.winner == 'Draw':
-                messagebox.showinfo("Game Over", "The game is over. It's a draw!")
-            else:
-                messagebox.showinfo("Game Over", f"The game is over. {self.game.winner} Player wins!")
+            self.recorder = None
+        if self.game.winner == 'Draw':
+            messagebox.showinfo("Game Over", "The game is over. It's a draw!")
         else:
-            # Replay is over
-            self.is_replaying = False
-            # Enable user interaction after replay
-            for btn in self.letter_buttons.values():
-                btn.config(state=tk.NORMAL)
+            messagebox.showinfo("Game Over", f"The game is over. {self.game.winner} Player wins!")
 
     def save_recording(self):
         """Save the recorded moves to a file."""
         # Prompt the user to select a file location
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("Text Files", "*.txt")],
+            filetypes=[("JSON Files", "*.json"), ("Binary Recordings", "*.sosr"), ("Text Files", "*.txt")],
             title="Save Game Recording"
         )
         if file_path:
-            # Include game settings in the recording
-            recording_data = {
-                'board_size': self.game.board_size,
-                'game_mode': self.game_mode_var.get(),
-                'player_types': self.player_types,
-                'moves': self.recorded_moves
-            }
-            with open(file_path, 'w') as f:
-                json.dump(recording_data, f)
+            # The streamed recording already holds the settings and every move
+            recording_data = load_recording(self.recorder.file_path)
+            recording_data.pop('complete', None)
+            save_recording(file_path, recording_data)
             messagebox.showinfo("Recording Saved", f"Game recording saved to {file_path}.")
 
     def replay_game(self):
         """Replay a game from a recorded file."""
-        if self.game and not self.game.game_over:
+        if self.game and not self.game.game_over and not self.is_replaying:
             messagebox.showwarning("Game in Progress", "Please finish the current game before replaying.")
             return
 
         # Prompt the user to select a file
         file_path = filedialog.askopenfilename(
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("Text Files", "*.txt")],
+            filetypes=[("Game Recordings", "*.json *.sosr"), ("Text Files", "*.txt")],
             title="Open Game Recording"
         )
         if file_path:
-            with open(file_path, 'r') as f:
-                recording_data = json.load(f)
-            # Check if recording_data has necessary fields
-            if 'board_size' not in recording_data or 'moves' not in recording_data:
+            # JSON and binary recordings are both accepted
+            try:
+                recording_data = load_recording(file_path)
+                replay = ReplayEngine(recording_data)
+            except (KeyError, TypeError, ValueError):
                 messagebox.showerror("Invalid Recording", "The selected file is not a valid game recording.")
                 return
-            self.recorded_moves = recording_data['moves']
-            self.setup_replay_game(recording_data)
+            if self.is_replaying:
+                self.pause_replay()  # Switch to the new recording
+            self.setup_replay_game(replay)
             # Disable user interaction during replay
             for btn in self.letter_buttons.values():
                 btn.config(state=tk.DISABLED)
             self.is_replaying = True
-            self.current_move_index = 0
-            self.replay_next_move()
+            self.replay_scale.config(to=len(replay))
+            self.replay_scale.set(0)
+            self.replay_frame.pack(pady=5)
+            self.play_replay()
 
-    def setup_replay_game(self, recording_data):
-        """Set up the game for replay based on the recording data."""
-        board_size = recording_data['board_size']
-        game_mode = recording_data['game_mode']
-        player_types = recording_data.get('player_types', {'Blue': 'Human', 'Red': 'Human'})
+    def setup_replay_game(self, replay):
+        """Set up the game for replay based on a ReplayEngine."""
+        board_size = replay.board_size
+        game_mode = replay.game_mode
+        player_types = replay.player_types
 
         # Update GUI elements to reflect recorded settings
         self.board_size_entry.delete(0, tk.END)
@@ -457,12 +498,9 @@ class GameUI:
         self.blue_player_var.set(player_types['Blue'])
         self.red_player_var.set(player_types['Red'])
 
-        # Set up game mode
-        if game_mode == 'simple':
-            self.game = SimpleGame(board_size)
-        else:
-            self.game = GeneralGame(board_size)
-        self.game.start_new_game()
+        # The replay engine's game is shown; seeking changes it in place
+        self.replay = replay
+        self.game = replay.game
 
         # Set player types
         self.player_types = player_types
@@ -471,42 +509,82 @@ class GameUI:
         self.create_game_area()
         self.update_turn_label()
 
-    def replay_next_move(self):
-        """Replay the next move from the recorded moves."""
-        if self.current_move_index >= len(self.recorded_moves):
-            # Replay is over
-            self.game.check_game_over()  # Ensure game over status is updated
-            self.update_board()
-            self.update_turn_label(game_over=True)
-            self.after_game_over()
-            return
-
-        move = self.recorded_moves[self.current_move_index]
-        row = move['row']
-        col = move['col']
-        letter = move['letter']
-        player = move['player']
-
-        # Set current player
-        self.game.current_player = player
-
-        # Simulate the move
-        move_made = self.game.make_move(row, col, letter)
-        if move_made:
-            self.update_board()
-            self.game.check_game_over()  # Check if the game is over after this move
-            if self.game.game_over:
-                self.update_turn_label(game_over=True)
-                self.after_game_over()
-                return
-            else:
-                self.update_turn_label()
-                self.current_move_index += 1
-                # Schedule the next move
-                self.root.after(1000, self.replay_next_move)  # 1-second delay between moves
+    def play_replay(self):
+        """Start or resume playing the replay at the selected speed."""
+        if self.replay.at_end or self.game.game_over:
+            self.seek_replay(0)  # Play again from the start
+        self.replay_playing = True
+        self.play_button.config(text="Pause")
+        self.schedule_replay()
+
+    def pause_replay(self):
+        """Stop playing the replay; the position is kept."""
+        if self.replay_after_id is not None:
+            self.root.after_cancel(self.replay_after_id)
+            self.replay_after_id = None
+        self.replay_playing = False
+        self.play_button.config(text="Play")
+
+    def toggle_replay(self):
+        """Handle the play/pause button."""
+        if self.replay_playing:
+            self.pause_replay()
         else:
-            messagebox.showerror("Replay Error", "Failed to replay move.")
-            self.is_replaying = False
+            self.play_replay()
+
+    def on_speed_change(self):
+        """Apply a new replay speed straight away if the replay is playing."""
+        if self.replay_playing:
+            self.root.after_cancel(self.replay_after_id)
+            self.schedule_replay()
+
+    def schedule_replay(self):
+        """Schedule the next replay step for the selected speed."""
+        speed = REPLAY_SPEEDS[self.replay_speed_var.get()]
+        interval = 0 if speed is None else max(REPLAY_INTERVAL_MS / speed, 1000 / MAX_FPS)
+        self.replay_after_id = self.root.after(int(interval), self.replay_tick)
+
+    def replay_tick(self):
+        """Advance the replay by one frame's worth of moves."""
+        self.replay_after_id = None
+        speed = REPLAY_SPEEDS[self.replay_speed_var.get()]
+        if speed is None:
+            target = len(self.replay)
+        else:
+            # Faster than the frame rate, several moves are applied per frame
+            target = self.replay.position + max(1, round(speed * 1000 / MAX_FPS / REPLAY_INTERVAL_MS))
+        self.seek_replay(target)
+        if self.replay.at_end or self.game.game_over:
+            self.pause_replay()
+        elif self.replay_playing:
+            self.schedule_replay()
+
+    def seek_replay(self, index):
+        """Show the position after index moves, restoring the nearest keyframe if needed."""
+        if self.replay is None or index == self.replay.position:
+            return
+        try:
+            self.replay.seek(index)
+        except ReplayError as e:
+            self.pause_replay()
+            messagebox.showerror("Replay Error", f"Failed to replay move {e.move_index + 1}: {e}")
+        self.replay_scale.set(self.replay.position)
+        # Only the cells and lines that differ from what is shown are redrawn
+        self.request_render()
+
+    def stop_replay(self):
+        """Leave replay mode and hide the replay controls."""
+        self.pause_replay()
+        self.replay = None
+        self.is_replaying = False
+        self.replay_frame.pack_forget()
+        # Enable user interaction after replay
+        for btn in self.letter_buttons.values():
+            btn.config(state=tk.NORMAL)
 
 if __name__ == '__main__':
-    GameUI()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Play the SOS game.")
+    parser.add_argument('--latency', action='store_true', help="show click-to-paint latency quantiles")
+    parser.add_argument('--latency-log', default=None, help="append per-click latency to this JSON-lines file")
+    args = parser.parse_args()
+    GameUI(measure_latency=args.latency, latency_log=args.latency_log)
\ No newline at end of file
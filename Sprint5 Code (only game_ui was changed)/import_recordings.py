@@ -0,0 +1,206 @@
+# import_recordings.py
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from archive import ArchiveReader, ArchiveWriter
+from recording import load_recording, BINARY_EXTENSION
+from replay import replay_checked
+
+RECORDING_EXTENSIONS = ('.json', '.txt', BINARY_EXTENSION)
+ARCHIVE_EXTENSION = '.sosa'
+# What loading a corrupt file or archived game can raise, e.g. TypeError for JSON that is not an object
+LOAD_ERRORS = (OSError, KeyError, TypeError, ValueError)
+# Directories whose files are never recordings, e.g. the committed benchmark baseline
+SKIPPED_DIRECTORIES = ('benchmarks', '__pycache__')
+
+
+def find_recordings(paths, extensions=RECORDING_EXTENSIONS):
+    """Yield recording files under the given files and directories, sorted."""
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.abspath(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(name for name in dirnames if name not in SKIPPED_DIRECTORIES)
+            for name in sorted(filenames):
+                if name.lower().endswith(extensions):
+                    yield os.path.abspath(os.path.join(dirpath, name))
+
+
+def iter_recordings(paths, on_error=None):
+    """Yield (path, recording dict) from recording files and archives.
+
+    If on_error is given, a file, archive or archived game that cannot be
+    read is skipped after calling on_error(path, exception); otherwise the
+    exception is raised.
+    """
+    for path in find_recordings(paths, RECORDING_EXTENSIONS + (ARCHIVE_EXTENSION,)):
+        try:
+            if path.lower().endswith(ARCHIVE_EXTENSION):
+                with ArchiveReader(path) as reader:
+                    for index in range(len(reader)):
+                        try:
+                            recording_data = reader.game(index)
+                        except LOAD_ERRORS as e:
+                            if on_error is None:
+                                raise
+                            on_error(f'{path}[{index}]', e)
+                        else:
+                            yield path, recording_data
+            else:
+                recording_data = load_recording(path)
+                yield path, recording_data
+        except LOAD_ERRORS as e:
+            if on_error is None:
+                raise
+            on_error(path, e)
+
+
+def file_signature(path):
+    """Return (size, mtime_ns) used to spot files that changed since the last run."""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def validate_recording(recording_data):
+    """Replay a recording and return it with its computed winner.
+
+    Only recordings that validate_recordings reports as valid, with no errors
+    or warnings, are accepted; otherwise raises ValueError with the first
+    problem found.
+    """
+    game, diagnostics = replay_checked(recording_data)
+    if diagnostics:
+        first = diagnostics[0]
+        where = '' if first['move'] is None else f" at move {first['move']}"
+        raise ValueError(f"{first['message']}{where}")
+    return {
+        'board_size': recording_data['board_size'],
+        'game_mode': recording_data['game_mode'],
+        'player_types': recording_data.get('player_types', {'Blue': 'Human', 'Red': 'Human'}),
+        'moves': [
+            {'row': m['row'], 'col': m['col'], 'letter': m['letter'], 'player': m['player']}
+            for m in recording_data['moves']
+        ],
+        'winner': game.winner,
+    }
+
+
+def import_file(path):
+    """Worker: load and validate one file; return (path, digest, recording, error)."""
+    try:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        recording_data = validate_recording(load_recording(path))
+        return path, digest, recording_data, None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+
+
+def load_state(state_path, archive_size):
+    """Read the import state file.
+
+    Entries that point past the end of the archive belong to games that were
+    never written, so they are dropped and those files are imported again.
+    """
+    entries = {}
+    if not os.path.exists(state_path):
+        return entries
+    with open(state_path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # Torn last line
+            if entry.get('index') is not None and entry['index'] >= archive_size:
+                continue
+            entries[entry['path']] = entry
+    return entries
+
+
+def run_import(archive_path, paths, workers=None, batch_size=256, retry_errors=False, log=None):
+    """Import recordings into an archive; return a summary dict.
+
+    Progress is kept in '<archive>.state' so an interrupted import can be
+    rerun with the same arguments and picks up where it stopped without
+    importing anything twice. Failures are appended to '<archive>.errors'.
+    """
+    state_path = archive_path + '.state'
+    errors_path = archive_path + '.errors'
+    summary = {'imported': 0, 'failed': 0, 'skipped': 0, 'duplicates': 0}
+
+    with ArchiveWriter(archive_path) as writer:
+        state = load_state(state_path, len(writer))
+        digests = {e['digest'] for e in state.values() if e.get('digest') and e['status'] == 'ok'}
+
+        pending = []
+        for path in find_recordings(paths):
+            entry = state.get(path)
+            if entry and entry['signature'] == list(file_signature(path)):
+                if entry['status'] == 'ok' or not retry_errors:
+                    summary['skipped'] += 1
+                    continue
+            pending.append(path)
+
+        with open(state_path, 'a') as state_file, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                results = list(pool.map(import_file, batch, chunksize=max(1, len(batch) // 32)))
+                failures = []
+                games = []
+                for path, digest, recording_data, error in results:
+                    entry = {'path': path, 'signature': list(file_signature(path)), 'digest': digest}
+                    if error is not None:
+                        entry.update(status='error', index=None)
+                        failures.append({'path': path, 'error': error})
+                        summary['failed'] += 1
+                    elif digest in digests:
+                        entry.update(status='duplicate', index=None)
+                        summary['duplicates'] += 1
+                    else:
+                        digests.add(digest)
+                        entry.update(status='ok', index=len(writer) + len(games))
+                        games.append(recording_data)
+                        summary['imported'] += 1
+                    state_file.write(json.dumps(entry) + '\n')
+                # State is written before the games so a crash can only lose games, never duplicate them
+                state_file.flush()
+                os.fsync(state_file.fileno())
+                for recording_data in games:
+                    writer.add(recording_data)
+                writer.checkpoint()
+                if failures:
+                    with open(errors_path, 'a') as f:
+                        for failure in failures:
+                            f.write(json.dumps(failure) + '\n')
+                if log:
+                    log(f"{start + len(batch)}/{len(pending)} files processed")
+        summary['archive_games'] = len(writer)
+    return summary
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Import JSON game recordings into an archive.")
+    parser.add_argument('archive', help="archive file to create or extend")
+    parser.add_argument('paths', nargs='+', help="recording files or directories to scan")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=256, help="files per checkpoint")
+    parser.add_argument('--retry-errors', action='store_true', help="retry files that failed before")
+    args = parser.parse_args(argv)
+
+    summary = run_import(
+        args.archive, args.paths, workers=args.workers, batch_size=args.batch_size,
+        retry_errors=args.retry_errors, log=lambda message: print(message, file=sys.stderr)
+    )
+    print(json.dumps(summary))
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# latency.py
+
+import json
+import time
+from game_stats import QuantileSketch
+
+# Stages of one click, in milliseconds:
+#   engine          make_move and the game-over check in the engine worker
+#   queue           the rest of the trip to the worker and back, including the wait for the next poll
+#   frame_wait      from the move reaching the UI to the start of the frame that draws it
+#   render          drawing the frame (update_board and the status line)
+#   paint           from the end of the frame to Tk finishing its redraw
+#   input_to_paint  from the click to Tk finishing its redraw
+STAGES = ('input_to_paint', 'engine', 'queue', 'frame_wait', 'render', 'paint')
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyTracker:
+    """Follows clicks through the UI and keeps latency quantiles per board size.
+
+    The UI calls click() when a cell is clicked and mark() as the move passes
+    each step; finish() is called once Tk has repainted. Only one click is
+    followed at a time, as the UI ignores clicks while a move is in flight.
+    """
+
+    def __init__(self, log_path=None):
+        self.sketches = {}  # (board_size, stage) -> QuantileSketch of milliseconds
+        self.pending = None  # Timestamps of the click being followed
+        self.log = open(log_path, 'a') if log_path else None
+
+    def click(self, board_size, timestamp=None):
+        """Start following a click made at timestamp (perf_counter(), default now)."""
+        self.pending = {'board_size': board_size, 'click': time.perf_counter() if timestamp is None else timestamp}
+
+    def mark(self, name, value=None):
+        """Record a timestamp (or another value) for the click being followed."""
+        if self.pending is not None:
+            self.pending[name] = time.perf_counter() if value is None else value
+
+    def has(self, name):
+        """Return True if the click being followed has reached the named step."""
+        return self.pending is not None and name in self.pending
+
+    def drop(self):
+        """Stop following the current click, e.g. when its move was rejected."""
+        self.pending = None
+
+    def finish(self):
+        """Complete the click being followed; return its stage times in milliseconds."""
+        p = self.pending
+        self.pending = None
+        if p is None or 'render_end' not in p:
+            return None
+        painted = time.perf_counter()
+        engine = p.get('engine', 0.0)
+        stages = {
+            'input_to_paint': painted - p['click'],
+            'engine': engine,
+            'queue': p['received'] - p['sent'] - engine,
+            'frame_wait': p['render_start'] - p['received'],
+            'render': p['render_end'] - p['render_start'],
+            'paint': painted - p['render_end'],
+        }
+        stages = {stage: seconds * 1000 for stage, seconds in stages.items()}
+        for stage, ms in stages.items():
+            self.sketches.setdefault((p['board_size'], stage), QuantileSketch()).add(ms)
+        if self.log:
+            self.log.write(json.dumps({'board_size': p['board_size'], **{f'{s}_ms': v for s, v in stages.items()}}) + '\n')
+            self.log.flush()
+        return stages
+
+    def summary(self):
+        """Return {board size: {stage: {'count', 'p50', 'p95', 'p99'}}} in milliseconds."""
+        result = {}
+        for (board_size, stage), sketch in sorted(self.sketches.items()):
+            entry = {'count': sketch.count}
+            for q in QUANTILES:
+                entry[f'p{round(q * 100)}'] = sketch.quantile(q)
+            result.setdefault(board_size, {})[stage] = entry
+        return result
+
+    def overlay_text(self, board_size):
+        """Return a one-line input-to-paint summary for a board size."""
+        sketch = self.sketches.get((board_size, 'input_to_paint'))
+        if sketch is None:
+            return "Latency: no clicks measured yet"
+        p50, p95, p99 = (sketch.quantile(q) for q in QUANTILES)
+        return f"Latency {board_size}x{board_size} (n={sketch.count}): " \
+               f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms"
+
+    def close(self):
+        """Write the summary to the log and close it."""
+        if self.log:
+            self.log.write(json.dumps({'summary': self.summary()}) + '\n')
+            self.log.close()
+            self.log = None
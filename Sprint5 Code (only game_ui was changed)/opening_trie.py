@@ -0,0 +1,315 @@
+# opening_trie.py
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from game import GeneralGame
+from import_recordings import iter_recordings
+from recording import GAME_MODES, LETTERS
+from replay import ReplayEngine, ReplayError
+
+# On-disk layout (little-endian):
+#   header: magic 'SOST', version u8, padding to 4 bytes, root count u32, node count u32
+#   roots:  board_size u32, game_mode u32, node index u32 for each root
+#   nodes:  NODE_FIELDS u32 values per node. Children of a node are stored
+#           next to each other, sorted by token, so lookups binary search them.
+TRIE_MAGIC = b'SOST'
+TRIE_VERSION = 1
+HEADER = struct.Struct('<4sB3xII')
+ROOT = struct.Struct('<III')
+NODE_FIELDS = 7  # token, games, blue wins, red wins, draws, first child, child count
+TOKEN, GAMES, BLUE, RED, DRAWS, FIRST_CHILD, CHILD_COUNT = range(NODE_FIELDS)
+DEFAULT_DEPTH = 12
+
+
+def symmetries(n):
+    """Return the eight board symmetries as (forward, inverse) cell maps."""
+    m = n - 1
+    identity = lambda r, c: (r, c)
+    rot90 = lambda r, c: (c, m - r)
+    rot180 = lambda r, c: (m - r, m - c)
+    rot270 = lambda r, c: (m - c, r)
+    flip_h = lambda r, c: (r, m - c)
+    flip_v = lambda r, c: (m - r, c)
+    transpose = lambda r, c: (c, r)
+    anti = lambda r, c: (m - c, m - r)
+    return [
+        (identity, identity), (rot90, rot270), (rot180, rot180), (rot270, rot90),
+        (flip_h, flip_h), (flip_v, flip_v), (transpose, transpose), (anti, anti),
+    ]
+
+
+def encode_token(n, row, col, letter):
+    """Pack a move into a token; tokens sort by cell, then letter."""
+    return (row * n + col) * 2 + LETTERS.index(letter)
+
+
+def decode_token(n, token):
+    """Unpack a token into (row, col, letter)."""
+    row, col = divmod(token >> 1, n)
+    return row, col, LETTERS[token & 1]
+
+
+def canonicalise(n, moves):
+    """Return (tokens, inverse map) for the symmetry giving the smallest token sequence.
+
+    The smallest sequence of a game starts with the smallest sequence of each
+    of its prefixes, so canonical games share their canonical openings.
+    """
+    best = None
+    for forward, inverse in symmetries(n):
+        tokens = [encode_token(n, *forward(row, col), letter) for row, col, letter in moves]
+        if best is None or tokens < best[0]:
+            best = (tokens, inverse)
+    return best
+
+
+def result_counts(winner):
+    """Return (blue, red, draws) increments for a winner."""
+    return (winner == 'Blue', winner == 'Red', winner == 'Draw')
+
+
+class OpeningTrie:
+    """In-memory opening trie that new games can be added to.
+
+    Each node is [games, blue wins, red wins, draws, {token: child}]. Games are
+    stored per (board size, game mode) up to max_depth moves.
+    """
+
+    def __init__(self, max_depth=DEFAULT_DEPTH):
+        self.max_depth = max_depth
+        self.roots = {}
+
+    def add_game(self, board_size, game_mode, moves, winner):
+        """Add a game given as (row, col, letter) moves and its winner."""
+        tokens, _ = canonicalise(board_size, moves[:self.max_depth])
+        blue, red, draws = result_counts(winner)
+        node = self.roots.setdefault((board_size, game_mode), [0, 0, 0, 0, {}])
+        for token in [None] + tokens:
+            if token is not None:
+                node = node[4].setdefault(token, [0, 0, 0, 0, {}])
+            node[0] += 1
+            node[1] += blue
+            node[2] += red
+            node[3] += draws
+
+    def add_recording(self, recording_data):
+        """Add a recording dict, replaying it when it has no stated winner."""
+        moves = [(m['row'], m['col'], m['letter']) for m in recording_data['moves']]
+        winner = recording_data.get('winner')
+        if winner is None:
+            game = ReplayEngine(recording_data, keyframe_interval=None).run_to_end()
+            if not game.game_over:
+                raise ReplayError("Recording ends before the game is over.")
+            winner = game.winner
+        self.add_game(recording_data['board_size'], recording_data['game_mode'], moves, winner)
+
+    @classmethod
+    def load(cls, file_path, max_depth=DEFAULT_DEPTH):
+        """Read a saved trie back into memory so more games can be added."""
+        trie = cls(max_depth)
+        with OpeningIndex(file_path) as index:
+            nodes = index.nodes
+
+            def build(i):
+                base = i * NODE_FIELDS
+                first, count = nodes[base + FIRST_CHILD], nodes[base + CHILD_COUNT]
+                children = {nodes[(first + k) * NODE_FIELDS + TOKEN]: build(first + k) for k in range(count)}
+                return [nodes[base + GAMES], nodes[base + BLUE], nodes[base + RED], nodes[base + DRAWS], children]
+
+            for key, root in index.roots.items():
+                trie.roots[key] = build(root)
+        return trie
+
+    def save(self, file_path):
+        """Write the trie in the memory-mappable format (atomically replacing file_path)."""
+        values = []
+        queue = []
+        roots = []
+        # Breadth-first so each node's children are contiguous
+        for key in sorted(self.roots):
+            roots.append((key, len(values) // NODE_FIELDS))
+            queue.append(self.roots[key])
+            values.extend([0, 0, 0, 0, 0, 0, 0])
+        position = 0
+        while position < len(queue):
+            node = queue[position]
+            base = position * NODE_FIELDS
+            values[base + GAMES:base + DRAWS + 1] = node[:4]
+            values[base + FIRST_CHILD] = len(queue)
+            values[base + CHILD_COUNT] = len(node[4])
+            for token in sorted(node[4]):
+                queue.append(node[4][token])
+                values.extend([token, 0, 0, 0, 0, 0, 0])
+            position += 1
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(TRIE_MAGIC, TRIE_VERSION, len(roots), len(queue)))
+            for (board_size, game_mode), node in roots:
+                f.write(ROOT.pack(board_size, GAME_MODES.index(game_mode), node))
+            f.write(struct.pack('<%dI' % len(values), *values))
+        os.replace(tmp_path, file_path)
+
+
+class OpeningIndex:
+    """Memory-mapped, read-only view of a saved opening trie."""
+
+    def __init__(self, file_path):
+        if sys.byteorder != 'little':
+            raise RuntimeError("Opening tries can only be read on little-endian machines.")
+        self.file = open(file_path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, root_count, node_count = HEADER.unpack_from(self.map)
+        if magic != TRIE_MAGIC:
+            raise ValueError("Not an opening trie.")
+        if version != TRIE_VERSION:
+            raise ValueError(f"Unsupported opening trie version: {version}")
+        self.roots = {}
+        for i in range(root_count):
+            board_size, mode, node = ROOT.unpack_from(self.map, HEADER.size + i * ROOT.size)
+            self.roots[(board_size, GAME_MODES[mode])] = node
+        start = HEADER.size + root_count * ROOT.size
+        self.nodes = memoryview(self.map)[start:start + node_count * NODE_FIELDS * 4].cast('I')
+
+    def find_child(self, node, token):
+        """Return the child of node with token, or None."""
+        nodes = self.nodes
+        lo = nodes[node * NODE_FIELDS + FIRST_CHILD]
+        hi = lo + nodes[node * NODE_FIELDS + CHILD_COUNT]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = nodes[mid * NODE_FIELDS + TOKEN]
+            if value < token:
+                lo = mid + 1
+            elif value > token:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def find_node(self, board_size, game_mode, moves):
+        """Return (node, inverse map) for an opening, or (None, None)."""
+        node = self.roots.get((board_size, game_mode))
+        tokens, inverse = canonicalise(board_size, moves)
+        for token in tokens:
+            if node is None:
+                break
+            node = self.find_child(node, token)
+        return node, inverse
+
+    def node_stats(self, node):
+        """Return the counts stored at a node."""
+        base = node * NODE_FIELDS
+        nodes = self.nodes
+        return {
+            'games': nodes[base + GAMES], 'blue_wins': nodes[base + BLUE],
+            'red_wins': nodes[base + RED], 'draws': nodes[base + DRAWS],
+        }
+
+    def lookup(self, board_size, game_mode, moves):
+        """Return the counts for games that started with moves (or None)."""
+        node, _ = self.find_node(board_size, game_mode, moves)
+        return None if node is None else self.node_stats(node)
+
+    def continuations(self, board_size, game_mode, moves):
+        """Return [(row, col, letter, stats)] for the recorded next moves."""
+        node, inverse = self.find_node(board_size, game_mode, moves)
+        if node is None:
+            return []
+        result = []
+        first = self.nodes[node * NODE_FIELDS + FIRST_CHILD]
+        for child in range(first, first + self.nodes[node * NODE_FIELDS + CHILD_COUNT]):
+            row, col, letter = decode_token(board_size, self.nodes[child * NODE_FIELDS + TOKEN])
+            result.append((*inverse(row, col), letter, self.node_stats(child)))
+        return result
+
+    def book_move(self, game, moves, min_games=1):
+        """Return the recorded (row, col, letter) that scored best for the player to move.
+
+        game is the SimpleGame/GeneralGame after moves; returns None when the
+        position is not in the book.
+        """
+        game_mode = 'general' if isinstance(game, GeneralGame) else 'simple'
+        player = game.current_player
+        best = None
+        for row, col, letter, stats in self.continuations(game.board_size, game_mode, moves):
+            if stats['games'] < min_games or not game.is_move_valid(row, col):
+                continue
+            wins = stats['blue_wins'] if player == 'Blue' else stats['red_wins']
+            score = (wins + 0.5 * stats['draws']) / stats['games']
+            if best is None or score > best[0]:
+                best = (score, (row, col, letter))
+        return None if best is None else best[1]
+
+    def close(self):
+        """Release the memory map and file."""
+        self.nodes.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Build and query the opening trie.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="add recordings to a trie file, creating it if needed")
+    add.add_argument('trie')
+    add.add_argument('paths', nargs='+', help="recording files, archives or directories")
+    add.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help="moves stored per game")
+    query = commands.add_parser('query', help="show results for an opening")
+    query.add_argument('trie')
+    query.add_argument('--size', type=int, required=True)
+    query.add_argument('--mode', choices=GAME_MODES, required=True)
+    query.add_argument('moves', nargs='*', help="moves as row,col,letter")
+    args = parser.parse_args(argv)
+
+    if args.command == 'add':
+        if os.path.exists(args.trie):
+            trie = OpeningTrie.load(args.trie, args.depth)
+        else:
+            trie = OpeningTrie(args.depth)
+        added = 0
+        skipped = 0
+
+        def skip(path, error):
+            nonlocal skipped
+            skipped += 1
+            print(f"{path}: skipped: {error}", file=sys.stderr)
+
+        for path, recording_data in iter_recordings(args.paths, on_error=skip):
+            try:
+                trie.add_recording(recording_data)
+                added += 1
+            except (KeyError, TypeError, ValueError) as e:
+                skip(path, e)
+        trie.save(args.trie)
+        print(f"Added {added} games, skipped {skipped}.")
+        return 0
+
+    moves = []
+    for text in args.moves:
+        row, col, letter = text.split(',')
+        moves.append((int(row), int(col), letter.upper()))
+    with OpeningIndex(args.trie) as index:
+        stats = index.lookup(args.size, args.mode, moves)
+        if stats is None:
+            print("Opening not found.")
+            return 1
+        print(f"{stats['games']} games: Blue {stats['blue_wins']}, Red {stats['red_wins']}, "
+              f"draws {stats['draws']}")
+        for row, col, letter, child in index.continuations(args.size, args.mode, moves):
+            print(f"  {row},{col},{letter}: {child['games']} games, Blue {child['blue_wins']}, "
+                  f"Red {child['red_wins']}, draws {child['draws']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# perf_gate.py
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+from bench_engine import BENCHMARKS, machine_info, run_benchmark, run_suite
+from recording import GAME_MODES
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'perf_baseline.json')
+GATE_SIZES = (3, 10, 50, 200)
+GATE_OPTIONS = {'fill': 0.5, 'warmup': 1, 'repeat': 7, 'min_time': 0.05, 'seed': 0}
+BASELINE_ROUNDS = 3
+# A benchmark regresses when its median grows by more than the larger of
+# TOLERANCE and NOISE_FACTOR times the combined relative noise of both runs
+TOLERANCE = 0.25
+NOISE_FACTOR = 2.0
+
+
+def relative_noise(result):
+    """Return a result's spread relative to its median.
+
+    Baselines carry 'noise', measured between independent runs; a single run
+    only has the spread of its own repetitions, which is usually smaller.
+    """
+    if 'noise' in result:
+        return result['noise']
+    return result['stdev'] / result['median'] if result['median'] else 0.0
+
+
+def threshold(baseline, current, tolerance=TOLERANCE, noise_factor=NOISE_FACTOR):
+    """Return the relative slowdown allowed between two results of the same benchmark."""
+    noise = math.hypot(relative_noise(baseline), relative_noise(current))
+    return max(tolerance, noise_factor * noise)
+
+
+def compare(baseline_results, current_results, tolerance=TOLERANCE, noise_factor=NOISE_FACTOR):
+    """Compare two lists of results; return one row per benchmark key.
+
+    Rows are dicts with 'key', 'baseline' and 'current' medians (None when the
+    benchmark is missing from that run), 'change' (relative), 'threshold' and
+    'status', one of 'ok', 'regression', 'improved', 'new' and 'missing'.
+    """
+    baseline = {result['key']: result for result in baseline_results}
+    current = {result['key']: result for result in current_results}
+    rows = []
+    for key in list(baseline) + [key for key in current if key not in baseline]:
+        old, new = baseline.get(key), current.get(key)
+        row = {'key': key, 'baseline': old and old['median'], 'current': new and new['median'],
+               'change': None, 'threshold': None}
+        if new is None:
+            row['status'] = 'missing'
+        elif old is None:
+            row['status'] = 'new'
+        else:
+            row['change'] = new['median'] / old['median'] - 1
+            row['threshold'] = threshold(old, new, tolerance, noise_factor)
+            if row['change'] > row['threshold']:
+                row['status'] = 'regression'
+            elif row['change'] < -row['threshold']:
+                row['status'] = 'improved'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def format_time(seconds):
+    """Return a per-call time with a readable unit."""
+    if seconds is None:
+        return '-'
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.2f} ms'
+    return f'{seconds * 1e6:.2f} us'
+
+
+def format_diff(rows):
+    """Return the per-benchmark comparison as a text table."""
+    lines = [f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>8} {'allowed':>8}  status"]
+    for row in rows:
+        change = '-' if row['change'] is None else f"{row['change']:+.1%}"
+        allowed = '-' if row['threshold'] is None else f"{row['threshold']:.0%}"
+        status = row['status'].upper() if row['status'] == 'regression' else row['status']
+        lines.append(f"{row['key']:<40} {format_time(row['baseline']):>12} {format_time(row['current']):>12} "
+                     f"{change:>8} {allowed:>8}  {status}")
+    return '\n'.join(lines)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Read a baseline file written by save_baseline()."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def merge_rounds(suites):
+    """Combine several run_suite() results into baseline entries.
+
+    Each benchmark keeps the median of its per-round medians, and its noise
+    is the relative range of those medians.
+    """
+    rounds = [{result['key']: result for result in suite['results']} for suite in suites]
+    merged = []
+    for result in suites[0]['results']:
+        medians = [round_results[result['key']]['median'] for round_results in rounds]
+        median = statistics.median(medians)
+        merged.append({
+            'key': result['key'],
+            'name': result['name'],
+            'mode': result['mode'],
+            'size': result['size'],
+            'median': median,
+            'noise': (max(medians) - min(medians)) / median,
+            'rounds': medians,
+        })
+    return merged
+
+
+def save_baseline(suites, path=BASELINE_PATH):
+    """Write the results of one or more run_suite() calls as a baseline."""
+    baseline = {
+        'machine': suites[0]['machine'],
+        'options': suites[0]['options'],
+        'results': merge_rounds(suites),
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def remeasure(rows, options):
+    """Time the regressed benchmarks again; return their new results.
+
+    A single slow run (another process waking up, a frequency change) should
+    not fail the gate, so a regression only counts if it happens twice.
+    """
+    results = []
+    for row in rows:
+        if row['status'] == 'regression':
+            name, game_mode, board_size = row['key'].split('/')
+            results.append(run_benchmark(name, game_mode, int(board_size), **options))
+    return results
+
+
+def run_gate(baseline, tolerance=TOLERANCE, noise_factor=NOISE_FACTOR, progress=None):
+    """Run the baseline's benchmarks again and compare; return the comparison rows."""
+    options = baseline['options']
+    results = baseline['results']
+    current = []
+    for result in results:
+        current.append(run_benchmark(result['name'], result['mode'], result['size'], **options))
+        if progress:
+            progress(current[-1])
+    rows = compare(results, current, tolerance, noise_factor)
+    retried = {result['key']: result for result in remeasure(rows, options)}
+    if retried:
+        # Keep the faster of the two runs of each regressed benchmark
+        current = [min(result, retried.get(result['key'], result), key=lambda r: r['median']) for result in current]
+        rows = compare(results, current, tolerance, noise_factor)
+    return rows
+
+
+def main(argv=None):
+    """Command-line entry point; exits with 1 if any benchmark regressed, 2 if the baseline is from another machine."""
+    parser = argparse.ArgumentParser(description="Check the engine benchmarks against the committed baseline.")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file")
+    parser.add_argument('--update', action='store_true',
+                        help="run the benchmarks and overwrite the baseline instead of checking it")
+    parser.add_argument('--rounds', type=int, default=BASELINE_ROUNDS,
+                        help="independent runs combined into a refreshed baseline")
+    parser.add_argument('--current', default=None,
+                        help="compare results saved by bench_engine.py --output instead of running the benchmarks")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="smallest slowdown that fails, e.g. 0.25")
+    parser.add_argument('--noise-factor', type=float, default=NOISE_FACTOR,
+                        help="allowed slowdown in multiples of the measured noise")
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        print(f"  {result['key']}", file=sys.stderr, flush=True)
+
+    if args.update:
+        if args.rounds < 1:
+            parser.error("--rounds must be at least 1")
+        suites = [run_suite(BENCHMARKS, GAME_MODES, GATE_SIZES, progress=progress, **GATE_OPTIONS)
+                  for _ in range(args.rounds)]
+        save_baseline(suites, args.baseline)
+        print(f"Wrote {len(suites[0]['results'])} benchmarks to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    current = None
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    machine = current['machine'] if current else machine_info()
+    if baseline['machine'] != machine:
+        # Timings from another machine or interpreter say nothing about regressions
+        print(f"The baseline was measured on {baseline['machine']}, not on {machine}, so it cannot be "
+              f"compared. Measure a baseline here first with:\n  python perf_gate.py --update", file=sys.stderr)
+        return 2
+    if current:
+        rows = compare(baseline['results'], current['results'], args.tolerance, args.noise_factor)
+    else:
+        rows = run_gate(baseline, args.tolerance, args.noise_factor, progress)
+    print(format_diff(rows))
+
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed. If the slowdown is intended, refresh the baseline with:"
+              f"\n  python perf_gate.py --update")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
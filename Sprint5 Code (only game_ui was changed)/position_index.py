@@ -0,0 +1,249 @@
+# position_index.py
+
+import argparse
+import functools
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from archive import ArchiveReader
+from opening_trie import symmetries
+from recording import GAME_MODES, LETTERS
+from rng import CounterRandom, derive_seed
+
+# Index layout (little-endian):
+#   header:  magic 'SOSP', version u8, padding, posting count u64
+#   records: hash u64, game u32, move u32, sorted by hash then game then move
+# A record says that archive game `game` reached the position after `move`
+# moves. Hashes are Zobrist hashes over the letters on the board, taken as
+# the minimum over the eight board symmetries, so rotated or mirrored
+# positions and different move orders reaching the same letters all share a
+# hash. Ownership of the letters is not part of the position.
+INDEX_MAGIC = b'SOSP'
+INDEX_VERSION = 1
+HEADER = struct.Struct('<4sB3xQ')
+RECORD = struct.Struct('<QII')
+RECORD_DTYPE = np.dtype([('hash', '<u8'), ('game', '<u4'), ('move', '<u4')])
+# A bucket of n records is sorted in about SORT_BYTES * n bytes: the records,
+# their sorted copy and the int64 permutation from np.lexsort
+SORT_BYTES = 2 * RECORD.size + 8
+DEFAULT_MEMORY = 256 * 1024 * 1024
+SYMMETRIES = 8
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_table(board_size, game_mode):
+    """Return Zobrist keys indexed by cell * 2 + letter."""
+    rng = CounterRandom(derive_seed('zobrist', board_size, game_mode))
+    return tuple(rng.bits_at(i) for i in range(board_size * board_size * 2))
+
+
+@functools.lru_cache(maxsize=None)
+def symmetric_cells(board_size):
+    """Return, for each symmetry, a tuple mapping cell index to its image."""
+    n = board_size
+    maps = []
+    for forward, _ in symmetries(n):
+        cells = []
+        for cell in range(n * n):
+            row, col = forward(*divmod(cell, n))
+            cells.append(row * n + col)
+        maps.append(tuple(cells))
+    return maps
+
+
+def position_hashes(board_size, game_mode, moves):
+    """Yield the canonical hash after each (row, col, letter) move."""
+    table = zobrist_table(board_size, game_mode)
+    maps = symmetric_cells(board_size)
+    hashes = [0] * len(maps)
+    for row, col, letter in moves:
+        cell = row * board_size + col
+        bit = LETTERS.index(letter)
+        for s, cells in enumerate(maps):
+            hashes[s] ^= table[cells[cell] * 2 + bit]
+        yield min(hashes)
+
+
+def board_hash(board_size, game_mode, board):
+    """Return the canonical hash of a board in BaseGame.board form."""
+    moves = [
+        (row, col, cell['letter'])
+        for row, cells in enumerate(board) for col, cell in enumerate(cells) if cell is not None
+    ]
+    hashes = list(position_hashes(board_size, game_mode, moves))
+    return hashes[-1] if hashes else 0
+
+
+def game_records(task):
+    """Worker: return the records for a range of archive games as a RECORD_DTYPE array."""
+    archive_path, start, stop = task
+    records = []
+    with ArchiveReader(archive_path) as reader:
+        for index in range(start, stop):
+            settings, moves = reader.game_moves(index)
+            plain = [(row, col, letter) for row, col, letter, _ in moves]
+            for move, value in enumerate(position_hashes(settings['board_size'], settings['game_mode'], plain), 1):
+                records.append((value, index, move))
+    return np.array(records, dtype=RECORD_DTYPE)
+
+
+def bucket_bounds(postings, memory_budget=DEFAULT_MEMORY, buckets=None):
+    """Return the hash values that split postings into buckets that sort within memory_budget.
+
+    Canonical hashes are the minimum of SYMMETRIES hashes, so they crowd
+    towards zero; the bounds are quantiles of that distribution, which keeps
+    the buckets about the same size. buckets, if given, overrides the count.
+    """
+    if buckets is None:
+        buckets = max(1, -(-postings * SORT_BYTES // memory_budget))
+    bounds = []
+    for b in range(1, buckets):
+        quantile = 1 - (1 - b / buckets) ** (1 / SYMMETRIES)
+        bounds.append(min(int(quantile * 2 ** 64), 2 ** 64 - 1))
+    return np.array(bounds, dtype=np.uint64)
+
+
+def build_index(archive_path, index_path, workers=None, chunk_games=500, memory_budget=DEFAULT_MEMORY, buckets=None):
+    """Build a position index for an archive and return the number of postings.
+
+    Workers hash ranges of games in parallel. Their records are spread over
+    bucket files by hash range, then each bucket is sorted on its own as a
+    packed array. The bucket count grows with the archive's move count so
+    that sorting one bucket takes about memory_budget bytes; on top of that
+    the builder holds the records of up to two tasks per worker. A single
+    position reached by a large share of all games still lands in one bucket.
+    """
+    with ArchiveReader(archive_path) as reader:
+        count = len(reader)
+        postings = sum(reader.columns['move_count'])
+    tasks = [(archive_path, start, min(start + chunk_games, count)) for start in range(0, count, chunk_games)]
+    bounds = bucket_bounds(postings, memory_budget, buckets)
+    total = 0
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(index_path))) as tmpdir:
+        bucket_files = [open(os.path.join(tmpdir, f'{b}.bin'), 'w+b') for b in range(len(bounds) + 1)]
+        try:
+            # Submit a few tasks per worker at a time so finished results never pile up
+            window = 2 * (workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for first in range(0, len(tasks), window):
+                    for records in pool.map(game_records, tasks[first:first + window]):
+                        which = np.searchsorted(bounds, records['hash'], side='right')
+                        records = records[np.argsort(which, kind='stable')]
+                        ends = np.cumsum(np.bincount(which, minlength=len(bucket_files)))
+                        for f, start, end in zip(bucket_files, np.concatenate(([0], ends[:-1])), ends):
+                            if end > start:
+                                f.write(records[start:end].tobytes())
+                        total += len(records)
+            tmp_path = index_path + '.tmp'
+            with open(tmp_path, 'wb') as out:
+                out.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, total))
+                for f in bucket_files:
+                    f.seek(0)
+                    records = np.fromfile(f, dtype=RECORD_DTYPE)
+                    order = np.lexsort((records['move'], records['game'], records['hash']))
+                    out.write(records[order].tobytes())
+                    del records, order
+            os.replace(tmp_path, index_path)
+        finally:
+            for f in bucket_files:
+                f.close()
+    return total
+
+
+class PositionIndex:
+    """Memory-mapped position index; lookups binary search the sorted hashes."""
+
+    def __init__(self, file_path):
+        if sys.byteorder != 'little':
+            raise RuntimeError("Position indexes can only be read on little-endian machines.")
+        self.file = open(file_path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self.map)
+        if magic != INDEX_MAGIC:
+            raise ValueError("Not a position index.")
+        if version != INDEX_VERSION:
+            raise ValueError(f"Unsupported position index version: {version}")
+        # Two u64 words per record; the hash is the first
+        self.words = memoryview(self.map)[HEADER.size:HEADER.size + self.count * RECORD.size].cast('Q')
+
+    def __len__(self):
+        return self.count
+
+    def lookup_hash(self, value):
+        """Return [(game, move)] for every posting of a hash."""
+        words = self.words
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if words[2 * mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        results = []
+        while lo < self.count and words[2 * lo] == value:
+            packed = words[2 * lo + 1]
+            results.append((packed & 0xFFFFFFFF, packed >> 32))
+            lo += 1
+        return results
+
+    def find_moves(self, board_size, game_mode, moves):
+        """Return [(game, move)] for games that reached the position after moves."""
+        hashes = list(position_hashes(board_size, game_mode, moves))
+        return self.lookup_hash(hashes[-1]) if hashes else []
+
+    def find_board(self, board_size, game_mode, board):
+        """Return [(game, move)] for games that reached a BaseGame.board position."""
+        return self.lookup_hash(board_hash(board_size, game_mode, board))
+
+    def close(self):
+        """Release the memory map and file."""
+        self.words.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Build and query the position index of an archive.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="index every position in an archive")
+    build.add_argument('archive')
+    build.add_argument('index')
+    build.add_argument('--workers', type=int, default=None)
+    build.add_argument('--memory', type=float, default=DEFAULT_MEMORY / 1024 / 1024,
+                       help="MiB used to sort each bucket of postings")
+    query = commands.add_parser('query', help="list games that reached a position")
+    query.add_argument('index')
+    query.add_argument('--size', type=int, required=True)
+    query.add_argument('--mode', choices=GAME_MODES, required=True)
+    query.add_argument('moves', nargs='+', help="moves as row,col,letter")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        total = build_index(args.archive, args.index, workers=args.workers,
+                            memory_budget=int(args.memory * 1024 * 1024))
+        print(f"Indexed {total} positions.")
+        return 0
+
+    moves = []
+    for text in args.moves:
+        row, col, letter = text.split(',')
+        moves.append((int(row), int(col), letter.upper()))
+    with PositionIndex(args.index) as index:
+        for game, move in index.find_moves(args.size, args.mode, moves):
+            print(f"game {game}, after move {move}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
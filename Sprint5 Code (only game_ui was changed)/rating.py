@@ -0,0 +1,232 @@
+# rating.py
+
+import math
+from statistics import NormalDist
+
+
+def expected_score(elo_diff):
+    """Return the expected score for a player rated elo_diff points higher."""
+    return 1.0 / (1.0 + 10.0 ** (-elo_diff / 400.0))
+
+
+def elo_from_score(score):
+    """Convert an expected score (0..1) into an Elo difference."""
+    if score <= 0.0:
+        return -math.inf
+    if score >= 1.0:
+        return math.inf
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def z_value(confidence):
+    """Return the two-sided normal quantile for a confidence level."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+class MatchStats:
+    """Win/draw/loss counts for one engine against another."""
+
+    def __init__(self, wins=0, draws=0, losses=0):
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def add(self, score):
+        """Add a single game result scored 1, 0.5 or 0 from the first engine's side."""
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        elif score == 0.5:
+            self.draws += 1
+        else:
+            raise ValueError("Score must be 1, 0.5 or 0.")
+
+    def merge(self, other):
+        """Add the counts from another MatchStats."""
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+
+    def reversed(self):
+        """Return the same stats seen from the other engine's side."""
+        return MatchStats(self.losses, self.draws, self.wins)
+
+    def score(self):
+        """Return the mean score per game."""
+        if self.games == 0:
+            return 0.5
+        return (self.wins + 0.5 * self.draws) / self.games
+
+    def score_variance(self):
+        """Return the per-game variance of the score."""
+        n = self.games
+        if n == 0:
+            return 0.0
+        s = self.score()
+        return (self.wins * (1.0 - s) ** 2
+                + self.draws * (0.5 - s) ** 2
+                + self.losses * s ** 2) / n
+
+    def elo(self, confidence=0.95):
+        """Return (elo, lower, upper) using the logistic Elo model."""
+        s = self.score()
+        if self.games == 0:
+            return 0.0, -math.inf, math.inf
+        margin = z_value(confidence) * math.sqrt(self.score_variance() / self.games)
+        return elo_from_score(s), elo_from_score(s - margin), elo_from_score(s + margin)
+
+    def bayeselo(self, confidence=0.95, prior_draws=2):
+        """Return (elo, drawelo, lower, upper) using the BayesElo model.
+
+        prior_draws virtual draws are added so that lopsided or tiny samples
+        still give a finite estimate.
+        """
+        n = self.games + prior_draws
+        w = self.wins / n if self.wins else 0.5 / n
+        l = self.losses / n if self.losses else 0.5 / n
+        k = 200.0 / math.log(10.0)
+        elo = k * (math.log(w) - math.log(l) + math.log(1.0 - l) - math.log(1.0 - w))
+        drawelo = k * (math.log(1.0 - l) - math.log(l) + math.log(1.0 - w) - math.log(w))
+        # Delta method over the multinomial covariance of (w, l)
+        dw = k * (1.0 / w + 1.0 / (1.0 - w))
+        dl = -k * (1.0 / l + 1.0 / (1.0 - l))
+        var = (dw * dw * w * (1.0 - w) + dl * dl * l * (1.0 - l) - 2.0 * dw * dl * w * l) / n
+        margin = z_value(confidence) * math.sqrt(var)
+        return elo, drawelo, elo - margin, elo + margin
+
+
+class SPRT:
+    """Sequential probability ratio test between two Elo hypotheses.
+
+    H0 is that the engine is elo0 stronger than its opponent, H1 that it is
+    elo1 stronger. Uses the normal approximation to the trinomial
+    log-likelihood ratio, so a result is available after every game.
+    """
+
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        if elo0 >= elo1:
+            raise ValueError("elo0 must be lower than elo1.")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1.0 - alpha))
+        self.upper_bound = math.log((1.0 - beta) / alpha)
+        self.stats = MatchStats()
+
+    def add(self, score):
+        """Add a game result and return the current decision."""
+        self.stats.add(score)
+        return self.status()
+
+    def variance_floor(self):
+        """Return the score variance with one virtual win and one virtual loss added.
+
+        A side that wins, loses or draws every game has a sample variance of
+        zero, which would keep the ratio at 0 however long the streak.
+        """
+        return MatchStats(self.stats.wins + 1, self.stats.draws, self.stats.losses + 1).score_variance()
+
+    def llr(self):
+        """Return the current log-likelihood ratio."""
+        n = self.stats.games
+        if n == 0:
+            return 0.0
+        var = max(self.stats.score_variance(), self.variance_floor())
+        s0 = expected_score(self.elo0)
+        s1 = expected_score(self.elo1)
+        s = self.stats.score()
+        return n * (s1 - s0) * (2.0 * s - s0 - s1) / (2.0 * var)
+
+    def status(self):
+        """Return 'H0' or 'H1' once a hypothesis is accepted, otherwise None."""
+        llr = self.llr()
+        if llr >= self.upper_bound:
+            return 'H1'
+        if llr <= self.lower_bound:
+            return 'H0'
+        return None
+
+
+class RatingTable:
+    """Incrementally collects results between engine variants and rates them."""
+
+    def __init__(self):
+        self.pairs = {}  # (a, b) with a < b -> MatchStats from a's side
+        self.engines = set()
+
+    def add_result(self, blue_engine, red_engine, winner):
+        """Record a finished game; winner is 'Blue', 'Red' or 'Draw'."""
+        if winner == 'Blue':
+            score = 1
+        elif winner == 'Red':
+            score = 0
+        elif winner == 'Draw':
+            score = 0.5
+        else:
+            raise ValueError("Winner must be 'Blue', 'Red' or 'Draw'.")
+        self.add_score(blue_engine, red_engine, score)
+
+    def add_game(self, game, engines):
+        """Record a finished game given a {'Blue': name, 'Red': name} mapping."""
+        if not game.check_game_over():
+            raise ValueError("Game is not over yet.")
+        self.add_result(engines['Blue'], engines['Red'], game.winner)
+
+    def add_score(self, engine, opponent, score):
+        """Record a game scored 1, 0.5 or 0 from engine's side."""
+        self.engines.update((engine, opponent))
+        if engine < opponent:
+            self.pairs.setdefault((engine, opponent), MatchStats()).add(score)
+        else:
+            self.pairs.setdefault((opponent, engine), MatchStats()).add(1 - score)
+
+    def stats(self, engine, opponent):
+        """Return MatchStats for engine against opponent."""
+        if engine < opponent:
+            return self.pairs.get((engine, opponent), MatchStats())
+        return self.pairs.get((opponent, engine), MatchStats()).reversed()
+
+    def ratings(self, iterations=200, prior_draws=1):
+        """Return {engine: elo} fitted to all results, centred on zero.
+
+        Bradley-Terry fit by minorisation-maximisation with draws counted as
+        half a win each; prior_draws virtual draws per played pair keep
+        unbeaten engines finite.
+        """
+        engines = sorted(self.engines)
+        if not engines:
+            return {}
+        strength = {e: 1.0 for e in engines}
+        wins = {e: 0.0 for e in engines}
+        games = {}
+        for (a, b), st in self.pairs.items():
+            n = st.games + prior_draws
+            wins[a] += st.wins + 0.5 * (st.draws + prior_draws)
+            wins[b] += st.losses + 0.5 * (st.draws + prior_draws)
+            games[(a, b)] = n
+        for _ in range(iterations):
+            new_strength = {}
+            for e in engines:
+                denom = 0.0
+                for (a, b), n in games.items():
+                    if e in (a, b):
+                        denom += n / (strength[a] + strength[b])
+                new_strength[e] = wins[e] / denom if denom else strength[e]
+            # Normalise by geometric mean so the ratings stay centred
+            log_mean = sum(math.log(s) for s in new_strength.values()) / len(engines)
+            strength = {e: s / math.exp(log_mean) for e, s in new_strength.items()}
+        return {e: 400.0 * math.log10(s) for e, s in strength.items()}
+
+    def summary(self):
+        """Return a list of (engine, elo, games) sorted from strongest to weakest."""
+        ratings = self.ratings()
+        rows = []
+        for engine, elo in ratings.items():
+            played = sum(st.games for pair, st in self.pairs.items() if engine in pair)
+            rows.append((engine, elo, played))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
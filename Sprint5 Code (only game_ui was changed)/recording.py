@@ -0,0 +1,243 @@
+# recording.py
+
+import itertools
+import json
+import os
+import struct
+import time
+
+# Binary recording layout (little-endian):
+#   header: magic 'SOSR', version u8, board_size u16, game_mode u8,
+#           blue type u8, red type u8, record width u8, move count u32
+#   moves:  one unsigned integer of record width bytes per move, holding
+#           (row * board_size + col) << 2 | letter << 1 | player
+#   footer: magic 'SOSE', move count u32, winner u8 (optional)
+# Streamed recordings are written move by move with a move count of
+# STREAMING_COUNT in the header; the footer is added when the game ends. A
+# streamed file without a footer is read up to its last complete record.
+BINARY_MAGIC = b'SOSR'
+BINARY_VERSION = 1
+BINARY_EXTENSION = '.sosr'
+HEADER = struct.Struct('<4sBHBBBBI')
+FOOTER_MAGIC = b'SOSE'
+FOOTER = struct.Struct('<4sIB')
+STREAMING_COUNT = 0xFFFFFFFF
+
+GAME_MODES = ('simple', 'general')
+PLAYER_TYPES = ('Human', 'Computer')
+LETTERS = ('S', 'O')
+PLAYERS = ('Blue', 'Red')
+RECORD_FORMATS = {2: 'H', 4: 'I'}
+WINNERS = (None, 'Blue', 'Red', 'Draw')
+
+
+def record_width(board_size):
+    """Return the number of bytes needed for one move record."""
+    return 2 if board_size * board_size * 4 <= 0xFFFF else 4
+
+
+def encode_move(board_size, row, col, letter, player):
+    """Pack one move into an integer."""
+    return ((row * board_size + col) << 2) | (LETTERS.index(letter) << 1) | PLAYERS.index(player)
+
+
+def decode_move(board_size, value):
+    """Unpack one move integer into (row, col, letter, player)."""
+    row, col = divmod(value >> 2, board_size)
+    return row, col, LETTERS[(value >> 1) & 1], PLAYERS[value & 1]
+
+
+def encode_header(board_size, game_mode, player_types, move_count):
+    """Return the binary header bytes for a recording."""
+    return HEADER.pack(
+        BINARY_MAGIC, BINARY_VERSION, board_size, GAME_MODES.index(game_mode),
+        PLAYER_TYPES.index(player_types['Blue']), PLAYER_TYPES.index(player_types['Red']),
+        record_width(board_size), move_count
+    )
+
+
+def decode_header(data):
+    """Parse a binary header; return (settings dict, record width, move count)."""
+    if len(data) < HEADER.size:
+        raise ValueError("Recording is too short.")
+    magic, version, board_size, mode, blue, red, width, count = HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a binary SOS recording.")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported recording version: {version}")
+    if width not in RECORD_FORMATS:
+        raise ValueError(f"Unsupported record width: {width}")
+    if board_size <= 2:
+        raise ValueError(f"Invalid board size: {board_size}")
+    if mode >= len(GAME_MODES):
+        raise ValueError(f"Invalid game mode: {mode}")
+    if blue >= len(PLAYER_TYPES) or red >= len(PLAYER_TYPES):
+        raise ValueError(f"Invalid player types: {blue}, {red}")
+    settings = {
+        'board_size': board_size,
+        'game_mode': GAME_MODES[mode],
+        'player_types': {'Blue': PLAYER_TYPES[blue], 'Red': PLAYER_TYPES[red]},
+    }
+    return settings, width, count
+
+
+def encode_binary(recording_data):
+    """Return a recording dict encoded in the binary format."""
+    board_size = recording_data['board_size']
+    moves = recording_data['moves']
+    header = encode_header(
+        board_size, recording_data['game_mode'],
+        recording_data.get('player_types', {'Blue': 'Human', 'Red': 'Human'}), len(moves)
+    )
+    fmt = '<%d%s' % (len(moves), RECORD_FORMATS[record_width(board_size)])
+    body = struct.pack(fmt, *(
+        encode_move(board_size, m['row'], m['col'], m['letter'], m['player']) for m in moves
+    ))
+    if 'winner' in recording_data:
+        body += FOOTER.pack(FOOTER_MAGIC, len(moves), WINNERS.index(recording_data['winner']))
+    return header + body
+
+
+def decode_stream_tail(data, width):
+    """Return (move count, winner, complete) for a streamed recording."""
+    body = len(data) - HEADER.size
+    if body >= FOOTER.size:
+        magic, count, winner = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        if magic == FOOTER_MAGIC and count * width == body - FOOTER.size and winner < len(WINNERS):
+            return count, WINNERS[winner], True
+    # A footer cut off part way is not read as moves: a record-aligned tail
+    # that is the start of the footer for the moves before it is torn
+    for start in range(len(data) - FOOTER.size + 1, len(data)):
+        if start >= HEADER.size and (start - HEADER.size) % width == 0:
+            count = (start - HEADER.size) // width
+            if FOOTER.pack(FOOTER_MAGIC, count, 0).startswith(data[start:]):
+                return count, None, False
+    # No footer: the writer stopped early, keep every complete record
+    return body // width, None, False
+
+
+def decode_binary_moves(data):
+    """Return (settings, moves) with moves as (row, col, letter, player) tuples.
+
+    Streamed recordings also get 'complete' and, once finished, 'winner' in
+    their settings.
+    """
+    settings, width, count = decode_header(data)
+    if count == STREAMING_COUNT:
+        count, winner, complete = decode_stream_tail(data, width)
+        settings['complete'] = complete
+        if winner is not None:
+            settings['winner'] = winner
+    end = HEADER.size + count * width
+    if len(data) < end:
+        raise ValueError("Recording is truncated.")
+    if end < len(data) < end + FOOTER.size and 'complete' not in settings:
+        raise ValueError("Recording footer is truncated.")
+    if len(data) == end + FOOTER.size and 'complete' not in settings:
+        magic, _, winner = FOOTER.unpack_from(data, end)
+        if magic == FOOTER_MAGIC and winner < len(WINNERS) and WINNERS[winner] is not None:
+            settings['winner'] = WINNERS[winner]
+    board_size = settings['board_size']
+    values = struct.unpack_from('<%d%s' % (count, RECORD_FORMATS[width]), data, HEADER.size)
+    return settings, [decode_move(board_size, value) for value in values]
+
+
+def decode_binary(data):
+    """Return a recording dict in the same shape as the JSON format."""
+    settings, moves = decode_binary_moves(data)
+    settings['moves'] = [
+        {'row': row, 'col': col, 'letter': letter, 'player': player}
+        for row, col, letter, player in moves
+    ]
+    return settings
+
+
+def save_recording(file_path, recording_data):
+    """Save a recording; '.sosr' files use the binary format, others JSON."""
+    if file_path.lower().endswith(BINARY_EXTENSION):
+        with open(file_path, 'wb') as f:
+            f.write(encode_binary(recording_data))
+    else:
+        with open(file_path, 'w') as f:
+            json.dump(recording_data, f)
+
+
+def load_recording(file_path):
+    """Load a binary or JSON recording, detected from its first bytes."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if data.startswith(BINARY_MAGIC):
+        return decode_binary(data)
+    recording_data = json.loads(data.decode('utf-8'))
+    if 'board_size' not in recording_data or 'moves' not in recording_data:
+        raise ValueError("The file is not a valid game recording.")
+    return recording_data
+
+
+class StreamRecorder:
+    """Append-only binary recorder that writes each move as it is made.
+
+    Moves are flushed to disk every flush_every moves (and fsynced when sync
+    is set), so a crash loses at most that many moves and memory use does not
+    grow with the length of the game. finish() writes the footer.
+    """
+
+    def __init__(self, file_path, board_size, game_mode, player_types, flush_every=16, sync=False, exclusive=False):
+        self.file_path = file_path
+        self.board_size = board_size
+        self.flush_every = flush_every
+        self.sync = sync
+        self.move_count = 0
+        self.record = struct.Struct('<' + RECORD_FORMATS[record_width(board_size)])
+        # exclusive raises FileExistsError instead of replacing an existing file
+        self.file = open(file_path, 'xb' if exclusive else 'wb')
+        self.file.write(encode_header(board_size, game_mode, player_types, STREAMING_COUNT))
+        self.flush()
+
+    def record_move(self, row, col, letter, player):
+        """Append one move to the file."""
+        self.file.write(self.record.pack(encode_move(self.board_size, row, col, letter, player)))
+        self.move_count += 1
+        if self.move_count % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        """Push buffered moves to the operating system (and disk if sync)."""
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def finish(self, winner=None):
+        """Write the footer and close the file."""
+        if self.file.closed:
+            return
+        self.file.write(FOOTER.pack(FOOTER_MAGIC, self.move_count, WINNERS.index(winner)))
+        self.close()
+
+    def close(self):
+        """Close the file without a footer, leaving a recoverable partial recording."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def new_stream_recorder(directory, board_size, game_mode, player_types, stamp=None, **options):
+    """Start a StreamRecorder in a new file named after the time, e.g. 'game-20240101-120000.sosr'.
+
+    A game started within the same second as another gets a numbered name
+    instead of replacing its recording.
+    """
+    stamp = stamp or time.strftime('game-%Y%m%d-%H%M%S')
+    for attempt in itertools.count():
+        name = stamp + (f'-{attempt}' if attempt else '') + BINARY_EXTENSION
+        try:
+            return StreamRecorder(os.path.join(directory, name), board_size, game_mode, player_types,
+                                  exclusive=True, **options)
+        except FileExistsError:
+            continue
@@ -0,0 +1,232 @@
+# renderers.py
+
+import argparse
+import shutil
+import sys
+import time
+from game import create_game
+from recording import GAME_MODES
+
+# A board delta describes what changed on the board since the previous one:
+#   'cells':     [(row, col, letter, player)] for changed cells; letter and player
+#                are None for cells that were emptied
+#   'sequences': {'blue': (first, [(start, end), ...]), 'red': (...)}; lines drawn
+#                from index first on are removed and the listed ones drawn after them
+# During play `first` is the number of lines already drawn, so lines are only
+# added; a restored position can take lines away.
+LINE_COLORS = ('blue', 'red')
+
+
+def board_delta(game, drawn):
+    """Return the board delta for a game's changes and update drawn, the line count per colour."""
+    cells = []
+    for row, col in game.pop_dirty_cells():
+        cell = game.board[row][col]
+        if cell is None:
+            cells.append((row, col, None, None))
+        else:
+            cells.append((row, col, cell['letter'], cell['player']))
+    sequences = {}
+    for color, found in (('blue', game.blue_sequences), ('red', game.red_sequences)):
+        first = min(drawn[color], len(found))
+        sequences[color] = (first, list(found[first:]))
+        drawn[color] = len(found)
+    return {'cells': cells, 'sequences': sequences}
+
+
+def status_text(game, game_over=False):
+    """Return the (text, colour) of the turn or result line."""
+    if game_over:
+        if game.winner == 'Draw':
+            return "Game Over: Draw", 'black'
+        return f"Game Over: {game.winner} Player Wins!", game.winner.lower()
+    return f"Turn: {game.current_player} Player", game.current_player.lower()
+
+
+class Renderer:
+    """Abstract base class for anything that draws a board from board deltas."""
+
+    def __init__(self):
+        self.drawn = {color: 0 for color in LINE_COLORS}
+
+    def start(self, board_size):
+        """Begin drawing a new, empty board."""
+        self.drawn = {color: 0 for color in LINE_COLORS}
+        self.new_board(board_size)
+
+    def render(self, game):
+        """Draw what changed in a game since the last call."""
+        self.apply(board_delta(game, self.drawn))
+
+    def new_board(self, board_size):
+        """Abstract method to clear the drawing for an empty board."""
+        raise NotImplementedError("Must be implemented by subclasses.")
+
+    def apply(self, delta):
+        """Abstract method to draw a board delta."""
+        raise NotImplementedError("Must be implemented by subclasses.")
+
+    def show_status(self, text, color='black'):
+        """Show the turn or result line."""
+
+    def close(self):
+        """Release anything the renderer holds."""
+
+
+class NullRenderer(Renderer):
+    """Draws nothing; counts what it was given, for benchmarks and headless drivers."""
+
+    def __init__(self):
+        super().__init__()
+        self.boards = 0
+        self.deltas = 0
+        self.cells = 0
+        self.lines = 0
+
+    def new_board(self, board_size):
+        self.boards += 1
+
+    def apply(self, delta):
+        self.deltas += 1
+        self.cells += len(delta['cells'])
+        self.lines += sum(len(new) for _, new in delta['sequences'].values())
+
+
+class TerminalRenderer(Renderer):
+    """Draws the board in a terminal with ANSI escape codes.
+
+    Each cell is two characters wide. Cells that are part of an SOS get the
+    background colour of the player who scored it. Boards larger than the
+    terminal are cut off at the right and bottom.
+    """
+
+    FOREGROUND = {'Blue': '34', 'Red': '31'}
+    BACKGROUND = {'blue': '44', 'red': '41'}
+
+    def __init__(self, out=None, columns=None, rows=None):
+        super().__init__()
+        self.out = out if out is not None else sys.stdout
+        size = shutil.get_terminal_size()
+        self.columns = columns if columns is not None else size.columns
+        self.rows = rows if rows is not None else size.lines
+        self.board_size = 0
+        self.view_rows = 0
+        self.view_cols = 0
+        self.letters = {}  # (row, col) -> (letter, player)
+        self.highlights = {}  # (row, col) -> colours of the SOS lines through the cell
+        self.lines = {color: [] for color in LINE_COLORS}
+
+    def new_board(self, board_size):
+        self.board_size = board_size
+        self.view_rows = min(board_size, self.rows - 2)  # Keep room for the status line
+        self.view_cols = min(board_size, self.columns // 2)
+        self.letters = {}
+        self.highlights = {}
+        self.lines = {color: [] for color in LINE_COLORS}
+        parts = ['\x1b[0m\x1b[2J\x1b[H']
+        parts.extend('. ' * self.view_cols + '\n' for _ in range(self.view_rows))
+        self.write(parts)
+
+    def apply(self, delta):
+        touched = set()
+        for row, col, letter, player in delta['cells']:
+            if letter is None:
+                self.letters.pop((row, col), None)
+            else:
+                self.letters[(row, col)] = (letter, player)
+            touched.add((row, col))
+        for color in LINE_COLORS:
+            first, new = delta['sequences'][color]
+            drawn = self.lines[color]
+            while len(drawn) > first:
+                for cell in self.line_cells(drawn.pop()):
+                    self.highlights[cell].remove(color)
+                    touched.add(cell)
+            for sequence in new:
+                drawn.append(sequence)
+                for cell in self.line_cells(sequence):
+                    self.highlights.setdefault(cell, []).append(color)
+                    touched.add(cell)
+        parts = []
+        for row, col in touched:
+            if row < self.view_rows and col < self.view_cols:
+                parts.append(self.cell_text(row, col))
+        self.write(parts)
+
+    def line_cells(self, sequence):
+        """Return the three cells of an SOS."""
+        (r1, c1), (r2, c2) = sequence
+        return ((r1, c1), ((r1 + r2) // 2, (c1 + c2) // 2), (r2, c2))
+
+    def cell_text(self, row, col):
+        """Return the escape codes that redraw one cell in place."""
+        letter, player = self.letters.get((row, col), ('.', None))
+        codes = []
+        if player is not None:
+            codes.append(self.FOREGROUND[player])
+        colors = self.highlights.get((row, col))
+        if colors:
+            codes = ['1', '97', self.BACKGROUND[colors[-1]]]
+        style = '\x1b[' + ';'.join(codes) + 'm' if codes else ''
+        return f'\x1b[{row + 1};{2 * col + 1}H{style}{letter}\x1b[0m'
+
+    def show_status(self, text, color='black'):
+        code = {'blue': '34', 'red': '31'}.get(color, '0')
+        self.write([f'\x1b[{self.view_rows + 1};1H\x1b[2K\x1b[{code}m{text}\x1b[0m'])
+
+    def close(self):
+        self.write([f'\x1b[{self.view_rows + 2};1H\x1b[0m'])
+
+    def write(self, parts):
+        """Send output in one write, so each delta appears at once."""
+        self.out.write(''.join(parts))
+        self.out.flush()
+
+
+def play(game, renderer, max_fps=None):
+    """Play a computer-vs-computer game to the end, rendering it; return the game.
+
+    With max_fps, moves are drawn in batches at most that many times a
+    second; otherwise every move is drawn.
+    """
+    renderer.start(game.board_size)
+    interval = 1 / max_fps if max_fps else 0
+    last_frame = 0.0
+    while not game.check_game_over():
+        move = game.get_computer_move()
+        if move is None:
+            break
+        game.make_move(*move)
+        now = time.perf_counter()
+        if now - last_frame >= interval:
+            renderer.render(game)
+            renderer.show_status(*status_text(game))
+            last_frame = now
+    renderer.render(game)
+    renderer.show_status(*status_text(game, game.game_over))
+    return game
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Play a computer-vs-computer game without Tk.")
+    parser.add_argument('--size', type=int, default=8)
+    parser.add_argument('--mode', choices=GAME_MODES, default='general')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--renderer', choices=('terminal', 'null'), default='terminal')
+    parser.add_argument('--fps', type=float, default=None, help="cap on frames per second")
+    args = parser.parse_args(argv)
+
+    renderer = TerminalRenderer() if args.renderer == 'terminal' else NullRenderer()
+    start = time.perf_counter()
+    try:
+        game = play(create_game(args.mode, args.size, args.seed), renderer, args.fps)
+    finally:
+        renderer.close()
+    elapsed = time.perf_counter() - start
+    print(f"Winner: {game.winner} in {elapsed:.3f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
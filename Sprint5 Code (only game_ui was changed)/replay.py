@@ -0,0 +1,140 @@
+# replay.py
+
+from game import create_game
+from recording import LETTERS, PLAYERS
+
+
+class ReplayError(ValueError):
+    """Raised when a recording cannot be replayed."""
+
+    def __init__(self, message, move_index=None):
+        super().__init__(message)
+        self.move_index = move_index
+
+
+def recording_moves(recording_data):
+    """Return the moves of a recording as (row, col, letter, player) tuples."""
+    return [(m['row'], m['col'], m['letter'], m['player']) for m in recording_data['moves']]
+
+
+class ReplayEngine:
+    """Headless replay of a recording with keyframe seeking.
+
+    Moves are applied to a SimpleGame/GeneralGame at full speed and the game
+    state is snapshotted every keyframe_interval moves, so seek() restores the
+    nearest earlier keyframe and applies at most keyframe_interval - 1 moves.
+    A keyframe_interval of None keeps only the starting position.
+
+    Moves are applied in the engine's own turn order. The recorded 'player'
+    is not used to set the current player: GameUI.record_move stores the side
+    to move after the move, not the side that made it.
+    """
+
+    def __init__(self, recording_data, keyframe_interval=32):
+        if keyframe_interval is not None and keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be at least 1.")
+        self.board_size = recording_data['board_size']
+        self.game_mode = recording_data.get('game_mode', 'simple')
+        self.player_types = recording_data.get('player_types', {'Blue': 'Human', 'Red': 'Human'})
+        self.moves = recording_moves(recording_data)
+        self.keyframe_interval = keyframe_interval
+        self.game = create_game(self.game_mode, self.board_size)
+        self.position = 0  # Number of moves applied
+        self.keyframes = {0: self.game.snapshot()}
+
+    def __len__(self):
+        return len(self.moves)
+
+    @property
+    def at_end(self):
+        return self.position >= len(self.moves)
+
+    def step(self):
+        """Apply the next move and return it as (row, col, letter, player)."""
+        if self.at_end:
+            raise ReplayError("No moves left to replay.", self.position)
+        if self.game.game_over:
+            raise ReplayError("Move recorded after the game was over.", self.position)
+        move = self.moves[self.position]
+        row, col, letter, _ = move
+        if not self.game.make_move(row, col, letter):
+            raise ReplayError(f"Illegal move {letter} at ({row}, {col}).", self.position)
+        self.position += 1
+        if self.at_end:
+            self.game.check_game_over()
+        if (self.keyframe_interval and self.position % self.keyframe_interval == 0
+                and self.position not in self.keyframes):
+            self.keyframes[self.position] = self.game.snapshot()
+        return move
+
+    def seek(self, index):
+        """Bring the game to the state after the first index moves."""
+        index = max(0, min(index, len(self.moves)))
+        if not self.keyframe_interval:
+            keyframe = 0
+        else:
+            keyframe = index - index % self.keyframe_interval
+        while keyframe not in self.keyframes:
+            keyframe -= self.keyframe_interval
+        # Stepping forward from the current position is cheaper when possible
+        if not keyframe <= self.position <= index:
+            self.game.restore(self.keyframes[keyframe])
+            self.position = keyframe
+        while self.position < index:
+            self.step()
+        return self.game
+
+    def run_to_end(self):
+        """Apply every remaining move and return the finished game."""
+        while not self.at_end:
+            self.step()
+        return self.game
+
+
+def diagnostic(level, message, move=None):
+    """Return one diagnostic entry."""
+    return {'level': level, 'move': move, 'message': message}
+
+
+def replay_checked(recording_data):
+    """Replay a recording and return (game, diagnostics); diagnostics is empty if it is valid.
+
+    This is the one definition of a valid recording, shared by the importer
+    and the validator. Checks that every move is legal, that each recorded
+    'player' is the side to move after that move (GameUI.record_move stores
+    it after the move, so an SOS in General mode keeps the same player), that
+    no move follows the end of the game and that a stated winner matches the
+    replayed result.
+    """
+    diagnostics = []
+    try:
+        engine = ReplayEngine(recording_data, keyframe_interval=None)
+    except (KeyError, TypeError, ValueError) as e:
+        return None, [diagnostic('error', f"Unreadable recording: {e}")]
+
+    for index, (row, col, letter, player) in enumerate(engine.moves):
+        if letter not in LETTERS or player not in PLAYERS:
+            diagnostics.append(diagnostic('error', f"Bad move entry {letter!r}/{player!r}.", index))
+            return engine.game, diagnostics
+        try:
+            engine.step()
+        except ReplayError as e:
+            diagnostics.append(diagnostic('error', str(e), index))
+            return engine.game, diagnostics
+        except (IndexError, TypeError, ValueError) as e:
+            # Coordinates of the wrong type or shape, e.g. row '0'
+            diagnostics.append(diagnostic('error', f"Bad move entry: {type(e).__name__}: {e}", index))
+            return engine.game, diagnostics
+        expected = engine.game.current_player
+        if player != expected:
+            diagnostics.append(diagnostic(
+                'error', f"Turn order: recorded {player} to move, expected {expected}.", index
+            ))
+
+    game = engine.game
+    if not game.game_over:
+        diagnostics.append(diagnostic('warning', "Recording ends before the game is over."))
+    stated = recording_data.get('winner')
+    if stated is not None and stated != game.winner:
+        diagnostics.append(diagnostic('error', f"Stated winner {stated}, replay gives {game.winner}."))
+    return game, diagnostics
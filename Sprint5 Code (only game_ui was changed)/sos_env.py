@@ -0,0 +1,151 @@
+# sos_env.py
+
+import numpy as np
+from game import create_game
+
+LETTERS = ('S', 'O')
+
+# Observation planes, always from the point of view of the player to move
+PLANE_S = 0
+PLANE_O = 1
+PLANE_OWN = 2
+PLANE_OPPONENT = 3
+PLANE_SCORING = 4
+NUM_PLANES = 5
+
+
+class SOSEnv:
+    """Gym-style environment around SimpleGame/GeneralGame.
+
+    Actions are integers in range(2 * n * n): action // (n * n) picks the
+    letter (0 = 'S', 1 = 'O') and action % (n * n) picks the cell in row-major
+    order. The observation and action mask are preallocated arrays that are
+    updated in place on every step, so callers that want to keep an
+    observation must copy it.
+    """
+
+    def __init__(self, board_size, game_mode='simple', seed=None, obs_buffer=None, mask_buffer=None, rng_kind='mt'):
+        self.game = create_game(game_mode, board_size, seed=seed, rng_kind=rng_kind)
+        self.board_size = board_size
+        self.game_mode = game_mode
+        self.num_cells = board_size * board_size
+        self.num_actions = 2 * self.num_cells
+
+        if obs_buffer is None:
+            obs_buffer = np.zeros((NUM_PLANES, board_size, board_size), dtype=np.float32)
+        if mask_buffer is None:
+            mask_buffer = np.ones(self.num_actions, dtype=bool)
+        self.observation = obs_buffer
+        self.action_mask = mask_buffer
+        self.swap_plane = np.empty((board_size, board_size), dtype=obs_buffer.dtype)
+
+    def reset(self, seed=None):
+        """Start a new game and return (observation, info)."""
+        self.game.start_new_game()
+        if seed is not None:
+            self.game.rng.seed(seed)
+        self.observation.fill(0)
+        self.action_mask.fill(True)
+        return self.observation, {'player': self.game.current_player}
+
+    def encode_action(self, row, col, letter):
+        """Convert (row, col, letter) into an action index."""
+        return LETTERS.index(letter.upper()) * self.num_cells + row * self.board_size + col
+
+    def decode_action(self, action):
+        """Convert an action index into (row, col, letter)."""
+        letter_index, cell = divmod(int(action), self.num_cells)
+        row, col = divmod(cell, self.board_size)
+        return row, col, LETTERS[letter_index]
+
+    def step(self, action):
+        """Apply an action and return (observation, reward, terminated, truncated, info).
+
+        The reward goes to the player who moved: the number of SOS sequences
+        formed in General mode, or 1 for the winning move in Simple mode.
+        """
+        if self.game.game_over:
+            raise ValueError("Game is over; call reset().")
+        if not 0 <= action < self.num_actions or not self.action_mask[action]:
+            raise ValueError(f"Illegal action: {action}")
+        row, col, letter = self.decode_action(action)
+        mover = self.game.current_player
+        sequences = self.game.blue_sequences if mover == 'Blue' else self.game.red_sequences
+        before = len(sequences)
+
+        self.game.make_move(row, col, letter)
+        new_sequences = sequences[before:]
+
+        # Only the placed cell and newly scored cells change
+        obs = self.observation
+        obs[PLANE_S if letter == 'S' else PLANE_O, row, col] = 1.0
+        obs[PLANE_OWN, row, col] = 1.0
+        for (r1, c1), (r2, c2) in new_sequences:
+            obs[PLANE_SCORING, r1, c1] = 1.0
+            obs[PLANE_SCORING, (r1 + r2) // 2, (c1 + c2) // 2] = 1.0
+            obs[PLANE_SCORING, r2, c2] = 1.0
+        cell = row * self.board_size + col
+        self.action_mask[cell] = False
+        self.action_mask[self.num_cells + cell] = False
+
+        terminated = self.game.check_game_over()
+        if self.game.current_player != mover:
+            # Swap own/opponent planes in place for the new player to move
+            np.copyto(self.swap_plane, obs[PLANE_OWN])
+            np.copyto(obs[PLANE_OWN], obs[PLANE_OPPONENT])
+            np.copyto(obs[PLANE_OPPONENT], self.swap_plane)
+
+        if self.game_mode == 'general':
+            reward = float(len(new_sequences))
+        else:
+            reward = 1.0 if new_sequences else 0.0
+        info = {'player': self.game.current_player, 'winner': self.game.winner}
+        return obs, reward, terminated, False, info
+
+    def legal_actions(self):
+        """Return the indices of all legal actions."""
+        return np.flatnonzero(self.action_mask)
+
+
+class VectorSOSEnv:
+    """A batch of SOSEnv instances sharing contiguous observation tensors.
+
+    observations has shape (num_envs, 5, n, n) and action_masks has shape
+    (num_envs, 2 * n * n); each environment writes into its own slice.
+    Finished environments are reset automatically.
+    """
+
+    def __init__(self, num_envs, board_size, game_mode='simple', seeds=None, rng_kind='mt'):
+        self.num_envs = num_envs
+        self.observations = np.zeros((num_envs, NUM_PLANES, board_size, board_size), dtype=np.float32)
+        self.action_masks = np.ones((num_envs, 2 * board_size * board_size), dtype=bool)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        seeds = seeds if seeds is not None else [None] * num_envs
+        self.envs = [
+            SOSEnv(board_size, game_mode, seed=seeds[i],
+                   obs_buffer=self.observations[i], mask_buffer=self.action_masks[i], rng_kind=rng_kind)
+            for i in range(num_envs)
+        ]
+
+    def reset(self):
+        """Reset every environment and return the batched observations."""
+        for env in self.envs:
+            env.reset()
+        self.terminated.fill(False)
+        return self.observations
+
+    def step(self, actions):
+        """Step every environment with its action.
+
+        Returns (observations, rewards, terminated). An environment whose game
+        ended is reset straight away, so its slice already holds the first
+        observation of the next game.
+        """
+        for i, env in enumerate(self.envs):
+            _, reward, done, _, _ = env.step(actions[i])
+            self.rewards[i] = reward
+            self.terminated[i] = done
+            if done:
+                env.reset()
+        return self.observations, self.rewards, self.terminated
@@ -0,0 +1,86 @@
+# test_archive.py
+
+import os
+import tempfile
+import unittest
+from archive import ArchiveWriter, ArchiveReader, TRAILER
+from game import create_game
+
+
+def computer_game(board_size, game_mode, seed):
+    """Play a computer-vs-computer game and return its recording dict."""
+    game = create_game(game_mode, board_size, seed=seed)
+    moves = []
+    while not game.check_game_over():
+        row, col, letter = game.get_computer_move()
+        game.make_move(row, col, letter)
+        moves.append({'row': row, 'col': col, 'letter': letter, 'player': game.current_player})
+    return {
+        'board_size': board_size, 'game_mode': game_mode,
+        'player_types': {'Blue': 'Computer', 'Red': 'Computer'},
+        'moves': moves, 'winner': game.winner,
+    }
+
+
+class TestArchive(unittest.TestCase):
+    """Unit tests for the archive writer and reader."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'games.sosa')
+        self.games = [computer_game(3 + i % 4, ('simple', 'general')[i % 2], i) for i in range(12)]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_games(self, games):
+        with ArchiveWriter(self.path) as writer:
+            for game in games:
+                writer.add(game)
+
+    def test_random_access(self):
+        """Test that any game can be read back by index."""
+        self.write_games(self.games)
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 12)
+            for i in (7, 0, 11, 4):
+                self.assertEqual(reader.game(i), self.games[i])
+            self.assertEqual(reader.metadata(5)['move_count'], len(self.games[5]['moves']))
+
+    def test_filter(self):
+        """Test filtering on metadata columns."""
+        self.write_games(self.games)
+        with ArchiveReader(self.path) as reader:
+            expected = [i for i, g in enumerate(self.games)
+                        if g['game_mode'] == 'general' and g['board_size'] == 4]
+            self.assertEqual(reader.filter(game_mode='general', board_size=4), expected)
+            expected = [i for i, g in enumerate(self.games) if g['winner'] == 'Draw']
+            self.assertEqual(reader.filter(winner='Draw'), expected)
+            self.assertEqual(reader.filter(min_moves=10, max_moves=9), [])
+
+    def test_append_after_reopen(self):
+        """Test that reopening an archive keeps its games and adds more."""
+        self.write_games(self.games[:5])
+        self.write_games(self.games[5:])
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual([reader.game(i) for i in range(len(reader))], self.games)
+
+    def test_recover_without_trailer(self):
+        """Test that an archive whose writer was killed still opens."""
+        writer = ArchiveWriter(self.path)
+        for game in self.games[:4]:
+            writer.add(game)
+        writer.file.flush()
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+            self.assertEqual(reader.game(3), self.games[3])
+        writer.close()
+        size = os.path.getsize(self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(size - TRAILER.size - 1)
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# test_bench_engine.py
+
+import copy
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from bench_engine import BENCHMARKS, case_make_move, main, make_position, run_benchmark, run_suite
+
+
+class TestBenchEngine(unittest.TestCase):
+    """Unit tests for the engine benchmark suite."""
+
+    def test_positions_are_reproducible(self):
+        """Test that the same seed gives the same partly filled board."""
+        first = make_position('simple', 6, 0.5, seed=3)
+        second = make_position('simple', 6, 0.5, seed=3)
+        self.assertEqual(first.board, second.board)
+        filled = sum(cell is not None for row in first.board for cell in row)
+        self.assertEqual(filled, 18)
+        self.assertFalse(first.game_over)
+
+    def test_every_benchmark_runs(self):
+        """Test that every function can be timed in both modes and gives statistics."""
+        suite = run_suite(BENCHMARKS, ('simple', 'general'), (3, 4), warmup=0, repeat=2, min_time=0.0001)
+        self.assertEqual(len(suite['results']), len(BENCHMARKS) * 2 * 2)
+        for result in suite['results']:
+            self.assertEqual(len(result['times']), 2)
+            self.assertLessEqual(result['min'], result['median'])
+            self.assertLessEqual(result['median'], result['max'])
+            self.assertGreater(result['min'], 0)
+        self.assertEqual(suite['results'][0]['key'], 'make_move/simple/3')
+
+    def test_make_move_leaves_position_unchanged(self):
+        """Test that repeated make_move batches start from the same position."""
+        game = make_position('general', 4, 0.5, seed=1)
+        board = copy.deepcopy(game.board)
+        state = (game.current_player, game.game_over, game.winner, list(game.blue_sequences), list(game.red_sequences))
+        run = case_make_move(game)
+        run(3 * len(game.get_valid_moves()) + 1)  # Several batches, the last one partial
+        self.assertEqual(game.board, board)
+        self.assertEqual(
+            (game.current_player, game.game_over, game.winner, game.blue_sequences, game.red_sequences), state)
+        self.assertFalse(game.pop_dirty_cells())
+
+    def test_invalid_arguments(self):
+        """Test that unknown benchmarks and empty repetitions are rejected."""
+        with self.assertRaises(ValueError):
+            run_benchmark('no_such_function', 'simple', 3)
+        with self.assertRaises(ValueError):
+            run_benchmark('get_valid_moves', 'simple', 3, repeat=0)
+
+    def test_json_output(self):
+        """Test that the command line writes machine-readable results."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.json')
+            with redirect_stdout(io.StringIO()) as out:
+                main(['--benchmarks', 'get_valid_moves', '--modes', 'simple', '--sizes', '3',
+                      '--repeat', '2', '--min-time', '0.0001', '--output', path])
+            with open(path) as f:
+                suite = json.load(f)
+        self.assertEqual([result['key'] for result in suite['results']], ['get_valid_moves/simple/3'])
+        self.assertIn('get_valid_moves/simple/3', out.getvalue())
+        self.assertIn('python', suite['machine'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# test_bench_memory.py
+
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from bench_memory import COMPONENTS, games_per_budget, main, measure_position, play_random
+from game import GeneralGame, SimpleGame
+from replay import ReplayEngine
+
+
+class TestBenchMemory(unittest.TestCase):
+    """Unit tests for the memory benchmarks."""
+
+    def test_play_random_fills_board(self):
+        """Test that general games reach the fill level and give a replayable recording."""
+        game = GeneralGame(6, seed=1)
+        moves = play_random(game, 0.5, random.Random(1))
+        self.assertEqual(len(moves), 18)
+        self.assertEqual(sum(cell is not None for row in game.board for cell in row), 18)
+        recording_data = {'board_size': 6, 'game_mode': 'general', 'moves': moves}
+        replayed = ReplayEngine(recording_data).run_to_end()
+        self.assertEqual(replayed.board, game.board)
+
+    def test_simple_games_stay_in_progress(self):
+        """Test that simple games are filled without forming an SOS."""
+        game = SimpleGame(8, seed=2)
+        play_random(game, 1.0, random.Random(2))
+        self.assertFalse(game.game_over)
+        self.assertEqual(game.blue_sequences + game.red_sequences, [])
+
+    def test_measure_position(self):
+        """Test that every component is measured and grows with the fill level."""
+        empty = measure_position('general', 12, 0.0)
+        full = measure_position('general', 12, 1.0)
+        for component in COMPONENTS:
+            self.assertIn(component, full)
+        self.assertEqual(full['filled_cells'], 144)
+        self.assertGreater(full['game'], empty['game'])
+        self.assertGreater(full['moves'], empty['moves'])
+        self.assertGreater(full['dirty_cells'], 0)
+        self.assertLess(full['binary'], full['moves'])
+        self.assertGreater(full['replay'], full['game'])
+
+    def test_invalid_fill(self):
+        """Test that fill levels outside 0..1 are rejected."""
+        with self.assertRaises(ValueError):
+            measure_position('simple', 3, 1.5)
+
+    def test_games_per_budget(self):
+        """Test the number of live games that fit next to one search."""
+        result = {'game': 900, 'dirty_cells': 100, 'search': 5000}
+        self.assertEqual(games_per_budget(result, 15000), 10)
+        self.assertEqual(games_per_budget(result, 1000), 0)
+
+    def test_json_output(self):
+        """Test that the command line writes machine-readable results."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'memory.json')
+            with redirect_stdout(io.StringIO()) as out:
+                main(['--modes', 'simple', '--sizes', '4', '--fills', '0.5', '--budget', '1', '--output', path])
+            with open(path) as f:
+                suite = json.load(f)
+        self.assertEqual([result['key'] for result in suite['results']], ['simple/4/0.5'])
+        self.assertIn('simple/4/0.5', out.getvalue())
+        self.assertIn('games', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
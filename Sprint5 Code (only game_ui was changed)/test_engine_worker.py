@@ -0,0 +1,116 @@
+# test_engine_worker.py
+
+import unittest
+from engine_worker import EngineClient, apply_move_delta, play_move
+from game import create_game
+
+
+class TestMoveDeltas(unittest.TestCase):
+    """Unit tests for move deltas sent from the engine worker to the UI."""
+
+    def test_mirror_follows_engine(self):
+        """Test that applying every delta to a mirror reproduces the engine's game."""
+        for game_mode in ('simple', 'general'):
+            engine = create_game(game_mode, 6, seed=11)
+            mirror = create_game(game_mode, 6)
+            while not engine.game_over:
+                delta = play_move(engine, *engine.get_computer_move())
+                apply_move_delta(mirror, delta)
+            self.assertEqual(mirror.board, engine.board)
+            self.assertEqual(mirror.blue_sequences, engine.blue_sequences)
+            self.assertEqual(mirror.red_sequences, engine.red_sequences)
+            self.assertEqual(mirror.winner, engine.winner)
+            self.assertTrue(mirror.game_over)
+
+    def test_delta_has_only_new_sequences(self):
+        """Test that a delta carries the sequences formed by its move only."""
+        game = create_game('general', 5)
+        play_move(game, 0, 0, 'S')
+        play_move(game, 0, 1, 'O')
+        delta = play_move(game, 0, 2, 'S')
+        self.assertEqual(delta['blue_sequences'], [((0, 0), (0, 2))])
+        self.assertEqual(delta['player'], 'Blue')
+        self.assertEqual(delta['current_player'], 'Blue')  # Scored, so Blue moves again
+        delta = play_move(game, 4, 4, 's')
+        self.assertEqual(delta['blue_sequences'], [])
+        self.assertEqual(delta['letter'], 'S')
+
+    def test_invalid_move(self):
+        """Test that an invalid move gives no delta."""
+        game = create_game('simple', 3)
+        play_move(game, 1, 1, 'S')
+        self.assertIsNone(play_move(game, 1, 1, 'O'))
+
+
+class TestEngineClient(unittest.TestCase):
+    """Unit tests for the worker process."""
+
+    def setUp(self):
+        self.client = EngineClient()
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_moves_come_back_as_deltas(self):
+        """Test human moves, invalid moves and computer moves through the worker."""
+        self.client.new_game('simple', 3, seed=5)
+        self.client.send_move(1, 1, 'O')
+        (kind, delta), = self.client.wait(timeout=30)
+        self.assertEqual(kind, 'move')
+        self.assertEqual((delta['row'], delta['col'], delta['player']), (1, 1, 'Blue'))
+        self.client.send_move(1, 1, 'S')
+        self.assertEqual(self.client.wait(timeout=30), [('invalid', 1, 1)])
+        self.client.request_computer_moves(['Red'])
+        (kind, delta), = self.client.wait(timeout=30)
+        self.assertEqual((kind, delta['player']), ('move', 'Red'))
+
+    def test_computer_run(self):
+        """Test that one request plays a computer-vs-computer game to the end."""
+        self.client.new_game('general', 5, seed=2)
+        self.client.request_computer_moves(['Blue', 'Red'])
+        mirror = create_game('general', 5)
+        while not mirror.game_over:
+            for kind, delta in self.client.wait(timeout=30):
+                self.assertEqual(kind, 'move')
+                apply_move_delta(mirror, delta)
+        self.assertTrue(all(cell is not None for row in mirror.board for cell in row))
+        self.client.request_computer_moves(['Blue', 'Red'])
+        self.assertEqual(self.client.wait(timeout=30), [('no_move',)])
+
+    def test_old_game_events_are_dropped(self):
+        """Test that events of a replaced game never reach the caller."""
+        self.client.new_game('general', 4)
+        self.client.request_computer_moves(['Blue'])
+        self.client.new_game('general', 4)
+        self.client.send_move(0, 0, 'S')
+        events = self.client.wait(timeout=30)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0][1]['row'], 0)
+        self.assertEqual(events[0][1]['col'], 0)
+
+    def test_move_before_new_game(self):
+        """Test that requests without a game get an error reply and leave the worker running."""
+        self.client.send_move(0, 0, 'S')
+        self.assertEqual(self.client.wait(timeout=30), [('error', "No game has been started.")])
+        self.client.request_computer_moves(['Blue'])
+        self.assertEqual(self.client.wait(timeout=30), [('error', "No game has been started.")])
+        self.client.new_game('simple', 3)
+        self.client.send_move(0, 0, 'S')
+        (kind, _), = self.client.wait(timeout=30)
+        self.assertEqual(kind, 'move')
+
+    def test_dead_worker_is_reported(self):
+        """Test that waiting on a worker that has died returns an error once instead of blocking."""
+        self.client.new_game('simple', 3)
+        self.client.process.terminate()
+        self.client.process.join()
+        self.client.send_move(0, 0, 'S')
+        (kind, message), = self.client.wait()
+        self.assertEqual(kind, 'error')
+        self.assertIn("stopped unexpectedly", message)
+        self.assertFalse(self.client.is_alive())
+        self.assertEqual(self.client.poll(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
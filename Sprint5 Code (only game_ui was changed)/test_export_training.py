@@ -0,0 +1,99 @@
+# test_export_training.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from export_training import export, open_shards, iter_batches, rows_per_shard, ShardWriter, SHARD_BYTES
+from sos_env import PLANE_S, PLANE_O
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLES = ['1.json', '2GHH.json', '3SHC.json', '4.json', '5.json', '6GCC.json']
+
+
+class TestExportTraining(unittest.TestCase):
+    """Unit tests for the training-data exporter."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, 'recordings')
+        os.makedirs(self.source)
+        for name in SAMPLES:
+            shutil.copy(os.path.join(HERE, name), self.source)
+        self.output = os.path.join(self.tmpdir.name, 'shards')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_export_shards(self):
+        """Test positions, moves and outcomes across several shards."""
+        games, positions, skipped = export([self.source], self.output, 3, shard_size=4)
+        self.assertEqual(skipped, 0)
+        shards = open_shards(self.output)
+        self.assertEqual(sum(len(s['move']) for s in shards), positions)
+        self.assertTrue(all(len(s['move']) == 4 for s in shards[:-1]))
+
+        first = shards[0]
+        # 1.json: Blue S at (0, 0), Red O at (1, 0), Blue S at (2, 0) wins
+        self.assertEqual(first['planes'].dtype, np.uint8)
+        self.assertEqual(first['planes'][0].sum(), 0)
+        self.assertEqual(first['planes'][1][PLANE_S, 0, 0], 1)
+        self.assertEqual(first['planes'][2][PLANE_O, 1, 0], 1)
+        self.assertEqual(first['player'][:3].tolist(), [0, 1, 0])
+        self.assertEqual(first['outcome'][:3].tolist(), [1, -1, 1])
+        self.assertEqual(first['move'][0], 0)
+
+    def test_batches_are_views(self):
+        """Test that batches come straight from the memory maps."""
+        export([self.source], self.output, 3, game_mode='simple', shard_size=100)
+        batches = list(iter_batches(self.output, 2))
+        self.assertTrue(all(isinstance(b['planes'], np.memmap) for b in batches))
+        self.assertEqual(sum(len(b['move']) for b in batches), len(open_shards(self.output)[0]['move']))
+
+    def test_unreadable_files_skipped(self):
+        """Test that files that cannot be loaded are counted as skipped, not fatal."""
+        _, expected_positions, _ = export([self.source], self.output, 3)
+        with open(os.path.join(self.source, 'broken.json'), 'w') as f:
+            f.write('{"board_size": ')
+        with open(os.path.join(self.source, 'number.json'), 'w') as f:
+            f.write('3')
+        messages = []
+        games, positions, skipped = export([self.source], self.output, 3, log=messages.append)
+        self.assertEqual(games, len(SAMPLES))
+        self.assertEqual(positions, expected_positions)
+        self.assertEqual(skipped, 2)
+        self.assertEqual(len(messages), 2)
+
+    def test_unfinished_games_logged(self):
+        """Test that unfinished games are skipped with a message naming the file."""
+        with open(os.path.join(HERE, '1.json')) as f:
+            recording_data = json.load(f)
+        recording_data['moves'].pop()
+        with open(os.path.join(self.source, 'unfinished.json'), 'w') as f:
+            json.dump(recording_data, f)
+        messages = []
+        games, _, skipped = export([self.source], self.output, 3, log=messages.append)
+        self.assertEqual((games, skipped), (len(SAMPLES), 1))
+        self.assertEqual(len(messages), 1)
+        self.assertIn('unfinished.json', messages[0])
+
+    def test_shards_sized_in_bytes(self):
+        """Test that large boards get fewer positions per shard and the last shard is trimmed."""
+        self.assertLessEqual(rows_per_shard(200) * (5 * 200 * 200 + 6), SHARD_BYTES)
+        self.assertGreater(rows_per_shard(3), rows_per_shard(200))
+        writer = ShardWriter(self.output, 10, shard_bytes=10 * 506)
+        self.assertEqual(writer.shard_size, 10)
+        rows = np.arange(13)
+        writer.write(np.ones((13, 5, 10, 10), dtype=np.uint8), rows % 2, rows, rows % 3 - 1, 13)
+        writer.close()
+        shards = open_shards(self.output)
+        self.assertEqual([len(s['move']) for s in shards], [10, 3])
+        self.assertEqual(shards[1]['move'].tolist(), [10, 11, 12])
+        self.assertEqual(shards[1]['planes'].shape, (3, 5, 10, 10))
+        self.assertFalse([name for name in os.listdir(self.output) if name.endswith('.tmp')])
+
+
+if __name__ == '__main__':
+    unittest.main()
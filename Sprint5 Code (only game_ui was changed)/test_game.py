@@ -1,7 +1,9 @@
 # test_game.py
 
 import unittest
-from game import BaseGame, SimpleGame, GeneralGame
+import random
+from game import BaseGame, SimpleGame, GeneralGame, create_game
+from rng import derive_seed, CounterRandom, make_rng
 
 class TestBaseGame(unittest.TestCase):
     """Unit tests for the BaseGame class."""
@@ -264,5 +266,85 @@ class TestGeneralGame(unittest.TestCase):
         # Check that the move is among the potential SOS moves
         self.assertIn(move, potential_moves, "Computer did not choose a move that creates an SOS")
 
+class TestSeededRandom(unittest.TestCase):
+    """Unit tests for per-game random streams."""
+
+    def play_computer_game(self, game):
+        """Play a game with computer moves only and return the moves made."""
+        moves = []
+        while not game.check_game_over():
+            move = game.get_computer_move()
+            game.make_move(*move)
+            moves.append(move)
+        return moves
+
+    def test_same_seed_same_game(self):
+        """Test that two games with the same seed play identically."""
+        first = self.play_computer_game(GeneralGame(5, seed=7))
+        second = self.play_computer_game(GeneralGame(5, seed=7))
+        self.assertEqual(first, second)
+
+    def test_derive_seed_is_deterministic(self):
+        """Test that derived seeds depend only on the master seed and keys."""
+        self.assertEqual(derive_seed(1, 'game', 5), derive_seed(1, 'game', 5))
+        self.assertNotEqual(derive_seed(1, 'game', 5), derive_seed(1, 'game', 6))
+        self.assertNotEqual(derive_seed(1, 'game', 5), derive_seed(2, 'game', 5))
+
+    def test_counter_random_random_access(self):
+        """Test that the counter generator can be indexed directly."""
+        rng = CounterRandom(42)
+        values = rng.block(5)
+        self.assertEqual(values[3], CounterRandom(42).bits_at(3))
+        self.assertEqual(rng.getstate(), (42, 5))
+
+    def test_counter_random_as_game_rng(self):
+        """Test that a game can use the counter generator."""
+        first = self.play_computer_game(SimpleGame(4, rng=CounterRandom(3)))
+        second = self.play_computer_game(SimpleGame(4, rng=CounterRandom(3)))
+        self.assertEqual(first, second)
+        self.assertTrue(0.0 <= CounterRandom(3).random() < 1.0)
+
+    def test_create_game_rng_kind(self):
+        """Test that create_game builds the requested generator from the seed."""
+        self.assertIsInstance(create_game('simple', 4, seed=3).rng, random.Random)
+        game = create_game('general', 4, seed=3, rng_kind='counter')
+        self.assertIsInstance(game.rng, CounterRandom)
+        self.assertEqual(self.play_computer_game(game),
+                         self.play_computer_game(GeneralGame(4, rng=CounterRandom(3))))
+        with self.assertRaises(ValueError):
+            make_rng(3, 'xorshift')
+
+class TestDirtyCells(unittest.TestCase):
+    """Unit tests for tracking cells changed since the last render."""
+
+    def test_moves_mark_cells(self):
+        """Test that only the placed cells are reported, once."""
+        game = GeneralGame(5)
+        game.make_move(0, 0, 'S')
+        game.make_move(4, 4, 'O')
+        game.make_move(4, 4, 'S')  # Invalid, nothing changes
+        self.assertEqual(game.pop_dirty_cells(), {(0, 0), (4, 4)})
+        self.assertEqual(game.pop_dirty_cells(), set())
+
+    def test_search_does_not_mark_cells(self):
+        """Test that the computer's trial placements leave no dirty cells."""
+        game = SimpleGame(3)
+        game.make_move(0, 0, 'S')
+        game.pop_dirty_cells()
+        game.get_computer_move()
+        self.assertEqual(game.pop_dirty_cells(), set())
+
+    def test_restore_and_new_game(self):
+        """Test that restoring a snapshot or restarting marks the cells that differ."""
+        game = SimpleGame(3)
+        game.make_move(0, 0, 'S')
+        snapshot = game.snapshot()
+        game.make_move(1, 1, 'O')
+        game.pop_dirty_cells()
+        game.restore(snapshot)
+        self.assertEqual(game.pop_dirty_cells(), {(1, 1)})
+        game.start_new_game()
+        self.assertEqual(game.pop_dirty_cells(), {(0, 0)})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+# test_game_stats.py
+
+import io
+import json
+import os
+import pickle
+import random
+import statistics
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from game_stats import main, RunningStats, QuantileSketch, StatsAggregator
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLES = ['1.json', '2GHH.json', '3SHC.json', '4.json', '5.json', '6GCC.json']
+
+
+def load_samples():
+    recordings = []
+    for name in SAMPLES:
+        with open(os.path.join(HERE, name)) as f:
+            recordings.append(json.load(f))
+    return recordings
+
+
+class TestRunningStats(unittest.TestCase):
+    """Unit tests for RunningStats and QuantileSketch."""
+
+    def test_merge_matches_single_pass(self):
+        """Test that merged statistics equal a single pass over all values."""
+        rng = random.Random(1)
+        values = [rng.uniform(0, 100) for _ in range(200)]
+        whole, left, right = RunningStats(), RunningStats(), RunningStats()
+        for i, v in enumerate(values):
+            whole.add(v)
+            (left if i < 70 else right).add(v)
+        left.merge(right)
+        self.assertEqual(left.count, whole.count)
+        self.assertAlmostEqual(left.mean, whole.mean)
+        self.assertAlmostEqual(left.variance(), whole.variance())
+        self.assertAlmostEqual(whole.mean, statistics.fmean(values))
+        self.assertAlmostEqual(whole.variance(), statistics.variance(values))
+
+    def test_quantile_accuracy(self):
+        """Test that sketch quantiles stay within the relative accuracy."""
+        sketch, other = QuantileSketch(0.01), QuantileSketch(0.01)
+        for v in range(1, 1001):
+            (sketch if v % 2 else other).add(v)
+        sketch.merge(other)
+        self.assertAlmostEqual(sketch.quantile(0.5), 500, delta=500 * 0.02)
+        self.assertAlmostEqual(sketch.quantile(0.99), 990, delta=990 * 0.02)
+        self.assertLess(len(sketch.buckets), 400)
+
+
+class TestStatsAggregator(unittest.TestCase):
+    """Unit tests for the StatsAggregator class."""
+
+    def test_recordings(self):
+        """Test group statistics from recorded games."""
+        aggregator = StatsAggregator()
+        aggregator.consume_recordings(load_samples())
+        summary = aggregator.summary()
+        self.assertEqual(sum(group['games'] for group in summary.values()), 6)
+        general = summary['3/general']
+        self.assertEqual(general['mean_length'], 9)
+        self.assertGreaterEqual(general['mean_sos'], 1)
+
+    def test_invalid_recordings_skipped(self):
+        """Test that recordings that cannot be replayed are counted and skipped."""
+        recordings = load_samples()
+        illegal = load_samples()[1]
+        illegal['moves'][3] = dict(illegal['moves'][0])  # Occupied cell
+        missing = {'board_size': 3, 'moves': [{'row': 0}]}
+        aggregator = StatsAggregator()
+        aggregator.consume_recordings(recordings[:3] + [illegal, missing] + recordings[3:])
+        self.assertEqual(aggregator.invalid, 2)
+        self.assertEqual(sum(group['games'] for group in aggregator.summary().values()), 6)
+        self.assertEqual(aggregator.open_games, {})
+        other = StatsAggregator()
+        other.merge(aggregator)
+        self.assertEqual(other.invalid, 2)
+
+    def test_unreadable_archive_skipped(self):
+        """Test that an archive that cannot be opened is reported like other invalid inputs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            broken = os.path.join(tmpdir, 'broken.sosa')
+            with open(broken, 'wb') as f:
+                f.write(b'not an archive' * 10)
+            with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()) as err:
+                code = main([broken, os.path.join(tmpdir, 'missing.sosa'), os.path.join(HERE, '1.json')])
+        self.assertEqual(code, 0)
+        self.assertEqual(sum(group['games'] for group in json.loads(out.getvalue()).values()), 1)
+        self.assertIn('broken.sosa: skipped', err.getvalue())
+        self.assertIn('missing.sosa: skipped', err.getvalue())
+        self.assertIn("Skipped 2 invalid recordings.", err.getvalue())
+
+    def test_live_events_and_merge(self):
+        """Test live events in two workers merged together."""
+        first, second = StatsAggregator(), StatsAggregator()
+        first.consume([('start', 1, 5, 'simple'), ('move', 1, 0), ('move', 1, 0), ('move', 1, 1),
+                       ('end', 1, 'Blue'), ('start', 2, 5, 'simple'), ('move', 2, 0)])
+        second.consume([('start', 1, 5, 'simple'), ('move', 1, 0), ('end', 1, 'Red')])
+        first.merge(pickle.loads(pickle.dumps(second)))
+        group = first.summary()['5/simple']
+        self.assertEqual(group['games'], 2)
+        self.assertEqual(group['mean_length'], 2)
+        self.assertEqual(group['first_player_advantage'], 0)
+        self.assertIn(2, first.open_games)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# test_import_recordings.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from archive import ArchiveReader
+from import_recordings import find_recordings, run_import, validate_recording
+from validate_recordings import check_recording
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLES = ['1.json', '2GHH.json', '3SHC.json', '4.json', '5.json', '6GCC.json']
+
+
+class TestImportRecordings(unittest.TestCase):
+    """Unit tests for the bulk recording importer."""
+
+    def setUp(self):
+        """Copy the sample recordings and add a broken one and a duplicate."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, 'recordings')
+        os.makedirs(os.path.join(self.source, 'nested'))
+        for name in SAMPLES:
+            shutil.copy(os.path.join(HERE, name), self.source)
+        shutil.copy(os.path.join(HERE, '1.json'), os.path.join(self.source, 'nested', 'copy.json'))
+        with open(os.path.join(self.source, 'nested', 'broken.json'), 'w') as f:
+            f.write('{"board_size": 3, "game_mode": "simple", "moves": [{"row": 0, "col": 0, "letter": "X", "player": "Red"}]}')
+        self.archive = os.path.join(self.tmpdir.name, 'games.sosa')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_import_and_rerun(self):
+        """Test that a rerun imports nothing new."""
+        summary = run_import(self.archive, [self.source], workers=2, batch_size=3)
+        self.assertEqual(summary['imported'], 6)
+        self.assertEqual(summary['duplicates'], 1)
+        self.assertEqual(summary['failed'], 1)
+        with open(self.archive + '.errors') as f:
+            self.assertIn('broken.json', f.read())
+
+        summary = run_import(self.archive, [self.source], workers=2)
+        self.assertEqual(summary['imported'], 0)
+        self.assertEqual(summary['skipped'], 8)
+        with ArchiveReader(self.archive) as reader:
+            self.assertEqual(len(reader), 6)
+            self.assertEqual(reader.metadata(0)['winner'], 'Blue')
+
+    def test_benchmark_files_are_not_recordings(self):
+        """Test that directory walks skip the benchmark baselines kept next to the recordings."""
+        self.assertTrue(os.path.isfile(os.path.join(HERE, 'benchmarks', 'perf_baseline.json')))
+        found = [os.path.relpath(path, HERE) for path in find_recordings([HERE])]
+        self.assertIn('1.json', found)
+        self.assertFalse([path for path in found if path.startswith('benchmarks')])
+
+    def test_resume_after_lost_games(self):
+        """Test that state entries for games missing from the archive are retried."""
+        run_import(self.archive, [self.source], workers=1)
+        os.remove(self.archive)
+        summary = run_import(self.archive, [self.source], workers=1)
+        self.assertEqual(summary['imported'], 6)
+        self.assertEqual(summary['archive_games'], 6)
+
+    def test_stated_winner_checked(self):
+        """Test that a wrong stated winner is rejected."""
+        with open(os.path.join(HERE, '1.json')) as f:
+            recording = json.load(f)
+        recording['winner'] = 'Red'
+        with self.assertRaises(ValueError):
+            validate_recording(recording)
+
+    def test_agrees_with_validator(self):
+        """Test that the importer rejects a wrong turn order, as validate_recordings does."""
+        with open(os.path.join(HERE, '2GHH.json')) as f:
+            recording = json.load(f)
+        recording['moves'][2]['player'] = 'Red'  # Blue scored, so Blue moves again
+        self.assertNotEqual(check_recording(recording), [])
+        with self.assertRaises(ValueError):
+            validate_recording(recording)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# test_latency.py
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from latency import LatencyTracker, STAGES
+
+
+def follow_click(tracker, board_size, clicked):
+    """Send one click through every step, with the given perf_counter() click time."""
+    tracker.click(board_size, clicked)
+    tracker.mark('sent', clicked + 0.001)
+    tracker.mark('received', clicked + 0.004)
+    tracker.mark('engine', 0.002)
+    tracker.mark('render_start', clicked + 0.005)
+    tracker.mark('render_end', clicked + 0.007)
+    return tracker.finish()
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """Unit tests for the LatencyTracker class."""
+
+    def test_stages(self):
+        """Test that a followed click is split into its stages."""
+        tracker = LatencyTracker()
+        stages = follow_click(tracker, 5, time.perf_counter() - 0.010)
+        self.assertEqual(set(stages), set(STAGES))
+        self.assertAlmostEqual(stages['engine'], 2.0)
+        self.assertAlmostEqual(stages['queue'], 1.0)
+        self.assertAlmostEqual(stages['frame_wait'], 1.0)
+        self.assertAlmostEqual(stages['render'], 2.0)
+        self.assertGreaterEqual(stages['input_to_paint'], 10.0)
+        self.assertGreaterEqual(stages['paint'], 3.0)
+
+    def test_unfinished_clicks_are_not_counted(self):
+        """Test that dropped or unrendered clicks leave no measurement."""
+        tracker = LatencyTracker()
+        tracker.click(5)
+        tracker.mark('sent')
+        tracker.drop()
+        self.assertFalse(tracker.has('sent'))
+        self.assertIsNone(tracker.finish())
+        tracker.click(5)
+        self.assertIsNone(tracker.finish())
+        self.assertEqual(tracker.summary(), {})
+        tracker.mark('sent')  # Nothing is being followed
+        self.assertIsNone(tracker.pending)
+
+    def test_quantiles_per_board_size(self):
+        """Test the summary and overlay for several board sizes."""
+        tracker = LatencyTracker()
+        for _ in range(20):
+            follow_click(tracker, 3, time.perf_counter() - 0.010)
+        follow_click(tracker, 50, time.perf_counter() - 0.100)
+        summary = tracker.summary()
+        self.assertEqual(sorted(summary), [3, 50])
+        self.assertEqual(summary[3]['input_to_paint']['count'], 20)
+        self.assertGreater(summary[50]['input_to_paint']['p50'], summary[3]['input_to_paint']['p99'])
+        self.assertAlmostEqual(summary[3]['render']['p95'], 2.0, delta=0.05)
+        self.assertTrue(tracker.overlay_text(3).startswith("Latency 3x3 (n=20): p50 "))
+        self.assertEqual(tracker.overlay_text(9), "Latency: no clicks measured yet")
+
+    def test_log(self):
+        """Test that clicks and the final summary are written to the log."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'latency.jsonl')
+            tracker = LatencyTracker(path)
+            follow_click(tracker, 4, time.perf_counter() - 0.010)
+            tracker.close()
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[0]['board_size'], 4)
+        self.assertIn('input_to_paint_ms', lines[0])
+        self.assertEqual(lines[1]['summary']['4']['render']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# test_opening_trie.py
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from game import GeneralGame
+from opening_trie import OpeningTrie, OpeningIndex, canonicalise, main
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestCanonicalise(unittest.TestCase):
+    """Unit tests for opening canonicalisation."""
+
+    def test_symmetric_openings_match(self):
+        """Test that rotated and mirrored openings give the same tokens."""
+        first, _ = canonicalise(4, [(0, 0, 'S'), (1, 2, 'O')])
+        rotated, _ = canonicalise(4, [(0, 3, 'S'), (2, 2, 'O')])
+        mirrored, _ = canonicalise(4, [(3, 3, 'S'), (2, 1, 'O')])
+        self.assertEqual(first, rotated)
+        self.assertEqual(first, mirrored)
+
+    def test_prefix_consistent(self):
+        """Test that the canonical prefix of a game is the canonical opening."""
+        moves = [(2, 3, 'O'), (0, 1, 'S'), (3, 3, 'S'), (1, 1, 'O')]
+        full, _ = canonicalise(5, moves)
+        for k in range(len(moves)):
+            self.assertEqual(full[:k], canonicalise(5, moves[:k])[0])
+
+
+class TestOpeningTrie(unittest.TestCase):
+    """Unit tests for building, saving and querying the trie."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'openings.sost')
+        self.trie = OpeningTrie(max_depth=3)
+        self.trie.add_game(3, 'simple', [(0, 0, 'S'), (1, 0, 'O'), (2, 0, 'S')], 'Blue')
+        self.trie.add_game(3, 'simple', [(0, 2, 'S'), (1, 1, 'O'), (2, 2, 'O')], 'Red')
+        self.trie.add_game(3, 'general', [(1, 1, 'O')], 'Draw')
+        self.trie.save(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lookup(self):
+        """Test counts at the root and after a symmetric first move."""
+        with OpeningIndex(self.path) as index:
+            self.assertEqual(index.lookup(3, 'simple', []),
+                             {'games': 2, 'blue_wins': 1, 'red_wins': 1, 'draws': 0})
+            self.assertEqual(index.lookup(3, 'simple', [(2, 2, 'S')])['games'], 2)
+            self.assertEqual(index.lookup(3, 'simple', [(0, 0, 'S'), (0, 1, 'O')])['blue_wins'], 1)
+            self.assertIsNone(index.lookup(3, 'simple', [(1, 1, 'S')]))
+            self.assertEqual(index.lookup(3, 'general', [])['draws'], 1)
+
+    def test_incremental_update(self):
+        """Test that games added after loading are merged into the counts."""
+        trie = OpeningTrie.load(self.path, max_depth=3)
+        trie.add_game(3, 'simple', [(2, 0, 'S')], 'Blue')
+        trie.save(self.path)
+        with OpeningIndex(self.path) as index:
+            self.assertEqual(index.lookup(3, 'simple', [(0, 0, 'S')])['games'], 3)
+
+    def test_book_move(self):
+        """Test that the book move is mapped back to the real orientation."""
+        game = GeneralGame(3)
+        with OpeningIndex(self.path) as index:
+            self.assertEqual(index.book_move(game, []), (1, 1, 'O'))
+        trie = OpeningTrie.load(self.path)
+        trie.add_game(3, 'general', [(2, 2, 'S'), (2, 1, 'O')], 'Red')
+        trie.save(self.path)
+        game.make_move(0, 0, 'S')
+        with OpeningIndex(self.path) as index:
+            self.assertEqual(index.book_move(game, [(0, 0, 'S')]), (0, 1, 'O'))
+
+    def test_add_skips_unreadable_files(self):
+        """Test that the add command skips a file that cannot be loaded."""
+        source = os.path.join(self.tmpdir.name, 'recordings')
+        os.makedirs(source)
+        shutil.copy(os.path.join(HERE, '1.json'), source)
+        with open(os.path.join(source, 'broken.json'), 'w') as f:
+            f.write('{"board_size": ')
+        new_trie = os.path.join(self.tmpdir.name, 'new.sost')
+        with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(main(['add', new_trie, source]), 0)
+        self.assertIn("Added 1 games, skipped 1.", out.getvalue())
+        self.assertIn('broken.json: skipped', err.getvalue())
+        with OpeningIndex(new_trie) as index:
+            self.assertEqual(index.lookup(3, 'simple', [])['games'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
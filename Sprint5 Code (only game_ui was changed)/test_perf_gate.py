@@ -0,0 +1,96 @@
+# test_perf_gate.py
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from perf_gate import compare, format_diff, load_baseline, main, merge_rounds, save_baseline, threshold
+
+
+def result(key, median, stdev=0.0):
+    """Make a benchmark result with the fields the gate uses."""
+    name, mode, size = key.split('/')
+    return {'key': key, 'name': name, 'mode': mode, 'size': int(size), 'median': median, 'stdev': stdev}
+
+
+def suite(*results):
+    return {'machine': {'python': '3'}, 'options': {'repeat': 1}, 'results': list(results)}
+
+
+class TestPerfGate(unittest.TestCase):
+    """Unit tests for the performance regression gate."""
+
+    def test_statuses(self):
+        """Test that changes are classified against the allowed slowdown."""
+        baseline = [result('a/simple/3', 1.0), result('b/simple/3', 1.0), result('c/simple/3', 1.0),
+                    result('d/simple/3', 1.0)]
+        current = [result('a/simple/3', 1.1), result('b/simple/3', 2.0), result('c/simple/3', 0.5),
+                   result('e/simple/3', 1.0)]
+        rows = {row['key']: row for row in compare(baseline, current, tolerance=0.25)}
+        self.assertEqual(rows['a/simple/3']['status'], 'ok')
+        self.assertAlmostEqual(rows['a/simple/3']['change'], 0.1)
+        self.assertEqual(rows['b/simple/3']['status'], 'regression')
+        self.assertEqual(rows['c/simple/3']['status'], 'improved')
+        self.assertEqual(rows['d/simple/3']['status'], 'missing')
+        self.assertEqual(rows['e/simple/3']['status'], 'new')
+
+    def test_noisy_benchmarks_get_wider_thresholds(self):
+        """Test that the allowed slowdown grows with the measured noise."""
+        quiet = threshold(result('a/simple/3', 1.0, 0.01), result('a/simple/3', 1.0, 0.01), 0.25, 2.0)
+        noisy = threshold({'median': 1.0, 'noise': 0.4}, result('a/simple/3', 1.0, 0.3), 0.25, 2.0)
+        self.assertEqual(quiet, 0.25)
+        self.assertAlmostEqual(noisy, 1.0)
+        rows = compare([{**result('a/simple/3', 1.0), 'noise': 0.4}], [result('a/simple/3', 1.5, 0.3)])
+        self.assertEqual(rows[0]['status'], 'ok')
+
+    def test_merge_rounds(self):
+        """Test that a baseline keeps the median of its rounds and their spread."""
+        rounds = [suite(result('a/general/5', median)) for median in (1.0, 1.2, 0.9)]
+        merged = merge_rounds(rounds)
+        self.assertEqual(merged[0]['median'], 1.0)
+        self.assertAlmostEqual(merged[0]['noise'], 0.3)
+        self.assertEqual(merged[0]['rounds'], [1.0, 1.2, 0.9])
+        self.assertEqual(merged[0]['size'], 5)
+
+    def test_diff_is_readable(self):
+        """Test that the diff names each benchmark with its times and status."""
+        text = format_diff(compare([result('make_move/simple/3', 2e-6)], [result('make_move/simple/3', 4e-3)]))
+        self.assertIn('make_move/simple/3', text)
+        self.assertIn('2.00 us', text)
+        self.assertIn('4.00 ms', text)
+        self.assertIn('REGRESSION', text)
+
+    def test_saved_results_against_baseline(self):
+        """Test the command line on saved results: exit code 1 and the refresh hint on a regression."""
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_path = os.path.join(directory, 'baseline.json')
+            save_baseline([suite(result('get_valid_moves/simple/3', 1.0))], baseline_path)
+            self.assertEqual(load_baseline(baseline_path)['results'][0]['median'], 1.0)
+            for median, expected in ((1.1, 0), (3.0, 1)):
+                current_path = os.path.join(directory, 'current.json')
+                with open(current_path, 'w') as f:
+                    json.dump(suite(result('get_valid_moves/simple/3', median)), f)
+                with redirect_stdout(io.StringIO()) as out:
+                    code = main(['--baseline', baseline_path, '--current', current_path])
+                self.assertEqual(code, expected)
+            self.assertIn('--update', out.getvalue())
+
+    def test_other_machine_refused(self):
+        """Test that results from another machine are not compared with the baseline."""
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_path = os.path.join(directory, 'baseline.json')
+            save_baseline([suite(result('get_valid_moves/simple/3', 1.0))], baseline_path)
+            current_path = os.path.join(directory, 'current.json')
+            with open(current_path, 'w') as f:
+                json.dump({**suite(result('get_valid_moves/simple/3', 1.0)), 'machine': {'python': '4'}}, f)
+            with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()) as err:
+                code = main(['--baseline', baseline_path, '--current', current_path])
+        self.assertEqual(code, 2)
+        self.assertEqual(out.getvalue(), '')
+        self.assertIn('--update', err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
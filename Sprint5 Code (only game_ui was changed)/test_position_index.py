@@ -0,0 +1,82 @@
+# test_position_index.py
+
+import os
+import tempfile
+import unittest
+from archive import ArchiveWriter
+from game import GeneralGame
+from position_index import bucket_bounds, build_index, PositionIndex, position_hashes, SORT_BYTES
+
+
+def recording(moves, game_mode='general'):
+    return {
+        'board_size': 4, 'game_mode': game_mode,
+        'moves': [{'row': r, 'col': c, 'letter': l, 'player': 'Blue'} for r, c, l in moves],
+    }
+
+
+class TestPositionHashes(unittest.TestCase):
+    """Unit tests for canonical position hashes."""
+
+    def test_transposition_and_symmetry(self):
+        """Test that move order and board symmetry do not change the hash."""
+        a = list(position_hashes(4, 'general', [(0, 0, 'S'), (1, 2, 'O')]))[-1]
+        b = list(position_hashes(4, 'general', [(1, 2, 'O'), (0, 0, 'S')]))[-1]
+        c = list(position_hashes(4, 'general', [(3, 0, 'S'), (1, 1, 'O')]))[-1]
+        d = list(position_hashes(4, 'general', [(0, 0, 'O'), (1, 2, 'S')]))[-1]
+        self.assertEqual(a, b)
+        self.assertEqual(a, c)
+        self.assertNotEqual(a, d)
+
+
+class TestPositionIndex(unittest.TestCase):
+    """Unit tests for building and querying the index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive = os.path.join(self.tmpdir.name, 'games.sosa')
+        self.index = os.path.join(self.tmpdir.name, 'positions.sosp')
+        with ArchiveWriter(self.archive) as writer:
+            writer.add(recording([(0, 0, 'S'), (1, 2, 'O'), (3, 3, 'S')]))
+            writer.add(recording([(2, 2, 'O'), (1, 2, 'O'), (0, 0, 'S')]))
+            writer.add(recording([(3, 0, 'S'), (1, 1, 'O')]))
+            writer.add(recording([(0, 0, 'S'), (1, 2, 'O')], game_mode='simple'))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_build_and_query(self):
+        """Test that symmetric and transposed positions are found."""
+        total = build_index(self.archive, self.index, workers=2, chunk_games=1, buckets=4)
+        self.assertEqual(total, 10)
+        with PositionIndex(self.index) as index:
+            self.assertEqual(len(index), 10)
+            found = index.find_moves(4, 'general', [(0, 0, 'S'), (1, 2, 'O')])
+            self.assertEqual(found, [(0, 2), (2, 2)])
+            self.assertEqual(index.find_moves(4, 'simple', [(1, 2, 'O'), (0, 0, 'S')]), [(3, 2)])
+            self.assertEqual(index.find_moves(4, 'general', [(3, 3, 'O')]), [])
+
+    def test_memory_budget(self):
+        """Test that a small budget splits the postings over more buckets without changing the index."""
+        self.assertEqual(len(bucket_bounds(10 ** 6, 10 ** 6 * SORT_BYTES)), 0)
+        self.assertEqual(len(bucket_bounds(10 ** 6, 10 ** 5 * SORT_BYTES)), 9)
+        build_index(self.archive, self.index, workers=1, buckets=1)
+        with open(self.index, 'rb') as f:
+            expected = f.read()
+        build_index(self.archive, self.index, workers=1, memory_budget=2 * SORT_BYTES)
+        with open(self.index, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_find_board(self):
+        """Test querying with a game board."""
+        build_index(self.archive, self.index, workers=1)
+        game = GeneralGame(4)
+        game.make_move(0, 0, 'S')
+        game.make_move(1, 2, 'O')
+        game.make_move(2, 2, 'O')
+        with PositionIndex(self.index) as index:
+            self.assertEqual(index.find_board(4, 'general', game.board), [(1, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# test_rating.py
+
+import math
+import unittest
+from game import SimpleGame
+from rating import expected_score, elo_from_score, MatchStats, SPRT, RatingTable
+
+
+class TestEloMath(unittest.TestCase):
+    """Unit tests for the Elo conversion helpers."""
+
+    def test_round_trip(self):
+        """Test that score and Elo conversions are inverses."""
+        for elo in (-300, -50, 0, 50, 300):
+            self.assertAlmostEqual(elo_from_score(expected_score(elo)), elo)
+
+    def test_even_score_is_zero(self):
+        """Test that an even score gives zero Elo."""
+        self.assertEqual(expected_score(0), 0.5)
+        self.assertEqual(elo_from_score(0.5), 0.0)
+
+
+class TestMatchStats(unittest.TestCase):
+    """Unit tests for the MatchStats class."""
+
+    def test_elo_interval_contains_estimate(self):
+        """Test that the confidence interval brackets the estimate."""
+        stats = MatchStats(wins=60, draws=20, losses=20)
+        elo, lower, upper = stats.elo()
+        self.assertGreater(elo, 0)
+        self.assertLess(lower, elo)
+        self.assertGreater(upper, elo)
+
+    def test_bayeselo_finite_when_unbeaten(self):
+        """Test that BayesElo stays finite with no losses."""
+        stats = MatchStats(wins=10)
+        elo, drawelo, lower, upper = stats.bayeselo()
+        self.assertTrue(math.isfinite(elo))
+        self.assertLess(lower, upper)
+
+    def test_invalid_score(self):
+        """Test that an invalid score is rejected."""
+        with self.assertRaises(ValueError):
+            MatchStats().add(2)
+
+
+class TestSPRT(unittest.TestCase):
+    """Unit tests for the SPRT class."""
+
+    def test_accepts_h1_for_strong_engine(self):
+        """Test that a clearly stronger engine stops early with H1."""
+        sprt = SPRT(elo0=0, elo1=50)
+        status = None
+        for i in range(1000):
+            status = sprt.add(1 if i % 4 else 0.5)
+            if status:
+                break
+        self.assertEqual(status, 'H1')
+        self.assertLess(sprt.stats.games, 1000)
+
+    def test_accepts_h0_for_equal_engines(self):
+        """Test that evenly matched engines settle on H0."""
+        sprt = SPRT(elo0=0, elo1=50)
+        status = None
+        for i in range(5000):
+            status = sprt.add([1, 0, 0.5][i % 3])
+            if status:
+                break
+        self.assertEqual(status, 'H0')
+
+    def test_unbroken_streaks_stop(self):
+        """Test that all wins accept H1 and all losses or draws accept H0."""
+        for score, expected in ((1, 'H1'), (0, 'H0'), (0.5, 'H0')):
+            sprt = SPRT(elo0=0, elo1=50)
+            status = None
+            for _ in range(1000):
+                status = sprt.add(score)
+                if status:
+                    break
+            self.assertEqual(status, expected)
+            self.assertLess(sprt.stats.games, 1000)
+
+
+class TestRatingTable(unittest.TestCase):
+    """Unit tests for the RatingTable class."""
+
+    def test_ratings_order(self):
+        """Test that ratings rank engines by their results."""
+        table = RatingTable()
+        for _ in range(30):
+            table.add_result('strong', 'medium', 'Blue')
+            table.add_result('medium', 'weak', 'Blue')
+            table.add_result('weak', 'strong', 'Red')
+        table.add_result('medium', 'strong', 'Draw')
+        names = [row[0] for row in table.summary()]
+        self.assertEqual(names, ['strong', 'medium', 'weak'])
+        self.assertAlmostEqual(sum(table.ratings().values()), 0.0, places=6)
+
+    def test_stats_from_both_sides(self):
+        """Test that pair stats are reported from either engine's side."""
+        table = RatingTable()
+        table.add_result('b', 'a', 'Blue')
+        self.assertEqual(table.stats('b', 'a').wins, 1)
+        self.assertEqual(table.stats('a', 'b').losses, 1)
+
+    def test_add_game(self):
+        """Test recording a finished game."""
+        game = SimpleGame(3)
+        game.make_move(0, 0, 'S')
+        game.make_move(1, 0, 'O')
+        game.make_move(2, 0, 'S')
+        table = RatingTable()
+        table.add_game(game, {'Blue': 'x', 'Red': 'y'})
+        self.assertEqual(table.stats('x', 'y').wins, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+# test_recording.py
+
+import json
+import os
+import tempfile
+import unittest
+from recording import (
+    encode_binary, decode_binary, save_recording, load_recording, record_width, HEADER,
+    FOOTER, new_stream_recorder, StreamRecorder
+)
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '2GHH.json')
+
+
+class TestBinaryRecording(unittest.TestCase):
+    """Unit tests for the binary recording format."""
+
+    def setUp(self):
+        """Load a sample JSON recording."""
+        with open(SAMPLE) as f:
+            self.recording = json.load(f)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Test that encoding and decoding gives back the same recording."""
+        self.assertEqual(decode_binary(encode_binary(self.recording)), self.recording)
+
+    def test_compact_size(self):
+        """Test that each move takes two bytes on small boards."""
+        data = encode_binary(self.recording)
+        self.assertEqual(len(data), HEADER.size + 2 * len(self.recording['moves']))
+        self.assertLess(len(data), len(json.dumps(self.recording)) / 10)
+
+    def test_large_board_width(self):
+        """Test that large boards switch to four-byte records."""
+        self.assertEqual(record_width(127), 2)
+        self.assertEqual(record_width(128), 4)
+        recording = {
+            'board_size': 200, 'game_mode': 'simple',
+            'player_types': {'Blue': 'Computer', 'Red': 'Human'},
+            'moves': [{'row': 199, 'col': 198, 'letter': 'O', 'player': 'Red'}],
+        }
+        self.assertEqual(decode_binary(encode_binary(recording)), recording)
+
+    def test_save_and_load_by_extension(self):
+        """Test that files are saved by extension and loaded by content."""
+        for name in ('game.sosr', 'game.json'):
+            path = os.path.join(self.tmpdir.name, name)
+            save_recording(path, self.recording)
+            self.assertEqual(load_recording(path), self.recording)
+
+    def test_invalid_files(self):
+        """Test that bad or truncated files raise ValueError."""
+        path = os.path.join(self.tmpdir.name, 'bad.sosr')
+        with open(path, 'wb') as f:
+            f.write(encode_binary(self.recording)[:-1])
+        with self.assertRaises(ValueError):
+            load_recording(path)
+        with open(path, 'w') as f:
+            f.write('{"moves": []}')
+        with self.assertRaises(ValueError):
+            load_recording(path)
+
+    def test_corrupt_header_fields(self):
+        """Test that out-of-range header bytes raise ValueError."""
+        data = encode_binary(self.recording)
+        # Offsets of board size, game mode, blue type and red type in the header
+        for offset, value in ((5, 1), (7, 7), (8, 2), (9, 255)):
+            corrupt = bytearray(data)
+            corrupt[offset] = value
+            if offset == 5:
+                corrupt[6] = 0  # Board size 1
+            with self.assertRaises(ValueError):
+                decode_binary(bytes(corrupt))
+
+    def test_truncated_footer(self):
+        """Test that a partly written winner footer raises ValueError."""
+        self.recording['winner'] = 'Red'
+        data = encode_binary(self.recording)
+        with self.assertRaises(ValueError):
+            decode_binary(data[:-2])
+
+    def test_winner_footer(self):
+        """Test that a stated winner survives the binary round trip."""
+        self.recording['winner'] = 'Blue'
+        self.assertEqual(decode_binary(encode_binary(self.recording)), self.recording)
+
+
+class TestStreamRecorder(unittest.TestCase):
+    """Unit tests for the StreamRecorder class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'stream.sosr')
+        self.moves = [(0, 0, 'S', 'Red'), (1, 0, 'O', 'Blue'), (2, 0, 'S', 'Blue')]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_moves(self, recorder):
+        for move in self.moves:
+            recorder.record_move(*move)
+
+    def test_finished_recording(self):
+        """Test that a finished stream loads with its winner."""
+        recorder = StreamRecorder(self.path, 3, 'simple', {'Blue': 'Human', 'Red': 'Computer'})
+        self.write_moves(recorder)
+        recorder.finish('Blue')
+        data = load_recording(self.path)
+        self.assertTrue(data['complete'])
+        self.assertEqual(data['winner'], 'Blue')
+        self.assertEqual(data['player_types']['Red'], 'Computer')
+        self.assertEqual([tuple(m.values()) for m in data['moves']], self.moves)
+
+    def test_moves_flushed_before_finish(self):
+        """Test that moves reach the file before the game ends."""
+        recorder = StreamRecorder(self.path, 3, 'general', {'Blue': 'Human', 'Red': 'Human'}, flush_every=1)
+        self.write_moves(recorder)
+        data = load_recording(self.path)
+        self.assertFalse(data['complete'])
+        self.assertEqual(len(data['moves']), 3)
+        recorder.close()
+
+    def test_torn_tail_recovered(self):
+        """Test that a half-written last record is dropped on load."""
+        with StreamRecorder(self.path, 3, 'general', {'Blue': 'Human', 'Red': 'Human'}) as recorder:
+            self.write_moves(recorder)
+        with open(self.path, 'ab') as f:
+            f.write(b'\x01')
+        data = load_recording(self.path)
+        self.assertFalse(data['complete'])
+        self.assertNotIn('winner', data)
+        self.assertEqual(len(data['moves']), 3)
+
+    def test_torn_footer_recovered(self):
+        """Test that a stream whose footer was cut short keeps its moves and nothing else."""
+        for board_size in (3, 130):
+            recorder = StreamRecorder(self.path, board_size, 'general', {'Blue': 'Human', 'Red': 'Human'})
+            self.write_moves(recorder)
+            recorder.finish('Red')
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            for cut in range(1, FOOTER.size):
+                with self.subTest(board_size=board_size, cut=cut):
+                    with open(self.path, 'wb') as f:
+                        f.write(data[:-cut])
+                    recording_data = load_recording(self.path)
+                    self.assertFalse(recording_data['complete'])
+                    self.assertNotIn('winner', recording_data)
+                    self.assertEqual([tuple(m.values()) for m in recording_data['moves']], self.moves)
+
+    def test_new_files_never_replace_recordings(self):
+        """Test that games started in the same second get their own files."""
+        paths = []
+        for winner in ('Blue', 'Red', 'Draw'):
+            recorder = new_stream_recorder(self.tmpdir.name, 3, 'general', {'Blue': 'Human', 'Red': 'Human'},
+                                           stamp='game-20240101-120000')
+            self.write_moves(recorder)
+            recorder.finish(winner)
+            paths.append(recorder.file_path)
+        self.assertEqual([os.path.basename(path) for path in paths],
+                         ['game-20240101-120000.sosr', 'game-20240101-120000-1.sosr', 'game-20240101-120000-2.sosr'])
+        self.assertEqual([load_recording(path)['winner'] for path in paths], ['Blue', 'Red', 'Draw'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# test_renderers.py
+
+import io
+import unittest
+from game import create_game
+from renderers import NullRenderer, TerminalRenderer, board_delta, play, status_text
+
+
+class TestBoardDelta(unittest.TestCase):
+    """Unit tests for the board deltas given to renderers."""
+
+    def setUp(self):
+        self.game = create_game('general', 5)
+        self.drawn = {'blue': 0, 'red': 0}
+
+    def test_changes_only(self):
+        """Test that a delta holds the cells and sequences added since the last one."""
+        self.game.make_move(0, 0, 'S')
+        self.game.make_move(0, 1, 'O')
+        delta = board_delta(self.game, self.drawn)
+        self.assertEqual(sorted(delta['cells']), [(0, 0, 'S', 'Blue'), (0, 1, 'O', 'Red')])
+        self.assertEqual(delta['sequences'], {'blue': (0, []), 'red': (0, [])})
+        self.game.make_move(0, 2, 'S')
+        delta = board_delta(self.game, self.drawn)
+        self.assertEqual(delta['cells'], [(0, 2, 'S', 'Blue')])
+        self.assertEqual(delta['sequences']['blue'], (0, [((0, 0), (0, 2))]))
+        delta = board_delta(self.game, self.drawn)
+        self.assertEqual(delta['cells'], [])
+        self.assertEqual(delta['sequences']['blue'], (1, []))
+
+    def test_restore_removes_lines(self):
+        """Test that restoring an earlier position takes lines and letters away."""
+        before = self.game.snapshot()
+        for move in [(0, 0, 'S'), (0, 1, 'O'), (0, 2, 'S')]:
+            self.game.make_move(*move)
+        board_delta(self.game, self.drawn)
+        self.game.restore(before)
+        delta = board_delta(self.game, self.drawn)
+        self.assertEqual(sorted(delta['cells']), [(0, 0, None, None), (0, 1, None, None), (0, 2, None, None)])
+        self.assertEqual(delta['sequences']['blue'], (0, []))
+
+
+class TestRenderers(unittest.TestCase):
+    """Unit tests for the headless renderers."""
+
+    def test_null_renderer_sees_every_cell(self):
+        """Test that a headless game gives the renderer every cell and line once."""
+        renderer = NullRenderer()
+        game = play(create_game('general', 6, seed=4), renderer)
+        self.assertEqual(renderer.cells, 36)
+        self.assertEqual(renderer.lines, len(game.blue_sequences) + len(game.red_sequences))
+        self.assertEqual(renderer.boards, 1)
+
+    def test_frame_cap_batches_moves(self):
+        """Test that a frame cap draws several moves per delta."""
+        renderer = NullRenderer()
+        play(create_game('simple', 8, seed=1), renderer, max_fps=1)
+        self.assertLess(renderer.deltas, 5)
+        game = create_game('simple', 8, seed=1)
+        play(game, NullRenderer())
+        self.assertTrue(game.game_over)
+
+    def test_terminal_renderer(self):
+        """Test that the terminal renderer draws letters and highlights SOS cells."""
+        out = io.StringIO()
+        renderer = TerminalRenderer(out, columns=80, rows=24)
+        game = create_game('general', 4)
+        renderer.start(4)
+        self.assertEqual(out.getvalue().count('. '), 16)
+        game.make_move(1, 1, 'O')
+        renderer.render(game)
+        self.assertIn('\x1b[2;3H\x1b[34mO', out.getvalue())
+        game.make_move(1, 0, 'S')
+        game.make_move(1, 2, 'S')
+        renderer.render(game)
+        self.assertEqual(renderer.highlights[(1, 1)], ['blue'])
+        self.assertIn('\x1b[2;3H\x1b[1;97;44mO', out.getvalue())
+        renderer.show_status(*status_text(game))
+        self.assertTrue(out.getvalue().endswith('\x1b[5;1H\x1b[2K\x1b[34mTurn: Blue Player\x1b[0m'))
+
+    def test_terminal_renderer_clips_large_boards(self):
+        """Test that cells outside the terminal are not drawn."""
+        out = io.StringIO()
+        renderer = TerminalRenderer(out, columns=10, rows=6)
+        renderer.start(20)
+        self.assertEqual((renderer.view_rows, renderer.view_cols), (4, 5))
+        game = create_game('simple', 20)
+        game.make_move(10, 10, 'S')
+        written = len(out.getvalue())
+        renderer.render(game)
+        self.assertEqual(len(out.getvalue()), written)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# test_replay.py
+
+import json
+import os
+import unittest
+from game import GeneralGame
+from replay import ReplayEngine, ReplayError
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_sample(name):
+    with open(os.path.join(HERE, name)) as f:
+        return json.load(f)
+
+
+class TestReplayEngine(unittest.TestCase):
+    """Unit tests for the ReplayEngine class."""
+
+    def setUp(self):
+        """Record a long computer-vs-computer general game."""
+        game = GeneralGame(8, seed=3)
+        moves = []
+        while not game.check_game_over():
+            row, col, letter = game.get_computer_move()
+            game.make_move(row, col, letter)
+            moves.append({'row': row, 'col': col, 'letter': letter, 'player': game.current_player})
+        self.final = game
+        self.recording = {'board_size': 8, 'game_mode': 'general', 'moves': moves}
+
+    def test_run_to_end(self):
+        """Test that a replay reaches the recorded result."""
+        game = ReplayEngine(self.recording).run_to_end()
+        self.assertTrue(game.game_over)
+        self.assertEqual(game.winner, self.final.winner)
+        self.assertEqual(game.board, self.final.board)
+
+    def test_seek_matches_straight_replay(self):
+        """Test that seeking backwards and forwards gives the same states."""
+        engine = ReplayEngine(self.recording, keyframe_interval=5)
+        engine.run_to_end()
+        for index in (40, 3, 17, 64, 0, 33):
+            reference = ReplayEngine(self.recording)
+            reference.seek(index)
+            engine.seek(index)
+            self.assertEqual(engine.position, index)
+            self.assertEqual(engine.game.snapshot(), reference.game.snapshot())
+
+    def test_sample_recording(self):
+        """Test replaying a recording saved by the UI."""
+        game = ReplayEngine(load_sample('2GHH.json')).run_to_end()
+        self.assertEqual(game.winner, 'Blue')
+        self.assertEqual(len(game.blue_sequences), 8)
+
+    def test_illegal_move(self):
+        """Test that an occupied cell stops the replay with its index."""
+        recording = load_sample('1.json')
+        recording['moves'][1] = dict(recording['moves'][0])
+        engine = ReplayEngine(recording)
+        engine.step()
+        with self.assertRaises(ReplayError) as ctx:
+            engine.step()
+        self.assertEqual(ctx.exception.move_index, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
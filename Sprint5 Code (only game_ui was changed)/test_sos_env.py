@@ -0,0 +1,77 @@
+# test_sos_env.py
+
+import unittest
+import numpy as np
+from sos_env import SOSEnv, VectorSOSEnv, PLANE_S, PLANE_O, PLANE_OWN, PLANE_OPPONENT, PLANE_SCORING
+
+
+class TestSOSEnv(unittest.TestCase):
+    """Unit tests for the SOSEnv class."""
+
+    def setUp(self):
+        """Set up a simple-mode environment for testing."""
+        self.env = SOSEnv(3, 'simple', seed=1)
+        self.env.reset()
+
+    def test_encode_decode(self):
+        """Test that action encoding round-trips."""
+        action = self.env.encode_action(2, 1, 'O')
+        self.assertEqual(self.env.decode_action(action), (2, 1, 'O'))
+
+    def test_step_updates_buffers_in_place(self):
+        """Test that the same buffers are returned and updated."""
+        obs, _ = self.env.reset()
+        obs2, reward, terminated, _, info = self.env.step(self.env.encode_action(0, 0, 'S'))
+        self.assertIs(obs, obs2)
+        self.assertEqual(obs[PLANE_S, 0, 0], 1.0)
+        # Red is now to move, so Blue's S shows on the opponent plane
+        self.assertEqual(obs[PLANE_OPPONENT, 0, 0], 1.0)
+        self.assertEqual(obs[PLANE_OWN, 0, 0], 0.0)
+        self.assertFalse(self.env.action_mask[0])
+        self.assertFalse(self.env.action_mask[9])
+        self.assertEqual(len(self.env.legal_actions()), 16)
+        self.assertEqual(info['player'], 'Red')
+
+    def test_winning_move(self):
+        """Test reward and scoring plane for a winning move."""
+        self.env.step(self.env.encode_action(0, 0, 'S'))
+        self.env.step(self.env.encode_action(1, 0, 'O'))
+        obs, reward, terminated, _, info = self.env.step(self.env.encode_action(2, 0, 'S'))
+        self.assertEqual(reward, 1.0)
+        self.assertTrue(terminated)
+        self.assertEqual(info['winner'], 'Blue')
+        self.assertEqual(obs[PLANE_SCORING, :, 0].tolist(), [1.0, 1.0, 1.0])
+        self.assertEqual(obs[PLANE_O, 1, 0], 1.0)
+
+    def test_illegal_action(self):
+        """Test that occupied cells are rejected."""
+        self.env.step(0)
+        with self.assertRaises(ValueError):
+            self.env.step(9)
+
+
+class TestVectorSOSEnv(unittest.TestCase):
+    """Unit tests for the VectorSOSEnv class."""
+
+    def test_batched_play(self):
+        """Test that a batch of general games can be played to the end."""
+        vec = VectorSOSEnv(4, 3, 'general', seeds=[0, 1, 2, 3])
+        obs = vec.reset()
+        self.assertEqual(obs.shape, (4, 5, 3, 3))
+        rng = np.random.default_rng(0)
+        finished = 0
+        for _ in range(40):
+            actions = [rng.choice(np.flatnonzero(mask)) for mask in vec.action_masks]
+            _, _, terminated = vec.step(actions)
+            finished += int(terminated.sum())
+        self.assertGreater(finished, 0)
+        self.assertIs(vec.envs[2].observation.base, vec.observations)
+
+    def test_counter_generators(self):
+        """Test that a batch can use counter-based generators seeded per environment."""
+        vec = VectorSOSEnv(2, 3, 'simple', seeds=[5, 6], rng_kind='counter')
+        self.assertEqual([env.game.rng.getstate() for env in vec.envs], [(5, 0), (6, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
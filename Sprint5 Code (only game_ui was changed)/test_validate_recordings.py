@@ -0,0 +1,113 @@
+# test_validate_recordings.py
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from archive import ArchiveWriter
+from recording import encode_binary
+from validate_recordings import check_recording, main, validate
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_sample(name):
+    with open(os.path.join(HERE, name)) as f:
+        return json.load(f)
+
+
+class TestCheckRecording(unittest.TestCase):
+    """Unit tests for check_recording."""
+
+    def test_valid_general_game(self):
+        """Test that a General game with extra turns is valid."""
+        self.assertEqual(check_recording(load_sample('2GHH.json')), [])
+
+    def test_wrong_turn_order(self):
+        """Test that a wrong recorded player is reported at its move."""
+        recording = load_sample('2GHH.json')
+        recording['moves'][2]['player'] = 'Red'  # Blue scored, so Blue moves again
+        diagnostics = check_recording(recording)
+        self.assertEqual([(d['level'], d['move']) for d in diagnostics], [('error', 2)])
+
+    def test_illegal_move(self):
+        """Test that an occupied cell stops the check."""
+        recording = load_sample('2GHH.json')
+        recording['moves'][3] = dict(recording['moves'][0], player='Red')
+        diagnostics = check_recording(recording)
+        self.assertEqual(diagnostics[-1]['move'], 3)
+        self.assertIn('Illegal move', diagnostics[-1]['message'])
+
+    def test_move_after_game_over(self):
+        """Test that moves after a Simple game is won are reported."""
+        recording = load_sample('1.json')
+        recording['moves'].append({'row': 2, 'col': 2, 'letter': 'S', 'player': 'Red'})
+        self.assertEqual(check_recording(recording)[-1]['move'], 3)
+
+    def test_bad_coordinates(self):
+        """Test that a move with a non-integer row is reported, not raised."""
+        recording = load_sample('2GHH.json')
+        recording['moves'][1]['row'] = '0'
+        diagnostics = check_recording(recording)
+        self.assertEqual([(d['level'], d['move']) for d in diagnostics], [('error', 1)])
+
+    def test_result_checks(self):
+        """Test the unfinished-game warning and the stated-winner error."""
+        recording = load_sample('2GHH.json')
+        recording['moves'].pop()
+        self.assertEqual([d['level'] for d in check_recording(recording)], ['warning'])
+        recording = load_sample('2GHH.json')
+        recording['winner'] = 'Red'
+        self.assertEqual([d['level'] for d in check_recording(recording)], ['error'])
+
+
+class TestValidate(unittest.TestCase):
+    """Unit tests for validating files and archives in parallel."""
+
+    def test_files_and_archive(self):
+        """Test a directory holding JSON files and an archive."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            shutil.copy(os.path.join(HERE, '1.json'), tmpdir)
+            with open(os.path.join(tmpdir, 'bad.json'), 'w') as f:
+                f.write('not json')
+            with ArchiveWriter(os.path.join(tmpdir, 'games.sosa')) as writer:
+                writer.add(load_sample('2GHH.json'))
+                bad = load_sample('2GHH.json')
+                bad['winner'] = 'Red'
+                writer.add(bad)
+            summary, problems = validate([tmpdir], workers=2)
+        self.assertEqual(summary, {'checked': 4, 'valid': 2, 'errors': 2, 'warnings': 0})
+        self.assertEqual(sorted(p['game'] is None for p in problems), [False, True])
+
+    def test_cli_reports_corrupt_files(self):
+        """Test that corrupt files give per-file errors instead of stopping the run."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            shutil.copy(os.path.join(HERE, '1.json'), tmpdir)
+            with open(os.path.join(tmpdir, 'number.json'), 'w') as f:
+                f.write('3')
+            data = bytearray(encode_binary(load_sample('2GHH.json')))
+            data[7] = 7  # Game mode byte
+            with open(os.path.join(tmpdir, 'mode.sosr'), 'wb') as f:
+                f.write(data)
+            recording = load_sample('2GHH.json')
+            recording['moves'][0]['row'] = '0'
+            with open(os.path.join(tmpdir, 'row.json'), 'w') as f:
+                json.dump(recording, f)
+            with open(os.path.join(tmpdir, 'empty.sosa'), 'wb'):
+                pass
+            with open(os.path.join(tmpdir, 'junk.sosa'), 'wb') as f:
+                f.write(b'not an archive' * 10)
+            with redirect_stdout(io.StringIO()) as out:
+                code = main([tmpdir, '--workers', '2'])
+        self.assertEqual(code, 1)
+        text = out.getvalue()
+        for name in ('number.json', 'mode.sosr', 'row.json', 'empty.sosa', 'junk.sosa'):
+            self.assertIn(f"{name}: error", text)
+        self.assertIn("Checked 6: 1 valid, 5 with errors", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+# tk_renderer.py
+
+import tkinter as tk
+from renderers import Renderer, LINE_COLORS
+
+CELL_SIZE = 60  # Largest size of a board cell in pixels
+ZOOM_LEVELS = (2, 3, 4, 6, 8, 12, 16, 24, 32, 45, 60)  # Cell sizes the board can be zoomed to
+SUMMARY_CELL_SIZE = 12  # Below this cell size the board is drawn as one image instead of cells
+VIEW_SIZE = 600  # Largest width and height of the visible board area
+# Summary image colours for each owner and letter
+SUMMARY_COLORS = {
+    None: '#ffffff',
+    ('Blue', 'S'): '#0000ff', ('Blue', 'O'): '#8080ff',
+    ('Red', 'S'): '#ff0000', ('Red', 'O'): '#ff8080',
+}
+
+
+class TkRenderer(Renderer):
+    """Draws the board on a scrollable, zoomable Tk canvas.
+
+    Only visible cells have canvas items; items of cells that scroll out of
+    view are reused for cells coming into view. At low zoom the board is one
+    summary image. SOS line items are kept in a pool as well.
+    """
+
+    def __init__(self, parent, status_label=None):
+        super().__init__()
+        self.status_label = status_label
+        self.board_size = 0
+        self.cells = []  # Rows of (letter, player) or None, as last drawn
+        self.cell_ids = {}  # Mapping from visible (row, col) to rectangle and text IDs
+        self.free_cells = []  # Hidden (rectangle, text) ID pairs kept for reuse
+        self.cell_size = CELL_SIZE
+        self.summary_image = None  # Whole-board image shown at low zoom
+        self.summary_id = None
+        self.viewport_pending = False  # A visible-cell refresh is scheduled
+        self.sos_line_items = {color: [] for color in LINE_COLORS}  # Line IDs of drawn sequences, in order
+        self.free_sos_lines = []  # Hidden line IDs kept for reuse by later sequences
+
+        # Create the board canvas with scroll bars
+        frame = tk.Frame(parent)
+        frame.pack(side=tk.LEFT)
+        self.canvas = tk.Canvas(frame)
+        x_scroll = tk.Scrollbar(frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        y_scroll = tk.Scrollbar(frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.config(
+            xscrollcommand=lambda first, last: self.on_view_change(x_scroll, first, last),
+            yscrollcommand=lambda first, last: self.on_view_change(y_scroll, first, last)
+        )
+        self.canvas.grid(row=0, column=0)
+        y_scroll.grid(row=0, column=1, sticky='ns')
+        x_scroll.grid(row=1, column=0, sticky='ew')
+        self.canvas.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.canvas.bind('<Button-4>', self.on_mouse_wheel)
+        self.canvas.bind('<Button-5>', self.on_mouse_wheel)
+
+    def new_board(self, board_size):
+        """Set up the view for an empty board, zoomed so the whole board fits."""
+        self.canvas.delete('cell')  # Cells of a previous game
+        self.cell_ids = {}
+        self.free_cells = []
+        self.clear_sos_lines()
+        self.board_size = board_size
+        self.cells = [[None] * board_size for _ in range(board_size)]
+        fitting = [size for size in ZOOM_LEVELS if board_size * size <= VIEW_SIZE]
+        self.cell_size = fitting[-1] if fitting else ZOOM_LEVELS[0]
+        self.layout_board(0.0, 0.0)
+
+    def apply(self, delta):
+        """Draw the changed cells and lines of a board delta."""
+        for row, col, letter, player in delta['cells']:
+            self.cells[row][col] = None if letter is None else (letter, player)
+            if self.summary_image is not None:
+                # Paint the cell's block of the summary image
+                color = SUMMARY_COLORS[None if letter is None else (player, letter)]
+                x1 = col * self.cell_size
+                y1 = row * self.cell_size
+                self.summary_image.put(color, to=(x1, y1, x1 + self.cell_size, y1 + self.cell_size))
+            if (row, col) not in self.cell_ids:
+                continue  # Cells out of view are drawn when they are scrolled to
+            _, text_id = self.cell_ids[(row, col)]
+            if letter is not None:
+                self.canvas.itemconfig(text_id, text=letter, fill=player.lower())
+            else:
+                self.canvas.itemconfig(text_id, text='')
+
+        # Lines already drawn stay as they are; only new sequences get a line
+        for color in LINE_COLORS:
+            first, new = delta['sequences'][color]
+            items = self.sos_line_items[color]
+            while len(items) > first:
+                self.release_sos_line(items.pop())
+            for start, end in new:
+                items.append(self.acquire_sos_line(start, end, color))
+
+    def show_status(self, text, color='black'):
+        if self.status_label is not None:
+            self.status_label.config(text=text, fg=color)
+
+    def cell_at(self, x, y):
+        """Return the (row, col) under a point in window coordinates, or None."""
+        col = int(self.canvas.canvasx(x) // self.cell_size)
+        row = int(self.canvas.canvasy(y) // self.cell_size)
+        if 0 <= row < self.board_size and 0 <= col < self.board_size:
+            return row, col
+        return None
+
+    def layout_board(self, left, top):
+        """Size the canvas for the current zoom, scroll it to the given fractions and draw it."""
+        board_width = self.board_size * self.cell_size
+        view_width = min(board_width, VIEW_SIZE)
+        self.canvas.config(
+            width=view_width, height=view_width, scrollregion=(0, 0, board_width, board_width)
+        )
+        self.canvas.xview_moveto(left)
+        self.canvas.yview_moveto(top)
+        # Every cell item is repositioned, so all of them go back to the pool first
+        for cell in list(self.cell_ids):
+            self.release_cell(cell)
+        if self.summary_id is not None:
+            self.canvas.delete(self.summary_id)
+            self.summary_id = None
+            self.summary_image = None
+        if self.cell_size < SUMMARY_CELL_SIZE:
+            self.draw_summary()
+            self.canvas.tag_raise('sos_line')
+        else:
+            self.refresh_viewport()
+
+    def draw_summary(self):
+        """Draw the whole board as one image with a coloured block per cell."""
+        rows = []
+        for cells in self.cells:
+            colors = [SUMMARY_COLORS[None if cell is None else (cell[1], cell[0])] for cell in cells]
+            rows.append('{' + ' '.join(colors) + '}')
+        # One pixel per cell, then scaled up to the cell size
+        image = tk.PhotoImage(width=self.board_size, height=self.board_size)
+        image.put(' '.join(rows))
+        self.summary_image = image.zoom(self.cell_size)
+        self.summary_id = self.canvas.create_image(0, 0, anchor='nw', image=self.summary_image)
+
+    def visible_range(self):
+        """Return (first row, last row + 1, first col, last col + 1) of the cells in view."""
+        board_size = self.board_size
+        cell_size = self.cell_size
+        view_width = min(board_size * cell_size, VIEW_SIZE)
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        first_col = max(0, int(left // cell_size))
+        first_row = max(0, int(top // cell_size))
+        last_col = min(board_size, int((left + view_width) // cell_size) + 1)
+        last_row = min(board_size, int((top + view_width) // cell_size) + 1)
+        return first_row, last_row, first_col, last_col
+
+    def on_view_change(self, scrollbar, first, last):
+        """Update a scroll bar and schedule a refresh of the visible cells."""
+        scrollbar.set(first, last)
+        if not self.viewport_pending and self.summary_id is None:
+            self.viewport_pending = True
+            self.canvas.after_idle(self.refresh_viewport)
+
+    def refresh_viewport(self):
+        """Give canvas items to cells that came into view, taking them from cells that left."""
+        self.viewport_pending = False
+        if self.summary_id is not None:
+            return
+        first_row, last_row, first_col, last_col = self.visible_range()
+        for row, col in list(self.cell_ids):
+            if not (first_row <= row < last_row and first_col <= col < last_col):
+                self.release_cell((row, col))
+        pool_size = len(self.free_cells)
+        shown = 0
+        for row in range(first_row, last_row):
+            for col in range(first_col, last_col):
+                if (row, col) not in self.cell_ids:
+                    self.acquire_cell(row, col)
+                    shown += 1
+        if shown > pool_size:
+            # New cell items were drawn over the lines
+            self.canvas.tag_raise('sos_line')
+
+    def acquire_cell(self, row, col):
+        """Show a cell, reusing pooled canvas items if there are any."""
+        cell_size = self.cell_size
+        x1 = col * cell_size
+        y1 = row * cell_size
+        cell = self.cells[row][col]
+        text = '' if cell is None else cell[0]
+        color = 'black' if cell is None else cell[1].lower()
+        font = ('Arial', int(cell_size * 0.4))
+        if self.free_cells:
+            rect_id, text_id = self.free_cells.pop()
+            self.canvas.coords(rect_id, x1, y1, x1 + cell_size, y1 + cell_size)
+            self.canvas.coords(text_id, x1 + cell_size / 2, y1 + cell_size / 2)
+            self.canvas.itemconfig(rect_id, state=tk.NORMAL)
+            self.canvas.itemconfig(text_id, text=text, fill=color, font=font, state=tk.NORMAL)
+        else:
+            rect_id = self.canvas.create_rectangle(
+                x1, y1, x1 + cell_size, y1 + cell_size, fill='white', outline='black', tags='cell'
+            )
+            text_id = self.canvas.create_text(
+                x1 + cell_size / 2, y1 + cell_size / 2, text=text, fill=color, font=font, tags='cell'
+            )
+        self.cell_ids[(row, col)] = (rect_id, text_id)
+
+    def release_cell(self, cell):
+        """Hide a cell's canvas items and keep them for reuse."""
+        rect_id, text_id = self.cell_ids.pop(cell)
+        self.canvas.itemconfig(rect_id, state=tk.HIDDEN)
+        self.canvas.itemconfig(text_id, state=tk.HIDDEN)
+        self.free_cells.append((rect_id, text_id))
+
+    def change_zoom(self, step):
+        """Zoom in (step > 0) or out (step < 0), keeping the centre of the view in place."""
+        if not self.board_size:
+            return
+        levels = [size for size in ZOOM_LEVELS if size < self.cell_size] if step < 0 else \
+            [size for size in ZOOM_LEVELS if size > self.cell_size]
+        if not levels:
+            return
+        old_size = self.cell_size
+        new_size = levels[-1] if step < 0 else levels[0]
+        old_view = min(self.board_size * old_size, VIEW_SIZE)
+        centre_x = (self.canvas.canvasx(0) + old_view / 2) / old_size
+        centre_y = (self.canvas.canvasy(0) + old_view / 2) / old_size
+
+        self.cell_size = new_size
+        # Lines are stored in canvas coordinates, so they are scaled in one call
+        self.canvas.scale('sos_line', 0, 0, new_size / old_size, new_size / old_size)
+        board_width = self.board_size * new_size
+        new_view = min(board_width, VIEW_SIZE)
+        self.layout_board(
+            max(0.0, (centre_x * new_size - new_view / 2) / board_width),
+            max(0.0, (centre_y * new_size - new_view / 2) / board_width)
+        )
+
+    def on_mouse_wheel(self, event):
+        """Scroll the board with the wheel, or zoom it while Control is held."""
+        # X11 reports the wheel as buttons 4 and 5, other platforms as a delta
+        up = event.num == 4 if event.num in (4, 5) else event.delta > 0
+        if event.state & 0x4:  # Control
+            self.change_zoom(1 if up else -1)
+        elif event.state & 0x1:  # Shift scrolls sideways
+            self.canvas.xview_scroll(-1 if up else 1, 'units')
+        else:
+            self.canvas.yview_scroll(-1 if up else 1, 'units')
+
+    def cell_centre(self, row, col):
+        """Return the canvas coordinates of a cell's centre at the current zoom."""
+        return ((col + 0.5) * self.cell_size, (row + 0.5) * self.cell_size)
+
+    def acquire_sos_line(self, start, end, color):
+        """Show a line between two cells, reusing a pooled line item if there is one."""
+        start_pos = self.cell_centre(*start)
+        end_pos = self.cell_centre(*end)
+        if self.free_sos_lines:
+            line_id = self.free_sos_lines.pop()
+            self.canvas.coords(line_id, start_pos[0], start_pos[1], end_pos[0], end_pos[1])
+            self.canvas.itemconfig(line_id, fill=color, state=tk.NORMAL)
+        else:
+            line_id = self.canvas.create_line(
+                start_pos[0], start_pos[1], end_pos[0], end_pos[1],
+                fill=color,
+                width=3,
+                tags='sos_line'
+            )
+        return line_id
+
+    def release_sos_line(self, line_id):
+        """Hide a line item and keep it for reuse."""
+        self.canvas.itemconfig(line_id, state=tk.HIDDEN)
+        self.free_sos_lines.append(line_id)
+
+    def clear_sos_lines(self):
+        """Hide every drawn line."""
+        for items in self.sos_line_items.values():
+            while items:
+                self.release_sos_line(items.pop())
@@ -0,0 +1,132 @@
+# validate_recordings.py
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from archive import ArchiveReader
+from import_recordings import find_recordings, RECORDING_EXTENSIONS, ARCHIVE_EXTENSION
+from recording import load_recording
+from replay import diagnostic, replay_checked
+
+ARCHIVE_TASK_SIZE = 1000  # Archive games checked per worker task
+
+
+def check_recording(recording_data):
+    """Replay a recording and return a list of diagnostics (empty if valid)."""
+    return replay_checked(recording_data)[1]
+
+
+def checked(load):
+    """Return the diagnostics of the recording returned by load().
+
+    Any failure becomes an error diagnostic, so one bad file cannot stop a
+    whole run.
+    """
+    try:
+        return check_recording(load())
+    except Exception as e:
+        return [diagnostic('error', f"Unreadable recording: {type(e).__name__}: {e}")]
+
+
+def check_file(path):
+    """Worker: validate one recording file."""
+    return [{'file': path, 'game': None, 'diagnostics': checked(lambda: load_recording(path))}]
+
+
+def check_archive_range(task):
+    """Worker: validate games start..stop-1 of an archive."""
+    path, start, stop = task
+    results = []
+    with ArchiveReader(path) as reader:
+        for index in range(start, stop):
+            diagnostics = checked(lambda: reader.game(index))
+            results.append({'file': path, 'game': index, 'diagnostics': diagnostics})
+    return results
+
+
+def run_task(task):
+    """Worker entry point for either kind of task."""
+    if isinstance(task, tuple):
+        return check_archive_range(task)
+    return check_file(task)
+
+
+def build_tasks(paths):
+    """Split files and archives into worker tasks; return (tasks, results for archives that cannot be opened)."""
+    tasks = []
+    unreadable = []
+    for path in find_recordings(paths, RECORDING_EXTENSIONS + (ARCHIVE_EXTENSION,)):
+        if path.lower().endswith(ARCHIVE_EXTENSION):
+            try:
+                with ArchiveReader(path) as reader:
+                    count = len(reader)
+            except (OSError, ValueError) as e:
+                message = f"Unreadable archive: {type(e).__name__}: {e}"
+                unreadable.append({'file': path, 'game': None, 'diagnostics': [diagnostic('error', message)]})
+                continue
+            for start in range(0, count, ARCHIVE_TASK_SIZE):
+                tasks.append((path, start, min(start + ARCHIVE_TASK_SIZE, count)))
+        else:
+            tasks.append(path)
+    return tasks, unreadable
+
+
+def validate(paths, workers=None):
+    """Validate recordings and archives; return (summary, results with problems)."""
+    summary = {'checked': 0, 'valid': 0, 'errors': 0, 'warnings': 0}
+    problems = []
+
+    def count(results):
+        for result in results:
+            summary['checked'] += 1
+            levels = {d['level'] for d in result['diagnostics']}
+            if 'error' in levels:
+                summary['errors'] += 1
+            elif 'warning' in levels:
+                summary['warnings'] += 1
+            else:
+                summary['valid'] += 1
+            if result['diagnostics']:
+                problems.append(result)
+
+    tasks, unreadable = build_tasks(paths)
+    count(unreadable)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(run_task, tasks, chunksize=8):
+            count(results)
+    return summary, problems
+
+
+def format_result(result):
+    """Return human-readable lines for one result."""
+    name = result['file'] if result['game'] is None else f"{result['file']}[{result['game']}]"
+    lines = []
+    for d in result['diagnostics']:
+        where = '' if d['move'] is None else f" at move {d['move']}"
+        lines.append(f"{name}: {d['level']}{where}: {d['message']}")
+    return lines
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Replay recordings headlessly and report problems.")
+    parser.add_argument('paths', nargs='+', help="recording files, archives or directories")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    summary, problems = validate(args.paths, workers=args.workers)
+    if args.json:
+        print(json.dumps({'summary': summary, 'problems': problems}))
+    else:
+        for result in problems:
+            for line in format_result(result):
+                print(line)
+        print(f"Checked {summary['checked']}: {summary['valid']} valid, "
+              f"{summary['errors']} with errors, {summary['warnings']} with warnings.")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
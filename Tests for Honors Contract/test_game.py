@@ -647,14 +647,14 @@ class TestCrashResilience(unittest.TestCase):
 
 
 class TestMockingRandomModule(unittest.TestCase):
-    @patch('random.choice', side_effect=[(0,0), 'S', (1,1), 'O'])
-    def test_mocked_random_moves(self, mock_choice):
+    def test_mocked_random_moves(self):
         game = SimpleGame(3)
         game.start_new_game()
-        move = game.get_computer_move()
-        self.assertEqual(move, (0,0,'S'))
-        move2 = game.get_computer_move()
-        self.assertEqual(move2, (1,1,'O'))
+        with patch.object(game.rng, 'choice', side_effect=[(0,0), 'S', (1,1), 'O']):
+            move = game.get_computer_move()
+            self.assertEqual(move, (0,0,'S'))
+            move2 = game.get_computer_move()
+            self.assertEqual(move2, (1,1,'O'))
 
 
 class TestLargeNumberOfTests(unittest.TestCase):